@@ -0,0 +1,35 @@
+"""Indexes for keyset-paginated reservation and notification listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import create_index, drop_index
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Reservation listings: rowid (id) is implicitly the last key column
+INDEXES = {
+    "ix_reservations_start_time": "reservations (start_time)",
+    "ix_reservations_lab_start": "reservations (lab_id, start_time)",
+    "ix_reservations_instructor_start": "reservations (instructor_id, start_time)",
+    "ix_reservations_course_start": "reservations (course_id, start_time)",
+    "ix_reservations_status_start": "reservations (status, start_time)",
+    "ix_notifications_user_read_created": "notifications (user_id, is_read, created_at)",
+    "ix_notifications_user_created": "notifications (user_id, created_at)",
+}
+
+
+def upgrade():
+    for name, definition in INDEXES.items():
+        op.execute(create_index(name, definition))
+
+
+def downgrade():
+    for name in INDEXES:
+        op.execute(drop_index(name))
@@ -0,0 +1,182 @@
+"""Trigger-maintained dashboard counters and instructor usage rollup
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import drop_triggers
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Counter name -> query that computes it from scratch
+COUNTERS = {
+    "total_labs": "SELECT COUNT(*) FROM labs WHERE is_active = 1",
+    "total_sessions": "SELECT COUNT(*) FROM reservations",
+    "pending_requests": "SELECT COUNT(*) FROM reservations WHERE status = 'pending'",
+    "total_users": "SELECT COUNT(*) FROM users WHERE is_active = 1",
+}
+
+# Triggers keep the counters current for every writer of the database,
+# including the SQLAlchemy models and other worker processes.
+COUNTER_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS dashboard_counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_reservation_insert AFTER INSERT ON reservations
+    BEGIN
+        UPDATE dashboard_counters SET value = value + 1 WHERE name = 'total_sessions';
+        UPDATE dashboard_counters SET value = value + 1
+            WHERE name = 'pending_requests' AND NEW.status = 'pending';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_reservation_delete AFTER DELETE ON reservations
+    BEGIN
+        UPDATE dashboard_counters SET value = value - 1 WHERE name = 'total_sessions';
+        UPDATE dashboard_counters SET value = value - 1
+            WHERE name = 'pending_requests' AND OLD.status = 'pending';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_reservation_status AFTER UPDATE OF status ON reservations
+    BEGIN
+        UPDATE dashboard_counters
+            SET value = value + (NEW.status = 'pending') - (OLD.status = 'pending')
+            WHERE name = 'pending_requests';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_lab_insert AFTER INSERT ON labs
+    BEGIN
+        UPDATE dashboard_counters SET value = value + (NEW.is_active = 1) WHERE name = 'total_labs';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_lab_delete AFTER DELETE ON labs
+    BEGIN
+        UPDATE dashboard_counters SET value = value - (OLD.is_active = 1) WHERE name = 'total_labs';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_lab_active AFTER UPDATE OF is_active ON labs
+    BEGIN
+        UPDATE dashboard_counters
+            SET value = value + (NEW.is_active = 1) - (OLD.is_active = 1)
+            WHERE name = 'total_labs';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_user_insert AFTER INSERT ON users
+    BEGIN
+        UPDATE dashboard_counters SET value = value + (NEW.is_active = 1) WHERE name = 'total_users';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_user_delete AFTER DELETE ON users
+    BEGIN
+        UPDATE dashboard_counters SET value = value - (OLD.is_active = 1) WHERE name = 'total_users';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_counters_user_active AFTER UPDATE OF is_active ON users
+    BEGIN
+        UPDATE dashboard_counters
+            SET value = value + (NEW.is_active = 1) - (OLD.is_active = 1)
+            WHERE name = 'total_users';
+    END
+    ''',
+]
+
+# Seconds of an approved reservation, computed from its stored timestamps
+_SECONDS = "CAST(strftime('%s', {0}.end_time) AS INTEGER) - CAST(strftime('%s', {0}.start_time) AS INTEGER)"
+_MONTH = "strftime('%Y-%m', {0}.start_time)"
+
+
+def _apply(row: str, sign: str) -> str:
+    return f'''
+        INSERT INTO instructor_usage_rollup (instructor_id, lab_id, month, reservations, seconds)
+        VALUES ({row}.instructor_id, {row}.lab_id, {_MONTH.format(row)}, {sign}1, {sign}({_SECONDS.format(row)}))
+        ON CONFLICT (instructor_id, lab_id, month) DO UPDATE SET
+            reservations = reservations + excluded.reservations,
+            seconds = seconds + excluded.seconds;
+    '''
+
+
+# Approved reservations rolled up per (instructor, lab, month) by triggers,
+# so every writer of the reservations table keeps the rollup current.
+ROLLUP_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS instructor_usage_rollup (
+        instructor_id INTEGER NOT NULL,
+        lab_id INTEGER NOT NULL,
+        month TEXT NOT NULL,
+        reservations INTEGER NOT NULL DEFAULT 0,
+        seconds INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (instructor_id, lab_id, month)
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS ix_instructor_usage_rollup_month ON instructor_usage_rollup (month)",
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_reservation_insert AFTER INSERT ON reservations
+    WHEN NEW.status = 'approved'
+    BEGIN
+        {_apply("NEW", "+")}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_reservation_delete AFTER DELETE ON reservations
+    WHEN OLD.status = 'approved'
+    BEGIN
+        {_apply("OLD", "-")}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_reservation_unapprove
+    AFTER UPDATE OF status, instructor_id, lab_id, start_time, end_time ON reservations
+    WHEN OLD.status = 'approved'
+    BEGIN
+        {_apply("OLD", "-")}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_reservation_approve
+    AFTER UPDATE OF status, instructor_id, lab_id, start_time, end_time ON reservations
+    WHEN NEW.status = 'approved'
+    BEGIN
+        {_apply("NEW", "+")}
+    END
+    ''',
+]
+
+_BACKFILL = f'''
+    INSERT INTO instructor_usage_rollup (instructor_id, lab_id, month, reservations, seconds)
+    SELECT r.instructor_id, r.lab_id, {_MONTH.format("r")}, COUNT(*), SUM({_SECONDS.format("r")})
+    FROM reservations r
+    WHERE r.status = 'approved'
+    GROUP BY r.instructor_id, r.lab_id, {_MONTH.format("r")}
+'''
+
+
+def upgrade():
+    for statement in COUNTER_SCHEMA + ROLLUP_SCHEMA:
+        op.execute(statement)
+    for name, query in COUNTERS.items():
+        op.execute(f"INSERT OR IGNORE INTO dashboard_counters (name, value) VALUES ('{name}', ({query}))")
+    if op.get_bind().exec_driver_sql("SELECT 1 FROM instructor_usage_rollup LIMIT 1").first() is None:
+        op.execute(_BACKFILL)
+
+
+def downgrade():
+    for statement in drop_triggers(COUNTER_SCHEMA + ROLLUP_SCHEMA):
+        op.execute(statement)
+    op.execute("DROP TABLE IF EXISTS instructor_usage_rollup")
+    op.execute("DROP TABLE IF EXISTS dashboard_counters")
@@ -0,0 +1,57 @@
+"""Recurring reservation series and their skipped dates
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# One row per recurring booking; occurrences are expanded from the rule on
+# demand and skipped dates live in reservation_series_exceptions.
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS reservation_series (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        instructor_id INTEGER NOT NULL,
+        lab_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL,
+        section TEXT NOT NULL,
+        start_time TIMESTAMP NOT NULL,
+        end_time TIMESTAMP NOT NULL,
+        rrule TEXT NOT NULL,
+        until_time TIMESTAMP NOT NULL,
+        duration INTEGER NOT NULL,
+        notes TEXT,
+        status TEXT DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (instructor_id) REFERENCES users (id),
+        FOREIGN KEY (lab_id) REFERENCES labs (id),
+        FOREIGN KEY (course_id) REFERENCES courses (id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS reservation_series_exceptions (
+        series_id INTEGER NOT NULL,
+        occurrence_date DATE NOT NULL,
+        PRIMARY KEY (series_id, occurrence_date),
+        FOREIGN KEY (series_id) REFERENCES reservation_series (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS ix_reservation_series_lab_start ON reservation_series (lab_id, start_time)",
+    "CREATE INDEX IF NOT EXISTS ix_reservation_series_status_start ON reservation_series (status, start_time)",
+]
+
+
+def upgrade():
+    for statement in SCHEMA:
+        op.execute(statement)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS reservation_series_exceptions")
+    op.execute("DROP TABLE IF EXISTS reservation_series")
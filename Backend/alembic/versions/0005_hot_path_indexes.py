@@ -0,0 +1,42 @@
+"""Covering indexes for the hot query paths
+
+The covering (status, start_time, ...) index supersedes
+ix_reservations_status_start.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import create_index, drop_index
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Covering indexes for the remaining hot paths: the conflict index load,
+# report column scans and timetable loads never touch the reservations
+# table, and the explicit id keeps status listings in keyset order; lab and
+# course listings and the active-user count are answered from their indexes.
+INDEXES = {
+    "ix_reservations_status_start_covering": "reservations (status, start_time, id, lab_id, end_time, instructor_id)",
+    "ix_users_is_active": "users (is_active)",
+    "ix_labs_active_name": "labs (is_active, name)",
+    "ix_labs_active_capacity": "labs (is_active, capacity, name)",
+    "ix_courses_active_code": "courses (is_active, code)",
+}
+
+
+def upgrade():
+    for name, definition in INDEXES.items():
+        op.execute(create_index(name, definition))
+    op.execute(drop_index("ix_reservations_status_start"))
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    op.execute(create_index("ix_reservations_status_start", "reservations (status, start_time)"))
+    for name in INDEXES:
+        op.execute(drop_index(name))
@@ -0,0 +1,52 @@
+"""Trigger-maintained version numbers for the labs and courses tables
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import drop_triggers
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Every write to these tables bumps their version, whichever process makes it
+VERSIONED_TABLES = ("labs", "courses")
+
+
+def _triggers(table: str):
+    return [
+        f'''
+    CREATE TRIGGER IF NOT EXISTS trg_versions_{table}_{event.lower()} AFTER {event} ON {table}
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+    END
+    '''
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS table_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+] + [statement for table in VERSIONED_TABLES for statement in _triggers(table)]
+
+
+def upgrade():
+    for statement in SCHEMA:
+        op.execute(statement)
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT OR IGNORE INTO table_versions (name, version) VALUES ('{table}', 0)")
+
+
+def downgrade():
+    for statement in drop_triggers(SCHEMA):
+        op.execute(statement)
+    op.execute("DROP TABLE IF EXISTS table_versions")
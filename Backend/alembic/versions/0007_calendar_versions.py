@@ -0,0 +1,85 @@
+"""Trigger-maintained calendar feed versions per lab and instructor
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import drop_triggers
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+# Per-lab and per-instructor version and modification time of everything a
+# calendar feed shows: reservations, recurring series and their skipped dates.
+def _bump(scope: str, owner: str) -> str:
+    return f'''
+        INSERT INTO calendar_versions (scope, owner_id, version, modified_at)
+            SELECT '{scope}', {owner}, 1, CAST(strftime('%s', 'now') AS INTEGER) WHERE {owner} IS NOT NULL
+            ON CONFLICT (scope, owner_id) DO UPDATE
+            SET version = version + 1, modified_at = excluded.modified_at;'''
+
+
+def _calendar_triggers(table: str):
+    statements = []
+    for event, rows in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+        body = "".join(
+            _bump("lab", f"{row}.lab_id") + _bump("instructor", f"{row}.instructor_id") for row in rows
+        )
+        statements.append(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_calendar_{table}_{event.lower()} AFTER {event} ON {table}
+    BEGIN{body}
+    END
+    ''')
+    return statements
+
+
+def _exception_triggers():
+    statements = []
+    for event, row in (("INSERT", "NEW"), ("DELETE", "OLD")):
+        body = "".join(
+            _bump(scope, f"(SELECT {column} FROM reservation_series WHERE id = {row}.series_id)")
+            for scope, column in (("lab", "lab_id"), ("instructor", "instructor_id"))
+        )
+        statements.append(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_calendar_series_exceptions_{event.lower()}
+        AFTER {event} ON reservation_series_exceptions
+    BEGIN{body}
+    END
+    ''')
+    return statements
+
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS calendar_versions (
+        scope TEXT NOT NULL,
+        owner_id INTEGER NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        modified_at INTEGER NOT NULL,
+        PRIMARY KEY (scope, owner_id)
+    ) WITHOUT ROWID
+    ''',
+] + _calendar_triggers("reservations") + _calendar_triggers("reservation_series") + _exception_triggers()
+
+
+def upgrade():
+    for statement in SCHEMA:
+        op.execute(statement)
+    # Every lab and instructor that already has bookings starts at version 1, modified now
+    for scope, column in (("lab", "lab_id"), ("instructor", "instructor_id")):
+        op.execute(f'''
+            INSERT OR IGNORE INTO calendar_versions (scope, owner_id, version, modified_at)
+            SELECT '{scope}', {column}, 1, CAST(strftime('%s', 'now') AS INTEGER)
+            FROM (SELECT {column} FROM reservations UNION SELECT {column} FROM reservation_series)
+        ''')
+
+
+def downgrade():
+    for statement in drop_triggers(SCHEMA):
+        op.execute(statement)
+    op.execute("DROP TABLE IF EXISTS calendar_versions")
@@ -0,0 +1,60 @@
+"""Change log of writes, read by every worker process to stay coherent
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from app.database.schema import drop_triggers
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# (table, topic, key column, UPDATE OF columns or None for any update)
+TRACKED = [
+    ("reservations", "reservation", "id", "lab_id, start_time, end_time, status"),
+    ("reservation_series", "series", "id", "lab_id, start_time, end_time, rrule, until_time, status"),
+    ("reservation_series_exceptions", "series", "series_id", None),
+    ("users", "user", "id", None),
+]
+
+
+def _triggers(table: str, topic: str, key: str, columns):
+    statements = []
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        if event == "UPDATE" and table == "reservation_series_exceptions":
+            continue
+        on = f"UPDATE OF {columns}" if event == "UPDATE" and columns else event
+        statements.append(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_changes_{table}_{event.lower()} AFTER {on} ON {table}
+    BEGIN
+        INSERT INTO change_log (topic, key) VALUES ('{topic}', {row}.{key});
+    END
+    ''')
+    return statements
+
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        topic TEXT NOT NULL,
+        key INTEGER NOT NULL,
+        created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    )
+    ''',
+] + [statement for tracked in TRACKED for statement in _triggers(*tracked)]
+
+
+def upgrade():
+    for statement in SCHEMA:
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in drop_triggers(SCHEMA):
+        op.execute(statement)
+    op.execute("DROP TABLE IF EXISTS change_log")
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+
+from ...config import settings
+from ...database.pool import get_pool
+from ...frontend import etag_matches
+from ...utils import ical
+
+router = APIRouter()
+
+def _not_modified(request: Request, etag: str, last_modified: int) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+    if "if-none-match" in request.headers:
+        return etag_matches(request.headers["if-none-match"], etag)
+    since = request.headers.get("if-modified-since")
+    if not since:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+async def _feed(request: Request, scope: str, owner_id: int):
+    pool = get_pool()
+    owner = await pool.run(ical.load_owner, scope, owner_id)
+    if owner is None:
+        raise HTTPException(status_code=404, detail=f"{scope.capitalize()} not found")
+    name, version, modified_at = owner
+
+    window = date.today() - timedelta(days=settings.CALENDAR_HISTORY_DAYS)
+    window_start = int(datetime(window.year, window.month, window.day, tzinfo=timezone.utc).timestamp())
+    # Moving the window drops old events, so it changes the feed too
+    last_modified = max(modified_at, window_start)
+    etag = f'"{scope}-{owner_id}-{version}-{window:%Y%m%d}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    key, stamp = (scope, owner_id), (version, window)
+    body = ical.feed_cache.get(key, stamp)
+    if body is not None:
+        return Response(body, media_type=ical.MEDIA_TYPE, headers=headers)
+    chunks = ical.generate_feed(pool.run, scope, owner_id, name, window.isoformat())
+    return StreamingResponse(ical.feed_cache.tee(key, stamp, chunks), media_type=ical.MEDIA_TYPE, headers=headers)
+
+@router.get("/labs/{lab_id}/calendar.ics")
+async def lab_calendar(lab_id: int, request: Request):
+    return await _feed(request, "lab", lab_id)
+
+@router.get("/instructors/{instructor_id}/calendar.ics")
+async def instructor_calendar(instructor_id: int, request: Request):
+    return await _feed(request, "instructor", instructor_id)
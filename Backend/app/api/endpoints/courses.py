@@ -1,29 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from typing import List
 
 from ...database.session import get_db
 from ...database import crud
-from ...auth.security import get_current_active_user, get_current_admin_user
+from ...auth.security import get_current_admin_user
 from ...schemas.reservation import Course, CourseCreate
 from ...schemas.user import User
 
+# Courses are listed by GET /api/v1/courses in main.py
 router = APIRouter()
 
-@router.get("/courses/", response_model=List[Course])
-async def read_courses(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    courses = crud.get_courses(db, skip=skip, limit=limit)
-    return courses
-
+# Sync handler: SQLAlchemy sessions block, so it runs on the threadpool
 @router.post("/courses/", response_model=Course)
-async def create_course(
+def create_course(
     course: CourseCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    return crud.create_course(db=db, course=course)
\ No newline at end of file
+    return crud.create_course(db=db, course=course)
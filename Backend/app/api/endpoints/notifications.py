@@ -1,30 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+import base64
+import json
 
 from ...database.session import get_db
-from ...database import crud
 from ...auth.security import get_current_active_user
+from ...schemas.notification import Notification, UnreadCount
 from ...schemas.user import User
 from ...utils import notifications as notification_utils
 
 router = APIRouter()
 
-@router.get("/notifications/")
-async def get_user_notifications(
+def _encode_cursor(notification):
+    key = [notification.created_at.isoformat(), notification.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_cursor(cursor):
+    try:
+        created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Sync handlers: SQLAlchemy sessions block, so these run on the threadpool
+@router.get("/notifications/", response_model=List[Notification])
+def get_user_notifications(
+    response: Response,
     unread_only: bool = True,
-    skip: int = 0,
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     notifications = notification_utils.get_user_notifications(
-        db, user_id=current_user.id, unread_only=unread_only
+        db,
+        user_id=current_user.id,
+        unread_only=unread_only,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit
     )
-    return notifications[skip:skip + limit]
+    if len(notifications) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(notifications[-1])
+    return notifications
+
+@router.get("/notifications/unread-count", response_model=UnreadCount)
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return {"unread": notification_utils.get_unread_count(db, user_id=current_user.id)}
+
+@router.post("/notifications/read-all")
+def mark_all_notifications_as_read(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    updated = notification_utils.mark_all_as_read(db, user_id=current_user.id)
+    return {"message": f"{updated} notifications marked as read"}
 
 @router.post("/notifications/{notification_id}/read")
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -34,4 +71,4 @@ async def mark_notification_as_read(
     )
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return {"message": "Notification marked as read"}
\ No newline at end of file
+    return {"message": "Notification marked as read"}
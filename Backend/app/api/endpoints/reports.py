@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException
+from datetime import date
+from typing import Dict, Optional
+
+from ...database import rollups
+from ...database.pool import get_pool
+from ...schemas.report import InstructorReport, MonthlyReport
+from ...utils import reports as report_engine
+
+router = APIRouter()
+
+def _month_or_current(month: Optional[str]):
+    try:
+        return report_engine.month_bounds(month or date.today().strftime("%Y-%m"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/monthly-usage", response_model=MonthlyReport)
+async def monthly_usage(month: Optional[str] = None):
+    start, end = _month_or_current(month)
+    usage, peak_hours = await get_pool().run(report_engine.usage_report, start, end)
+    return {"period": start.strftime("%B %Y"), "data": usage, "peak_hours": peak_hours}
+
+@router.get("/reports/usage", response_model=MonthlyReport)
+async def usage_for_period(start_date: date, end_date: date):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    end = date.fromordinal(end_date.toordinal() + 1)
+    usage, peak_hours = await get_pool().run(report_engine.usage_report, start_date, end)
+    return {
+        "period": f"{start_date.isoformat()} to {end_date.isoformat()}",
+        "data": usage,
+        "peak_hours": peak_hours
+    }
+
+@router.get("/reports/peak-hours", response_model=Dict[str, float])
+async def peak_hours(month: Optional[str] = None):
+    start, end = _month_or_current(month)
+    _, peak = await get_pool().run(report_engine.usage_report, start, end)
+    return {slot["time_slot"]: slot["utilization"] for slot in peak}
+
+@router.get("/reports/instructor-usage", response_model=InstructorReport)
+async def instructor_usage(
+    month: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    if start_date and end_date:
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        start, end = start_date, date.fromordinal(end_date.toordinal() + 1)
+        period = f"{start_date.isoformat()} to {end_date.isoformat()}"
+    else:
+        start, end = _month_or_current(month)
+        period = start.strftime("%B %Y")
+    usage = await get_pool().run(rollups.instructor_usage, start, end)
+    return {"period": period, "data": usage}
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+import base64
+import json
+
+from ...database.session import get_db
+from ...database import crud
+from ...auth.security import get_current_active_user
+from ...schemas.reservation import ReservationDetail, ReservationListItem
+from ...schemas.user import User
+from ...utils.workflow import parse_status
+
+router = APIRouter()
+
+RESERVATION_PAGE_MAX = 500
+
+def _encode_cursor(row):
+    return base64.urlsafe_b64encode(json.dumps([row.start_time, row.id]).encode()).decode()
+
+def _decode_cursor(cursor):
+    try:
+        start_time, reservation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(start_time), int(reservation_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Sync handlers: SQLAlchemy sessions block, so these run on the threadpool
+@router.get("/reservations/{reservation_id:int}", response_model=ReservationDetail)
+def read_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    reservation = crud.get_reservation(db, reservation_id)
+    if reservation is None:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    return reservation
+
+@router.get("/instructors/{instructor_id}/reservations", response_model=List[ReservationListItem])
+def read_instructor_reservations(
+    instructor_id: int,
+    response: Response,
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=RESERVATION_PAGE_MAX),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        status_filter = parse_status(status) if status is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = crud.list_reservation_rows(
+        db,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit,
+        instructor_id=instructor_id,
+        status=status_filter,
+        start_date=start_date,
+        end_date=end_date
+    )
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1])
+    return rows
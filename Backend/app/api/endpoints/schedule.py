@@ -0,0 +1,63 @@
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from datetime import date
+from typing import Optional
+
+from ...database.pool import get_pool
+from ...utils.conflicts import ReservationConflict
+from ...utils.notifications import notify, reservation_status_notification
+from ...utils.timetable import (
+    DEFAULT_TIME_BUDGET, MAX_WORKERS, apply_solution, load_problem, timetable_solver
+)
+
+router = APIRouter()
+
+@router.post("/schedule/solve")
+async def solve_timetable(
+    background_tasks: BackgroundTasks,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    time_budget: float = Query(DEFAULT_TIME_BUDGET, gt=0, le=60),
+    workers: int = Query(1, ge=1, le=MAX_WORKERS),
+    incremental: bool = True,
+    apply: bool = False
+):
+    """Assign pending reservations to labs, maximizing the number placed.
+
+    With ``apply`` the assignment is written: placed requests are approved
+    (possibly in another lab of sufficient capacity and equipment) and the
+    rest declined. Otherwise the proposal is only returned.
+    """
+    pool = get_pool()
+    problem = await pool.run(load_problem, start_date, end_date)
+    # The solver is CPU bound; keep it off the database threads
+    solution = await asyncio.get_running_loop().run_in_executor(
+        None, timetable_solver.solve, problem, time_budget, workers, incremental
+    )
+
+    changed = []
+    if apply:
+        try:
+            changed = await pool.run(apply_solution, problem, solution)
+        except ReservationConflict as e:
+            raise HTTPException(status_code=409, detail=f"{e}; solve again")
+        background_tasks.add_task(_publish, changed)
+
+    return {
+        "requests": len(problem.requests),
+        "assigned": len(solution.assignment),
+        "moved": solution.moved,
+        "unassigned": solution.unassigned,
+        "restarts": solution.restarts,
+        "seconds": round(solution.seconds, 3),
+        "applied": apply,
+        "assignments": [
+            {"reservation_id": request.id, "requested_lab_id": request.requested_lab,
+             "lab_id": solution.assignment[request.id]}
+            for request in problem.requests if request.id in solution.assignment
+        ],
+    }
+
+def _publish(changed):
+    notify((instructor_id, reservation_status_notification(reservation_id, status))
+           for instructor_id, reservation_id, status in changed)
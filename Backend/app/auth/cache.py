@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..config import settings
+from ..database.changes import change_feed
+
+
+class PrincipalCache:
+    """LRU cache of authenticated users keyed by the token's ``sub`` and ``exp``.
+
+    Entries live for ``ttl`` seconds but never past the token's own expiry.
+    ``invalidate_user`` drops every entry for a username, and must be called
+    whenever a user's role or active flag changes.
+    """
+
+    def __init__(self, ttl: int = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+                 max_size: int = settings.PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[float, Any]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[Tuple[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username: str, exp: Any) -> Optional[Any]:
+        key = (username, exp)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, username: str, exp: Any, principal: Any):
+        expires_at = time.time() + self.ttl
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = (username, exp)
+        with self._lock:
+            self._entries[key] = (expires_at, principal)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(username, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, username: str):
+        with self._lock:
+            for key in list(self._keys_by_user.get(username, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: Tuple[str, Any]):
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache()
+# Users change rarely; any change made by another process empties the cache
+change_feed.subscribe("user", lambda conn, ids: principal_cache.clear())
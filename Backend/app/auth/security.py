@@ -1,24 +1,35 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..database.session import get_db
 from ..database import crud
+from ..database.models import UserRole
 from ..schemas.user import User
+from .cache import principal_cache
+from .utils import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
+# bcrypt runs on the hash process pool. The plain functions block their
+# caller until it is done; async code awaits the *_async variants instead.
+# Both raise HashPoolSaturated when the pool's queue is full.
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_sync(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_hasher.hash_sync(password)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -44,9 +55,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = crud.get_user_by_username(db, username=username)
-    if user is None:
+    # The token signature was just verified, so a cached principal for this token is trusted
+    expires = payload.get("exp")
+    user = principal_cache.get(username, expires)
+    if user is not None:
+        return user
+    
+    # A miss queries the database; keep that blocking call off the event loop
+    db_user = await run_in_threadpool(crud.get_user_by_username, db, username=username)
+    if db_user is None:
         raise credentials_exception
+    user = User.model_validate(db_user)
+    principal_cache.put(username, expires, user)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
@@ -55,6 +75,6 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
-    if current_user.role != "admin":
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return current_user
\ No newline at end of file
+    return current_user
@@ -0,0 +1,143 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from ..utils.metrics import PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS, PASSWORD_HASH_WAIT_SECONDS
+
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(os.cpu_count() or 1, 4))))
+HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+
+_pwd_context = None
+
+
+def _context():
+    # One CryptContext per worker process, imported there rather than by the app
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+def _timed_verify(plain_password: str, hashed_password: str):
+    started = time.perf_counter()
+    try:
+        result = _context().verify(plain_password, hashed_password)
+    except ValueError:
+        # Malformed or non-bcrypt hash stored for the user
+        result = False
+    return result, time.perf_counter() - started
+
+
+def _timed_hash(password: str):
+    started = time.perf_counter()
+    result = _context().hash(password)
+    return result, time.perf_counter() - started
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class PasswordHashPool:
+    """bcrypt hashing and verification on a dedicated process pool.
+
+    At most ``workers + queue_size`` operations may be outstanding; beyond
+    that, callers get HashPoolSaturated immediately instead of queueing, so
+    a login burst turns into fast 429s rather than an ever-growing backlog.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_size: int = HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_seconds = 0.0
+        self._max_hash_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED.inc()
+                raise HashPoolSaturated("Password hashing queue is full")
+            self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(lambda f: self._record(f, submitted))
+        return future
+
+    def _record(self, future: Future, submitted: float):
+        elapsed = time.perf_counter() - submitted
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            hash_seconds = future.result()[1]
+            self._completed += 1
+            self._hash_seconds += hash_seconds
+            self._max_hash_seconds = max(self._max_hash_seconds, hash_seconds)
+            self._wait_seconds += max(elapsed - hash_seconds, 0.0)
+        PASSWORD_HASH_SECONDS.observe(hash_seconds)
+        PASSWORD_HASH_WAIT_SECONDS.observe(max(elapsed - hash_seconds, 0.0))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        future = self._submit(_timed_verify, plain_password, hashed_password)
+        return (await asyncio.wrap_future(future))[0]
+
+    async def hash(self, password: str) -> str:
+        future = self._submit(_timed_hash, password)
+        return (await asyncio.wrap_future(future))[0]
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(_timed_verify, plain_password, hashed_password).result()[0]
+
+    def hash_sync(self, password: str) -> str:
+        return self._submit(_timed_hash, password).result()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.workers,
+                "in_flight": min(self._pending, self.workers),
+                "queue_depth": max(self._pending - self.workers, 0),
+                "queue_capacity": self.queue_size,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_hash_ms": round(self._hash_seconds / completed * 1000, 2),
+                "max_hash_ms": round(self._max_hash_seconds * 1000, 2),
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+            }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHashPool()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+
+class Settings:
+    API_V1_STR: str = "/api/v1"
+    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+    # Authenticated-principal cache used by auth.security
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+    # Opening hours that lab utilization is measured against (Monday = 0)
+    LAB_OPENING_HOUR: int = int(os.getenv("LAB_OPENING_HOUR", "8"))
+    LAB_CLOSING_HOUR: int = int(os.getenv("LAB_CLOSING_HOUR", "20"))
+    LAB_OPEN_WEEKDAYS: tuple = tuple(
+        int(day) for day in os.getenv("LAB_OPEN_WEEKDAYS", "0,1,2,3,4").split(",")
+    )
+
+    # Cached labs/courses responses also follow writes made by other worker processes
+    REFERENCE_CACHE_CHECK_VERSIONS: bool = os.getenv("REFERENCE_CACHE_CHECK_VERSIONS", "1") != "0"
+
+    # Calendar feeds start this many days back; older reservations are left out
+    CALENDAR_HISTORY_DAYS: int = int(os.getenv("CALENDAR_HISTORY_DAYS", "180"))
+
+    # Background reservation exports are written here and deleted after the retention period
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "lab_scheduler-exports"))
+    EXPORT_RETENTION_SECONDS: int = int(os.getenv("EXPORT_RETENTION_SECONDS", "3600"))
+
+    # Statements at least this slow are logged with their query plan; 0 disables the log
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+
+
+settings = Settings()
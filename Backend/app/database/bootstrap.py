@@ -0,0 +1,129 @@
+"""Database bootstrap, run once per deployment rather than at import time.
+
+The app brings the schema up to date when it starts (a no-op when the
+migration stamp is already current). Default users, labs and courses are
+seeded separately:
+
+    python -m app.database.bootstrap --seed [--db lab_scheduler.db]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+from . import schema
+from .pool import DATABASE_PATH
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: concurrent first starts fall back on SQLite's own locking
+    fcntl = None
+
+
+@contextmanager
+def _migration_lock(path: str):
+    # Kept in the temp directory so no lock file lands next to the database
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+    with open(os.path.join(tempfile.gettempdir(), f"lab_scheduler-{digest}.lock"), "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def ensure_schema(path: str = DATABASE_PATH) -> bool:
+    """Migrate ``path`` to the head revision unless its stamp is already there.
+
+    Returns True if migrations ran. Workers starting together queue on a
+    lock file; the ones that get it after the first find the stamp current.
+    """
+    if schema.current_revision(path) == schema.HEAD_REVISION:
+        return False
+    with _migration_lock(path):
+        if schema.current_revision(path) == schema.HEAD_REVISION:
+            return False
+        schema.migrate(path)
+    return True
+
+
+def seed_defaults(path: str = DATABASE_PATH) -> bool:
+    """Insert the default users, labs, courses and sample reservations into an
+    empty database. Returns False, changing nothing, if any user exists."""
+    from ..auth.utils import password_hasher
+
+    conn = sqlite3.connect(path)
+    try:
+        if conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]:
+            return False
+
+        users = [
+            ('admin', 'admin@university.edu', password_hasher.hash_sync('admin123'), 'System Administrator', 'admin'),
+            ('instructor1', 'instructor1@university.edu', password_hasher.hash_sync('instructor123'), 'Dr. John Smith', 'instructor'),
+            ('student1', 'student1@university.edu', password_hasher.hash_sync('student123'), 'Alice Johnson', 'student')
+        ]
+        conn.executemany('''
+            INSERT INTO users (username, email, hashed_password, full_name, role)
+            VALUES (?, ?, ?, ?, ?)
+        ''', users)
+
+        labs = [
+            ('Lab A', 'Main Computer Lab', 30, '30 PCs, Projector, Whiteboard'),
+            ('Lab B', 'Mac Lab', 25, '25 Macs, Projector'),
+            ('Lab C', 'Advanced Computing Lab', 40, '40 PCs, Smart Board'),
+            ('Lab D', 'VR Lab', 20, '20 PCs, VR Equipment')
+        ]
+        conn.executemany('''
+            INSERT INTO labs (name, description, capacity, equipment)
+            VALUES (?, ?, ?, ?)
+        ''', labs)
+
+        courses = [
+            ('CS101', 'Introduction to Computer Science', 'Basic programming concepts', 3),
+            ('IT202', 'Web Development Fundamentals', 'HTML, CSS, JavaScript', 3),
+            ('CS305', 'Data Structures and Algorithms', 'Advanced data structures', 4),
+            ('IT410', 'Advanced Database Systems', 'Database design and optimization', 4)
+        ]
+        conn.executemany('''
+            INSERT INTO courses (code, name, description, credits)
+            VALUES (?, ?, ?, ?)
+        ''', courses)
+
+        sample_reservations = [
+            (2, 1, 1, 'CS101-A', '2024-01-15 09:00:00', '2024-01-15 11:00:00', 2, 'Regular class', 'approved'),
+            (2, 2, 2, 'IT202-B', '2024-01-16 14:00:00', '2024-01-16 16:00:00', 2, 'Lab session', 'approved'),
+            (2, 3, 3, 'CS305-C', '2024-01-17 10:00:00', '2024-01-17 12:00:00', 2, None, 'pending'),
+        ]
+        conn.executemany('''
+            INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', sample_reservations)
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate, and optionally seed, the IT Lab Scheduler database.")
+    parser.add_argument("--db", default=DATABASE_PATH, help=f"database file (default: {DATABASE_PATH})")
+    parser.add_argument("--seed", action="store_true", help="insert default data into an empty database")
+    args = parser.parse_args(argv)
+
+    print("Database migrated" if ensure_schema(args.db) else "Database schema is current")
+    if args.seed:
+        from ..auth.utils import password_hasher
+
+        try:
+            print("Default data created" if seed_defaults(args.db) else "Database already has users, not seeded")
+        finally:
+            password_hasher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Change log that keeps per-process state coherent across worker processes.
+
+Triggers from revision 0008 append (topic, key) to change_log for every
+write to the tables that processes hold state about. Each process
+remembers the last sequence number it has applied. ``ChangeFeed.poll``
+reads newer entries and hands their keys to the handlers subscribed to
+each topic, which refresh just those keys.
+
+Write paths poll inside their BEGIN IMMEDIATE transaction, through
+ReservationIndex.ensure_loaded, so a conflict check sees every booking
+committed by any worker. A background task polls the rest of the time.
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from .pool import transaction
+
+POLL_INTERVAL_SECONDS = float(os.getenv("CHANGE_LOG_POLL_SECONDS", "0.5"))
+# Entries only need to outlive the slowest worker's next poll
+RETENTION_SECONDS = int(os.getenv("CHANGE_LOG_RETENTION_SECONDS", "600"))
+PRUNE_INTERVAL_SECONDS = 60
+# A worker that has not polled for this long reports itself unhealthy
+STALE_AFTER_SECONDS = max(10.0, POLL_INTERVAL_SECONDS * 20)
+
+
+def prune(conn, retention_seconds: int = RETENTION_SECONDS) -> int:
+    with transaction(conn):
+        return conn.execute(
+            "DELETE FROM change_log WHERE created_at < CAST(strftime('%s', 'now') AS INTEGER) - ?",
+            (retention_seconds,)
+        ).rowcount
+
+
+class ChangeFeed:
+    """This process's position in change_log and the handlers to apply it.
+
+    A handler is called as ``handler(conn, keys)`` with the changed keys of
+    its topic, or with None when entries were pruned before this process
+    read them and it must drop everything it holds for the topic.
+    """
+
+    def __init__(self):
+        # Reentrant: the reservation index shares it, and its handlers run under it
+        self.lock = threading.RLock()
+        self.last_seq: Optional[int] = None
+        self._handlers: Dict[str, List[Callable[..., None]]] = {}
+
+    def subscribe(self, topic: str, handler: Callable[..., None]):
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def poll(self, conn) -> int:
+        """Apply the entries logged since the last poll; returns how many there were.
+
+        The first poll only records the current position: state loaded after
+        it is read from the tables themselves.
+        """
+        with self.lock:
+            if self.last_seq is None:
+                self.last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+                return 0
+            rows = conn.execute(
+                "SELECT seq, topic, key FROM change_log WHERE seq > ? ORDER BY seq", (self.last_seq,)
+            ).fetchall()
+            if not rows:
+                return 0
+            # AUTOINCREMENT never reuses numbers, so a gap means pruned entries
+            lost = rows[0][0] != self.last_seq + 1
+            keys: Dict[str, Set[int]] = {}
+            for _, topic, key in rows:
+                keys.setdefault(topic, set()).add(key)
+            self.last_seq = rows[-1][0]
+            for topic, handlers in self._handlers.items():
+                if lost or topic in keys:
+                    for handler in handlers:
+                        handler(conn, None if lost else keys[topic])
+            return len(rows)
+
+
+change_feed = ChangeFeed()
@@ -0,0 +1,36 @@
+import os
+
+from .pool import transaction
+
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("DASHBOARD_RECONCILE_SECONDS", "3600"))
+
+# Counter name -> query that computes it from scratch. Triggers from
+# revision 0003 keep the stored counters current for every writer of the
+# database; reconcile() corrects any drift.
+COUNTERS = {
+    "total_labs": "SELECT COUNT(*) FROM labs WHERE is_active = 1",
+    "total_sessions": "SELECT COUNT(*) FROM reservations",
+    "pending_requests": "SELECT COUNT(*) FROM reservations WHERE status = 'pending'",
+    "total_users": "SELECT COUNT(*) FROM users WHERE is_active = 1",
+}
+
+
+def read(conn) -> dict:
+    values = dict(conn.execute("SELECT name, value FROM dashboard_counters").fetchall())
+    return {name: values.get(name, 0) for name in COUNTERS}
+
+
+def reconcile(conn) -> dict:
+    """Recompute every counter from the base tables; returns the drift that was corrected."""
+    drift = {}
+    with transaction(conn):
+        current = read(conn)
+        for name, query in COUNTERS.items():
+            actual = conn.execute(query).fetchone()[0]
+            if actual != current[name]:
+                drift[name] = actual - current[name]
+                conn.execute(
+                    "INSERT OR REPLACE INTO dashboard_counters (name, value) VALUES (?, ?)",
+                    (name, actual)
+                )
+    return drift
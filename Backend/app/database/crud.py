@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import String, select, tuple_, type_coerce
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+
+from . import models
+from ..auth.cache import principal_cache
+from ..auth.utils import password_hasher
+from ..schemas.reservation import CourseCreate
+from ..schemas.user import UserCreate, UserUpdate
+from ..utils.reference_cache import reference_cache
+
+# Users
+def get_user(db: Session, user_id: int) -> Optional[models.User]:
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+def get_user_by_username(db: Session, username: str) -> Optional[models.User]:
+    return db.query(models.User).filter(models.User.username == username).first()
+
+def create_user(db: Session, user: UserCreate) -> models.User:
+    db_user = models.User(
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        hashed_password=password_hasher.hash_sync(user.password),
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+def update_user(db: Session, user_id: int, user: UserUpdate) -> Optional[models.User]:
+    db_user = get_user(db, user_id)
+    if db_user is None:
+        return None
+    for field, value in user.model_dump(exclude_unset=True).items():
+        setattr(db_user, field, value)
+    db.commit()
+    db.refresh(db_user)
+    # Cached principals carry role and is_active, so they must not outlive this change
+    principal_cache.invalidate_user(db_user.username)
+    return db_user
+
+def deactivate_user(db: Session, user_id: int) -> Optional[models.User]:
+    return update_user(db, user_id, UserUpdate(is_active=False))
+
+# Courses
+def create_course(db: Session, course: CourseCreate) -> models.Course:
+    db_course = models.Course(**course.model_dump())
+    db.add(db_course)
+    db.commit()
+    db.refresh(db_course)
+    # Other workers follow through the table_versions triggers
+    reference_cache.invalidate("courses")
+    return db_course
+
+# Reservations
+#
+# Loader options per use case. Every profile ends in raiseload("*"), so a
+# relationship the profile does not load raises instead of quietly issuing
+# one query per row.
+RESERVATION_LOAD_PROFILES = {
+    # A single reservation with everything it refers to, in one joined query
+    "detail": (
+        joinedload(models.Reservation.instructor, innerjoin=True),
+        joinedload(models.Reservation.lab, innerjoin=True),
+        joinedload(models.Reservation.course, innerjoin=True),
+        raiseload("*"),
+    ),
+    # Many reservations: one query for the rows plus one per related table,
+    # whatever the number of rows
+    "report": (
+        selectinload(models.Reservation.instructor),
+        selectinload(models.Reservation.lab),
+        selectinload(models.Reservation.course),
+        raiseload("*"),
+    ),
+}
+
+# Stored timestamps compared as the 'YYYY-MM-DD HH:MM:SS' text they are
+# stored as, like the raw-SQL listings, instead of through DateTime binds
+_start_text = type_coerce(models.Reservation.start_time, String)
+_end_text = type_coerce(models.Reservation.end_time, String)
+
+
+class ReservationRow:
+    """Read-only listing entry, built from a single joined column query."""
+
+    __slots__ = ("id", "lab_id", "course_id", "instructor_id", "section", "start_time", "end_time",
+                 "duration", "notes", "status", "instructor_name", "lab_name", "course_name")
+
+    def __init__(self, row):
+        (self.id, self.lab_id, self.course_id, self.instructor_id, self.section, self.start_time,
+         self.end_time, self.duration, self.notes, status, self.instructor_name, self.lab_name,
+         self.course_name) = row
+        self.status = status.value if status is not None else None
+
+
+def reservation_query(profile: str):
+    """SELECT of Reservation entities with the loader options of ``profile``."""
+    return select(models.Reservation).options(*RESERVATION_LOAD_PROFILES[profile])
+
+
+def filter_reservations(query, lab_id: Optional[int] = None, instructor_id: Optional[int] = None,
+                        course_id: Optional[int] = None, status: Optional[models.ReservationStatus] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None):
+    for column, value in ((models.Reservation.lab_id, lab_id),
+                          (models.Reservation.instructor_id, instructor_id),
+                          (models.Reservation.course_id, course_id),
+                          (models.Reservation.status, status)):
+        if value is not None:
+            query = query.where(column == value)
+    if start_date is not None:
+        query = query.where(_start_text >= start_date.isoformat())
+    if end_date is not None:
+        query = query.where(_start_text < (end_date + timedelta(days=1)).isoformat())
+    return query
+
+
+def get_reservation(db: Session, reservation_id: int) -> Optional[models.Reservation]:
+    query = reservation_query("detail").where(models.Reservation.id == reservation_id)
+    return db.scalars(query).first()
+
+
+def get_reservations_for_report(db: Session, start_date: Optional[date] = None,
+                                end_date: Optional[date] = None,
+                                statuses: Sequence[models.ReservationStatus] = ()) -> List[models.Reservation]:
+    query = filter_reservations(reservation_query("report"), start_date=start_date, end_date=end_date)
+    if statuses:
+        query = query.where(models.Reservation.status.in_(statuses))
+    return list(db.scalars(query.order_by(_start_text, models.Reservation.id)))
+
+
+def list_reservation_rows(db: Session, after: Optional[Tuple[str, int]] = None, limit: int = 50,
+                          **filters) -> List[ReservationRow]:
+    """A keyset page of reservations, newest first, as ReservationRow DTOs.
+
+    ``after`` is the (start_time, id) of the last row of the previous page.
+    """
+    reservation = models.Reservation
+    query = filter_reservations(
+        select(
+            reservation.id, reservation.lab_id, reservation.course_id, reservation.instructor_id,
+            reservation.section, _start_text, _end_text, reservation.duration, reservation.notes,
+            reservation.status, models.User.full_name, models.Lab.name, models.Course.name,
+        )
+        .join(models.User, reservation.instructor_id == models.User.id)
+        .join(models.Lab, reservation.lab_id == models.Lab.id)
+        .join(models.Course, reservation.course_id == models.Course.id),
+        **filters
+    )
+    if after is not None:
+        query = query.where(tuple_(_start_text, reservation.id) < tuple_(*after))
+    query = query.order_by(_start_text.desc(), reservation.id.desc()).limit(limit)
+    return [ReservationRow(row) for row in db.execute(query)]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Date, DateTime, Text, Enum
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -14,6 +14,10 @@ class ReservationStatus(enum.Enum):
     APPROVED = "approved"
     DECLINED = "declined"
 
+def _stored_values(enum_class):
+    # The tables hold the lowercase values ('pending'), not the member names
+    return [member.value for member in enum_class]
+
 class User(Base):
     __tablename__ = "users"
     
@@ -22,7 +26,7 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(100), nullable=False)
-    role = Column(Enum(UserRole), nullable=False)
+    role = Column(Enum(UserRole, values_callable=_stored_values), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -65,10 +69,65 @@ class Reservation(Base):
     end_time = Column(DateTime, nullable=False)
     duration = Column(Integer, nullable=False)  # in hours
     notes = Column(Text)
-    status = Column(Enum(ReservationStatus), default=ReservationStatus.PENDING)
+    status = Column(Enum(ReservationStatus, values_callable=_stored_values), default=ReservationStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     instructor = relationship("User", back_populates="reservations")
     lab = relationship("Lab", back_populates="reservations")
-    course = relationship("Course")
\ No newline at end of file
+    course = relationship("Course")
+
+class ReservationSeries(Base):
+    __tablename__ = "reservation_series"
+    __table_args__ = (
+        Index("ix_reservation_series_lab_start", "lab_id", "start_time"),
+        Index("ix_reservation_series_status_start", "status", "start_time"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    instructor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    lab_id = Column(Integer, ForeignKey("labs.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    section = Column(String(20), nullable=False)
+    start_time = Column(DateTime, nullable=False)  # first occurrence
+    end_time = Column(DateTime, nullable=False)
+    rrule = Column(String(200), nullable=False)  # e.g. FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20250516
+    until_time = Column(DateTime, nullable=False)  # no occurrence starts at or after this
+    duration = Column(Integer, nullable=False)  # in hours, per occurrence
+    notes = Column(Text)
+    status = Column(Enum(ReservationStatus, values_callable=_stored_values), default=ReservationStatus.PENDING)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    instructor = relationship("User")
+    lab = relationship("Lab")
+    course = relationship("Course")
+    exceptions = relationship("ReservationSeriesException", cascade="all, delete-orphan")
+
+class ReservationSeriesException(Base):
+    __tablename__ = "reservation_series_exceptions"
+    
+    series_id = Column(Integer, ForeignKey("reservation_series.id", ondelete="CASCADE"), primary_key=True)
+    occurrence_date = Column(Date, primary_key=True)
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # Unread-only and full listings per user, both in created_at order
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    notification_type = Column(String(50), nullable=False)
+    is_read = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class NotificationCounter(Base):
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread = Column(Integer, default=0, nullable=False)
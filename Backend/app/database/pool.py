@@ -0,0 +1,167 @@
+import asyncio
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Optional, Sequence
+
+from ..utils.metrics import record_query
+
+DATABASE_PATH = os.getenv("LAB_SCHEDULER_DB", "lab_scheduler.db")
+POOL_SIZE = int(os.getenv("LAB_SCHEDULER_DB_POOL_SIZE", "8"))
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_MS = 5000
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that reports every statement to the metrics module.
+
+    Only the execute call is timed; rows fetched afterwards are stepped
+    outside it.
+    """
+
+    def execute(self, sql: str, parameters: Sequence = ()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_query("sqlite3", sql, time.perf_counter() - started,
+                         partial(self._explain, sql, parameters))
+
+    def executemany(self, sql: str, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query("sqlite3", sql, time.perf_counter() - started)
+
+    def _explain(self, sql: str, parameters: Sequence) -> list:
+        return super().execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+
+
+class ConnectionPool:
+    """Runs blocking sqlite3 work on a bounded set of worker threads.
+
+    Every worker thread lazily opens one long-lived connection and keeps it for
+    the life of the pool, so sqlite3's per-connection statement cache turns
+    repeated queries into prepared-statement reuse.
+    """
+
+    def __init__(self, path: str = DATABASE_PATH, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None leaves transaction control to `transaction()`
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None,
+            factory=TimedConnection,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.size, thread_name_prefix="sqlite-pool"
+                    )
+        return self._executor
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict):
+        return fn(self.connection(), *args, **kwargs)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(conn, *args, **kwargs)`` on a pool thread and await the result."""
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context so statements are counted against its request
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._get_executor(), partial(context.run, self._call, fn, args, kwargs)
+        )
+
+    async def fetchall(self, sql: str, params: Sequence = ()) -> list:
+        return await self.run(_fetchall, sql, params)
+
+    async def fetchone(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        return await self.run(_fetchone, sql, params)
+
+    async def execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        """Execute a single write statement in its own transaction."""
+        return await self.run(_execute, sql, params)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+            # Threads that owned these connections are gone with the executor
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, immediate: bool = True):
+    """Wrap a block in BEGIN/COMMIT, rolling back on any exception.
+
+    BEGIN IMMEDIATE takes the write lock up front so read-check-write
+    sequences cannot interleave with another writer.
+    """
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def _fetchall(conn: sqlite3.Connection, sql: str, params: Sequence) -> list:
+    return conn.execute(sql, params).fetchall()
+
+
+def _fetchone(conn: sqlite3.Connection, sql: str, params: Sequence) -> Optional[tuple]:
+    return conn.execute(sql, params).fetchone()
+
+
+def _execute(conn: sqlite3.Connection, sql: str, params: Sequence) -> sqlite3.Cursor:
+    with transaction(conn):
+        return conn.execute(sql, params)
+
+
+_pool: Optional[ConnectionPool] = None
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool()
+    return _pool
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+
+from ..utils.validators import to_timestamp
+from .series import expand, load_series
+
+# Seconds of an approved reservation, computed from its stored timestamps
+_SECONDS = "CAST(strftime('%s', {0}.end_time) AS INTEGER) - CAST(strftime('%s', {0}.start_time) AS INTEGER)"
+
+# Approved reservations are rolled up per (instructor, lab, month) into
+# instructor_usage_rollup by the triggers of revision 0003, so every writer
+# keeps the rollup current.
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def instructor_usage(conn, start: date, end: date) -> List[dict]:
+    """InstructorUsage rows for approved reservations starting in [start, end).
+
+    Whole months are summed from the rollup; only partial months at either
+    edge of the range are read from `reservations` (through its
+    (status, start_time) index). Recurring series are expanded over the range.
+    """
+    totals: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+
+    first_full = start if start.day == 1 else _next_month(start)
+    last_full = end.replace(day=1)
+    if first_full < last_full:
+        rows = conn.execute('''
+            SELECT instructor_id, lab_id, SUM(reservations), SUM(seconds)
+            FROM instructor_usage_rollup
+            WHERE month >= ? AND month < ?
+            GROUP BY instructor_id, lab_id
+        ''', (first_full.strftime("%Y-%m"), last_full.strftime("%Y-%m")))
+        edges = [(start, first_full), (last_full, end)]
+    else:
+        rows = []
+        edges = [(start, end)]
+    for instructor_id, lab_id, count, seconds in rows:
+        totals[(instructor_id, lab_id)][0] += count
+        totals[(instructor_id, lab_id)][1] += seconds or 0
+
+    for edge_start, edge_end in edges:
+        if edge_start >= edge_end:
+            continue
+        for instructor_id, lab_id, count, seconds in conn.execute(f'''
+            SELECT r.instructor_id, r.lab_id, COUNT(*), SUM({_SECONDS.format("r")})
+            FROM reservations r
+            WHERE r.status = 'approved' AND r.start_time >= ? AND r.start_time < ?
+            GROUP BY r.instructor_id, r.lab_id
+        ''', (edge_start.isoformat(), edge_end.isoformat())):
+            totals[(instructor_id, lab_id)][0] += count
+            totals[(instructor_id, lab_id)][1] += seconds or 0
+
+    # Recurring series have no rows to roll up; their occurrences are expanded instead
+    period = (to_timestamp(datetime.combine(start, time())), to_timestamp(datetime.combine(end, time())))
+    for series, occurrence_start, occurrence_end in expand(load_series(conn, ("approved",), start, end), *period):
+        totals[(series.instructor_id, series.lab_id)][0] += 1
+        totals[(series.instructor_id, series.lab_id)][1] += occurrence_end - occurrence_start
+
+    return _summarize(conn, totals)
+
+
+def _summarize(conn, totals: Dict[Tuple[int, int], List[int]]) -> List[dict]:
+    per_instructor: Dict[int, Dict[int, List[int]]] = defaultdict(dict)
+    for (instructor_id, lab_id), values in totals.items():
+        if values[0]:
+            per_instructor[instructor_id][lab_id] = values
+    if not per_instructor:
+        return []
+
+    instructor_ids = list(per_instructor)
+    lab_ids = list({lab_id for labs in per_instructor.values() for lab_id in labs})
+    names = dict(conn.execute(
+        f"SELECT id, full_name FROM users WHERE id IN ({', '.join('?' for _ in instructor_ids)})",
+        instructor_ids
+    ).fetchall())
+    lab_names = dict(conn.execute(
+        f"SELECT id, name FROM labs WHERE id IN ({', '.join('?' for _ in lab_ids)})",
+        lab_ids
+    ).fetchall())
+
+    usage = []
+    for instructor_id, labs in per_instructor.items():
+        favorite = max(labs, key=lambda lab_id: (labs[lab_id][1], labs[lab_id][0]))
+        usage.append({
+            "instructor_name": names.get(instructor_id, f"User {instructor_id}"),
+            "total_reservations": sum(values[0] for values in labs.values()),
+            "total_hours": round(sum(values[1] for values in labs.values()) / 3600),
+            "favorite_lab": lab_names.get(favorite, f"Lab {favorite}"),
+        })
+    usage.sort(key=lambda row: (-row["total_hours"], row["instructor_name"]))
+    return usage
@@ -0,0 +1,65 @@
+"""Schema of the application database, shared by the raw-SQL and SQLAlchemy code paths.
+
+The DDL lives in the Alembic migration chain in Backend/alembic, each
+revision with its own frozen copy; ``migrate`` brings a database file up to
+the latest revision. Statements use IF NOT EXISTS so that databases created
+before the migrations existed can be upgraded from the first revision in
+place. The helpers below build statements for the revisions.
+"""
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .pool import DATABASE_PATH
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+# Newest revision in alembic/versions; the startup check compares the
+# database's stamp against it without loading Alembic
+HEAD_REVISION = "0008"
+
+
+def create_index(name: str, definition: str) -> str:
+    return f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"
+
+
+def drop_index(name: str) -> str:
+    return f"DROP INDEX IF EXISTS {name}"
+
+
+def drop_triggers(statements: Iterable[str]) -> List[str]:
+    """DROP statements for every trigger that ``statements`` create, for a downgrade."""
+    return [f"DROP TRIGGER IF EXISTS {name}"
+            for statement in statements
+            for name in re.findall(r"CREATE TRIGGER IF NOT EXISTS (\w+)", statement)]
+
+
+def alembic_config(path: str = DATABASE_PATH):
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    return config
+
+
+def migrate(path: str = DATABASE_PATH, revision: str = "head"):
+    """Upgrade the database at ``path`` to ``revision``."""
+    from alembic import command
+
+    command.upgrade(alembic_config(path), revision)
+
+
+def current_revision(path: str = DATABASE_PATH) -> Optional[str]:
+    """The Alembic revision stamped in the database, None if unmigrated."""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
@@ -0,0 +1,81 @@
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.recurrence import WeeklyRule, day_number, parse_rrule
+from ..utils.validators import format_timestamp, to_timestamp
+
+# Tables from revision 0004: one row per recurring booking; occurrences are
+# expanded from the rule on demand and skipped dates live in
+# reservation_series_exceptions.
+_SELECT = '''
+    SELECT s.id, s.lab_id, s.instructor_id, s.start_time, s.end_time, s.rrule, s.status,
+           (SELECT group_concat(e.occurrence_date) FROM reservation_series_exceptions e
+            WHERE e.series_id = s.id)
+    FROM reservation_series s
+'''
+
+
+class SeriesRow:
+    __slots__ = ("id", "lab_id", "instructor_id", "status", "rule")
+
+    def __init__(self, series_id: int, lab_id: int, instructor_id: int, status: str, rule: WeeklyRule):
+        self.id = series_id
+        self.lab_id = lab_id
+        self.instructor_id = instructor_id
+        self.status = status
+        self.rule = rule
+
+
+def _row(row) -> SeriesRow:
+    series_id, lab_id, instructor_id, start_time, end_time, rrule, status, exdates = row
+    exceptions = [day_number(date.fromisoformat(day)) for day in exdates.split(",")] if exdates else ()
+    rule = parse_rrule(rrule, to_timestamp(start_time), to_timestamp(end_time), exceptions)
+    return SeriesRow(series_id, lab_id, instructor_id, status, rule)
+
+
+def get_series(conn, series_id: int) -> Optional[SeriesRow]:
+    row = conn.execute(f"{_SELECT} WHERE s.id = ?", (series_id,)).fetchone()
+    return _row(row) if row else None
+
+
+def load_series(conn, statuses: Sequence[str], start: Optional[date] = None,
+                end: Optional[date] = None) -> List[SeriesRow]:
+    """Series in ``statuses`` with occurrences that may start in [start, end)."""
+    clauses = [f"s.status IN ({', '.join('?' for _ in statuses)})"]
+    params: list = list(statuses)
+    if end is not None:
+        clauses.append("s.start_time < ?")
+        params.append(end.isoformat())
+    if start is not None:
+        clauses.append("s.until_time > ?")
+        params.append(start.isoformat())
+    return [_row(row) for row in conn.execute(f"{_SELECT} WHERE {' AND '.join(clauses)}", params)]
+
+
+def create_series(conn, instructor_id: int, lab_id: int, course_id: int, section: str,
+                  start_time: str, end_time: str, rrule: str, rule: WeeklyRule,
+                  duration: int, notes: Optional[str]) -> int:
+    cursor = conn.execute('''
+        INSERT INTO reservation_series (instructor_id, lab_id, course_id, section, start_time, end_time,
+                                        rrule, until_time, duration, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'), ?, ?)
+    ''', (instructor_id, lab_id, course_id, section, format_timestamp(start_time),
+          format_timestamp(end_time), rrule, rule.until, duration, notes))
+    return cursor.lastrowid
+
+
+def add_exception(conn, series_id: int, day: date):
+    conn.execute(
+        "INSERT OR IGNORE INTO reservation_series_exceptions (series_id, occurrence_date) VALUES (?, ?)",
+        (series_id, day.isoformat())
+    )
+
+
+def expand(series: Sequence[SeriesRow], start: int, end: int) -> List[Tuple[SeriesRow, int, int]]:
+    """Occurrences of ``series`` starting in [start, end), as (series, start, end)."""
+    return [
+        (row, occurrence_start, occurrence_end)
+        for row in series
+        for occurrence_start, occurrence_end in row.rule.occurrences(start, end)
+        if occurrence_start >= start
+    ]
@@ -0,0 +1,11 @@
+from typing import Dict
+
+# Version numbers of the labs and courses tables. Triggers from revision
+# 0006 bump them on every write, whichever worker process makes it, so
+# readers that cache data derived from these tables compare versions
+# instead of re-reading the tables. Calendar feeds are versioned the same
+# way per lab and instructor in calendar_versions (revision 0007).
+
+
+def read(conn) -> Dict[str, int]:
+    return dict(conn.execute("SELECT name, version FROM table_versions").fetchall())
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parents[2] / "Frontend" / "static"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Below this size compression costs more than it saves
+MIN_COMPRESS_SIZE = 512
+_ASSET_REFERENCE = re.compile(r'\b(src|href)="(/static/[^"?#]+)"')
+
+
+class Asset:
+    """One pre-encoded response body with its content-hash ETag."""
+
+    __slots__ = ("body", "encodings", "etag", "version", "media_type")
+
+    def __init__(self, body: bytes, media_type: str):
+        digest = hashlib.sha256(body).hexdigest()
+        self.body = body
+        self.media_type = media_type
+        self.version = digest[:12]
+        self.etag = f'"{digest[:32]}"'
+        self.encodings: Dict[str, bytes] = {}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.encodings["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encodings["br"] = brotli.compress(body, quality=11)
+
+
+class AssetCache:
+    """In-memory, precompressed copies of the UI shell and static files.
+
+    Everything is encoded once when the cache is built; serving a request is
+    a dict lookup, an ETag comparison and a choice between ready-made bodies.
+    """
+
+    def __init__(self):
+        self._assets: Dict[str, Asset] = {}
+
+    def add(self, path: str, body: bytes, media_type: Optional[str] = None) -> Asset:
+        media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = Asset(body, media_type)
+        self._assets[path] = asset
+        return asset
+
+    def add_directory(self, root: Path, prefix: str):
+        if not root.is_dir():
+            return
+        for file in sorted(root.rglob("*")):
+            if file.is_file():
+                self.add(f"{prefix}/{file.relative_to(root).as_posix()}", file.read_bytes())
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self._assets.get(path)
+
+    def url(self, path: str) -> str:
+        """Versioned URL for an asset; versioned URLs are served as immutable."""
+        asset = self._assets.get(path)
+        return f"{path}?v={asset.version}" if asset else path
+
+    def versioned(self, html: str) -> str:
+        """``html`` with each src/href naming a cached asset pointed at its versioned URL."""
+        return _ASSET_REFERENCE.sub(lambda m: f'{m[1]}="{self.url(m[2])}"', html)
+
+    def response(self, request: Request, path: str) -> Optional[Response]:
+        asset = self._assets.get(path)
+        if asset is None:
+            return None
+
+        versioned = request.query_params.get("v") == asset.version
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), asset.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = _negotiate(request.headers.get("accept-encoding", ""), asset.encodings)
+        body = asset.body
+        if encoding:
+            body = asset.encodings[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(
+        tag[2:] == etag if tag.startswith("W/") else tag == etag
+        for tag in candidates
+    )
+
+
+def _negotiate(header: str, available: Dict[str, bytes]) -> Optional[str]:
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, 0) > 0:
+            return coding
+    return None
+
+
+asset_cache = AssetCache()
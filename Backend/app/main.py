@@ -1,16 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
-import sqlite3
+import asyncio
+import base64
 import json
-from datetime import datetime, timedelta
-from passlib.context import CryptContext
+import logging
+import time
+from datetime import date, datetime, timedelta
 import jwt
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .api.endpoints import calendar, courses, notifications, reports, reservations, schedule
+from .frontend import STATIC_DIR, asset_cache
+from .auth.security import verify_password_async
+from .auth.utils import HashPoolSaturated, password_hasher
+from .database import bootstrap, counters, series
+from .database import changes as change_log
+from .database.pool import DATABASE_PATH, get_pool, transaction
+from .utils.availability import MAX_QUERY_DAYS, availability_map, date_range, parse_clock
+from .utils.conflicts import ACTIVE_STATUSES, ReservationConflict, reservation_index
+from .schemas.report import ExportJob
+from .utils import exports, metrics
+from .utils.importer import BATCH_SIZE as IMPORT_BATCH_SIZE, BatchImporter, RecordParser
+from .utils.notifications import broker, notify, reservation_status_notification
+from .utils.recurrence import DAY_SECONDS, day_number, parse_rrule
+from .utils.reference_cache import reference_cache
+from .utils.timetable import solver_pool
+from .utils.validators import format_timestamp, from_timestamp, to_timestamp, validate_time_range
+from .utils.workflow import InvalidTransition, check_transition, parse_status
 
 # JWT settings
 SECRET_KEY = "your-secret-key-change-in-production"
@@ -32,121 +50,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database initialization
-def init_db():
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            hashed_password TEXT NOT NULL,
-            full_name TEXT NOT NULL,
-            role TEXT NOT NULL,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS labs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            description TEXT,
-            capacity INTEGER NOT NULL,
-            equipment TEXT,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            code TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            description TEXT,
-            credits INTEGER DEFAULT 3,
-            is_active BOOLEAN DEFAULT TRUE
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS reservations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            instructor_id INTEGER NOT NULL,
-            lab_id INTEGER NOT NULL,
-            course_id INTEGER NOT NULL,
-            section TEXT NOT NULL,
-            start_time TIMESTAMP NOT NULL,
-            end_time TIMESTAMP NOT NULL,
-            duration INTEGER NOT NULL,
-            notes TEXT,
-            status TEXT DEFAULT 'pending',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (instructor_id) REFERENCES users (id),
-            FOREIGN KEY (lab_id) REFERENCES labs (id),
-            FOREIGN KEY (course_id) REFERENCES courses (id)
-        )
-    ''')
-    
-    # Insert default data
-    cursor.execute("SELECT COUNT(*) FROM users")
-    if cursor.fetchone()[0] == 0:
-        # Default users with hashed passwords
-        users = [
-            ('admin', 'admin@university.edu', pwd_context.hash('admin123'), 'System Administrator', 'admin'),
-            ('instructor1', 'instructor1@university.edu', pwd_context.hash('instructor123'), 'Dr. John Smith', 'instructor'),
-            ('student1', 'student1@university.edu', pwd_context.hash('student123'), 'Alice Johnson', 'student')
-        ]
-        cursor.executemany('''
-            INSERT INTO users (username, email, hashed_password, full_name, role)
-            VALUES (?, ?, ?, ?, ?)
-        ''', users)
-        
-        # Default labs
-        labs = [
-            ('Lab A', 'Main Computer Lab', 30, '30 PCs, Projector, Whiteboard'),
-            ('Lab B', 'Mac Lab', 25, '25 Macs, Projector'),
-            ('Lab C', 'Advanced Computing Lab', 40, '40 PCs, Smart Board'),
-            ('Lab D', 'VR Lab', 20, '20 PCs, VR Equipment')
-        ]
-        cursor.executemany('''
-            INSERT INTO labs (name, description, capacity, equipment)
-            VALUES (?, ?, ?, ?)
-        ''', labs)
-        
-        # Default courses
-        courses = [
-            ('CS101', 'Introduction to Computer Science', 'Basic programming concepts', 3),
-            ('IT202', 'Web Development Fundamentals', 'HTML, CSS, JavaScript', 3),
-            ('CS305', 'Data Structures and Algorithms', 'Advanced data structures', 4),
-            ('IT410', 'Advanced Database Systems', 'Database design and optimization', 4)
-        ]
-        cursor.executemany('''
-            INSERT INTO courses (code, name, description, credits)
-            VALUES (?, ?, ?, ?)
-        ''', courses)
-        
-        # Sample reservations
-        sample_reservations = [
-            (2, 1, 1, 'CS101-A', '2024-01-15 09:00:00', '2024-01-15 11:00:00', 2, 'Regular class', 'approved'),
-            (2, 2, 2, 'IT202-B', '2024-01-16 14:00:00', '2024-01-16 16:00:00', 2, 'Lab session', 'approved'),
-            (2, 3, 3, 'CS305-C', '2024-01-17 10:00:00', '2024-01-17 12:00:00', 2, None, 'pending'),
-        ]
-        cursor.executemany('''
-            INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', sample_reservations)
-    
-    conn.commit()
-    conn.close()
+# Outermost, so the timing covers CORS handling as well
+app.add_middleware(metrics.MetricsMiddleware)
+
+app.include_router(reports.router, prefix="/api/v1")
+app.include_router(schedule.router, prefix="/api/v1")
+app.include_router(reservations.router, prefix="/api/v1")
+app.include_router(courses.router, prefix="/api/v1")
+app.include_router(calendar.router, prefix="/api/v1")
+app.include_router(notifications.router, prefix="/api/v1")
+
+logger = logging.getLogger(__name__)
+
+# Shared SQLite connection pool used by every request handler
+db = get_pool()
+
+# Registered first: the other startup work needs the schema in place
+@app.on_event("startup")
+async def bootstrap_database():
+    # Migrates only when the stamp is behind; seeding is `python -m app.database.bootstrap --seed`
+    await asyncio.get_running_loop().run_in_executor(None, bootstrap.ensure_schema, DATABASE_PATH)
+
+@app.on_event("startup")
+async def follow_change_log():
+    # Take this worker's place in the change log before anything is cached
+    await db.run(change_log.change_feed.poll)
+    app.state.change_log_polled = time.monotonic()
+    app.state.change_log_task = asyncio.create_task(_follow_change_log())
+
+@app.on_event("startup")
+async def start_counter_reconciliation():
+    app.state.reconcile_task = asyncio.create_task(_reconcile_counters_periodically())
 
-# Initialize database on startup
-init_db()
+@app.on_event("startup")
+async def build_asset_cache():
+    asset_cache.add_directory(STATIC_DIR, "/static")
+    # The shell goes last so it links to the current version of each static file
+    asset_cache.add("/app", asset_cache.versioned(WEB_INTERFACE_HTML).encode(), "text/html; charset=utf-8")
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    app.state.reconcile_task.cancel()
+    app.state.change_log_task.cancel()
+    db.close()
+    reference_cache.close()
+    password_hasher.close()
+    solver_pool.close()
+    exports.export_jobs.close()
+
+async def _reconcile_counters_periodically():
+    # Safety net in case the trigger-maintained counters drift from the base tables
+    while True:
+        await asyncio.sleep(counters.RECONCILE_INTERVAL_SECONDS)
+        try:
+            drift = await db.run(counters.reconcile)
+        except Exception:
+            # e.g. the database stayed locked past busy_timeout; try again next interval
+            logger.exception("Dashboard counter reconciliation failed")
+            continue
+        if drift:
+            logger.warning("Dashboard counters corrected: %s", drift)
+
+async def _follow_change_log():
+    # Applies writes made by other worker processes to this one's caches and conflict index
+    pruned = time.monotonic()
+    while True:
+        await asyncio.sleep(change_log.POLL_INTERVAL_SECONDS)
+        try:
+            await db.run(change_log.change_feed.poll)
+            app.state.change_log_polled = time.monotonic()
+            app.state.change_log_error = None
+            if time.monotonic() - pruned >= change_log.PRUNE_INTERVAL_SECONDS:
+                await db.run(change_log.prune)
+                pruned = time.monotonic()
+        except Exception as e:
+            # Keep retrying; /health reports the worker unhealthy until a poll succeeds
+            logger.exception("Change log poll failed")
+            app.state.change_log_error = f"{type(e).__name__}: {e}"
+
+def _change_log_health():
+    error = getattr(app.state, "change_log_error", None)
+    polled = getattr(app.state, "change_log_polled", None)
+    lag = None if polled is None else round(time.monotonic() - polled, 1)
+    stale = lag is not None and lag > change_log.STALE_AFTER_SECONDS
+    return {"healthy": error is None and not stale, "error": error, "seconds_since_poll": lag}
 
 # Pydantic models
 class LoginRequest(BaseModel):
@@ -175,6 +162,24 @@ class ReservationRequest(BaseModel):
     duration: int
     notes: Optional[str] = None
 
+class BatchStatusRequest(BaseModel):
+    status: str
+    ids: Optional[List[int]] = None
+    lab_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    current_status: Optional[str] = None
+
+class ReservationSeriesRequest(BaseModel):
+    lab_id: int
+    course_id: int
+    section: str
+    start_time: str  # first occurrence
+    end_time: str
+    rrule: str  # e.g. FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20250516
+    duration: int
+    notes: Optional[str] = None
+
 class ReservationResponse(BaseModel):
     id: int
     lab_id: int
@@ -204,7 +209,7 @@ def verify_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         return None
 
 # API Routes
@@ -214,26 +219,48 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    # A worker whose change log has stalled may be serving stale caches and conflict checks
+    change_feed = _change_log_health()
+    body = {
+        "status": "healthy" if change_feed["healthy"] else "unhealthy",
+        "timestamp": datetime.now().isoformat(),
+        "password_hashing": password_hasher.stats(),
+        "change_log": change_feed
+    }
+    return body if change_feed["healthy"] else JSONResponse(body, status_code=503)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+metrics.registry.gauge(
+    "password_hash_in_flight", "bcrypt operations running in worker processes.",
+    lambda: password_hasher.stats()["in_flight"])
+metrics.registry.gauge(
+    "password_hash_queue_depth", "bcrypt operations waiting for a worker process.",
+    lambda: password_hasher.stats()["queue_depth"])
+metrics.registry.gauge(
+    "notification_stream_subscribers", "Open notification event streams.",
+    broker.subscriber_count)
 
 @app.post("/api/v1/login", response_model=TokenResponse)
 async def login(login_data: LoginRequest):
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    
-    cursor.execute(
+    user = await db.fetchone(
         "SELECT id, username, email, hashed_password, full_name, role, is_active FROM users WHERE username = ?", 
         (login_data.username,)
     )
-    user = cursor.fetchone()
-    conn.close()
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
     user_id, username, email, hashed_password, full_name, role, is_active = user
     
-    if not pwd_context.verify(login_data.password, hashed_password):
+    try:
+        password_ok = await verify_password_async(login_data.password, hashed_password)
+    except HashPoolSaturated:
+        raise HTTPException(status_code=429, detail="Too many login attempts, please retry", headers={"Retry-After": "1"})
+    
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
     access_token = create_access_token(
@@ -254,14 +281,13 @@ async def login(login_data: LoginRequest):
     }
 
 @app.get("/api/v1/labs")
-async def get_labs():
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name, description, capacity, equipment FROM labs WHERE is_active = 1")
-    labs = cursor.fetchall()
-    conn.close()
+async def get_labs(request: Request):
+    return await reference_cache.response(request, "labs", None, lambda: db.run(_labs_json))
+
+def _labs_json(conn):
+    labs = conn.execute("SELECT id, name, description, capacity, equipment FROM labs WHERE is_active = 1 ORDER BY id").fetchall()
     
-    return [
+    return json.dumps([
         {
             "id": lab[0],
             "name": lab[1],
@@ -270,17 +296,16 @@ async def get_labs():
             "equipment": lab[4]
         }
         for lab in labs
-    ]
+    ]).encode()
 
 @app.get("/api/v1/courses")
-async def get_courses():
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, code, name, description, credits FROM courses WHERE is_active = 1")
-    courses = cursor.fetchall()
-    conn.close()
+async def get_courses(request: Request):
+    return await reference_cache.response(request, "courses", None, lambda: db.run(_courses_json))
+
+def _courses_json(conn):
+    courses = conn.execute("SELECT id, code, name, description, credits FROM courses WHERE is_active = 1 ORDER BY id").fetchall()
     
-    return [
+    return json.dumps([
         {
             "id": course[0],
             "code": course[1],
@@ -289,24 +314,162 @@ async def get_courses():
             "credits": course[4]
         }
         for course in courses
-    ]
+    ]).encode()
+
+RESERVATION_PAGE_MAX = 500
+EXPORT_CHUNK_SIZE = 1000
 
 @app.get("/api/v1/reservations")
-async def get_reservations():
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute('''
+async def get_reservations(
+    response: Response,
+    lab_id: Optional[int] = None,
+    instructor_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=RESERVATION_PAGE_MAX)
+):
+    filters = _reservation_filters(lab_id, instructor_id, course_id, status, start_date, end_date)
+    after = _decode_cursor(cursor) if cursor else None
+    
+    reservations = await db.run(_reservation_page, filters, after, limit)
+    
+    if len(reservations) == limit:
+        last = reservations[-1]
+        next_cursor = _encode_cursor(last["start_time"], last["id"])
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reservations
+
+@app.get("/api/v1/reservations/export")
+async def export_reservations(
+    lab_id: Optional[int] = None,
+    instructor_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = Query("json", pattern="^(json|csv)$")
+):
+    filters = _reservation_filters(lab_id, instructor_id, course_id, status, start_date, end_date)
+    if format == "csv":
+        return StreamingResponse(
+            _csv_export(filters), media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="reservations.csv"'}
+        )
+    
+    async def stream():
+        # One keyset page in memory at a time, however many rows match
+        yield b"["
+        after, first = None, True
+        while True:
+            page = await db.run(_reservation_page, filters, after, EXPORT_CHUNK_SIZE)
+            if not page:
+                break
+            chunk = ",".join(json.dumps(res) for res in page)
+            yield (chunk if first else "," + chunk).encode()
+            first = False
+            if len(page) < EXPORT_CHUNK_SIZE:
+                break
+            after = (page[-1]["start_time"], page[-1]["id"])
+        yield b"]"
+    
+    return StreamingResponse(stream(), media_type="application/json")
+
+async def _csv_export(filters):
+    # Oldest first, one keyset page in memory at a time
+    yield exports.csv_chunk((), header=True)
+    after = None
+    while True:
+        page = await db.run(exports.export_page, filters, after, exports.CHUNK_SIZE)
+        if page:
+            yield exports.csv_chunk(page)
+        if len(page) < exports.CHUNK_SIZE:
+            break
+        after = exports.page_key(page[-1])
+
+@app.post("/api/v1/reservations/export/jobs", status_code=202, response_model=ExportJob)
+async def start_export_job(
+    lab_id: Optional[int] = None,
+    instructor_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = Query("csv", pattern="^(csv|parquet)$")
+):
+    """Write the export to disk in the background; poll the returned job for its download."""
+    filters = _reservation_filters(lab_id, instructor_id, course_id, status, start_date, end_date)
+    try:
+        job_id = exports.export_jobs.submit(format, filters)
+    except exports.ExportUnavailable as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _export_job(job_id)
+
+@app.get("/api/v1/reservations/export/jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(job_id: str):
+    return _export_job(job_id)
+
+@app.get("/api/v1/reservations/export/jobs/{job_id}/download")
+async def download_export(job_id: str):
+    job = _export_job(job_id)
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Export is {job['status']}")
+    return FileResponse(job["path"], media_type=job["media_type"], filename=job["filename"])
+
+def _export_job(job_id):
+    job = exports.export_jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job["status"] == "done":
+        job["download_url"] = f"/api/v1/reservations/export/jobs/{job_id}/download"
+    return job
+
+def _reservation_filters(lab_id, instructor_id, course_id, status, start_date, end_date):
+    clauses, params = [], []
+    for column, value in (("r.lab_id", lab_id), ("r.instructor_id", instructor_id),
+                          ("r.course_id", course_id), ("r.status", status)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if start_date is not None:
+        clauses.append("r.start_time >= ?")
+        params.append(start_date.isoformat())
+    if end_date is not None:
+        clauses.append("r.start_time < ?")
+        params.append((end_date + timedelta(days=1)).isoformat())
+    return clauses, params
+
+def _encode_cursor(start_time, reservation_id):
+    return base64.urlsafe_b64encode(json.dumps([start_time, reservation_id]).encode()).decode()
+
+def _decode_cursor(cursor):
+    try:
+        start_time, reservation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(start_time), int(reservation_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _reservation_page(conn, filters, after, limit):
+    clauses, params = list(filters[0]), list(filters[1])
+    if after is not None:
+        # Keyset condition on the (start_time, id) sort key
+        clauses.append("(r.start_time, r.id) < (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    
+    reservations = conn.execute(f'''
         SELECT r.id, r.lab_id, r.course_id, r.section, r.start_time, r.end_time, 
                r.duration, r.notes, r.status, u.full_name, l.name, c.name
         FROM reservations r
         JOIN users u ON r.instructor_id = u.id
         JOIN labs l ON r.lab_id = l.id
         JOIN courses c ON r.course_id = c.id
-        ORDER BY r.start_time DESC
-        LIMIT 10
-    ''')
-    reservations = cursor.fetchall()
-    conn.close()
+        {where}
+        ORDER BY r.start_time DESC, r.id DESC
+        LIMIT ?
+    ''', params + [limit]).fetchall()
     
     return [
         {
@@ -329,68 +492,379 @@ async def get_reservations():
 @app.post("/api/v1/reservations")
 async def create_reservation(reservation: ReservationRequest, token: str = Depends(lambda: None)):
     # In a real app, you'd validate the JWT token here
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
-    
     # For demo, use instructor1 as the instructor
     instructor_id = 2
     
-    cursor.execute('''
-        INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (instructor_id, reservation.lab_id, reservation.course_id, reservation.section, 
-          reservation.start_time, reservation.end_time, reservation.duration, reservation.notes))
+    try:
+        start, end = validate_time_range(reservation.start_time, reservation.end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    reservation_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    try:
+        reservation_id = await db.run(_insert_reservation, instructor_id, reservation, start, end)
+    except ReservationConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     return {"message": "Reservation created successfully", "reservation_id": reservation_id}
 
+def _insert_reservation(conn, instructor_id, reservation, start, end):
+    # The index lock makes check-then-insert atomic against other writers in this process;
+    # catching up with the change log under BEGIN IMMEDIATE covers the other processes
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            reservation_index.check(reservation.lab_id, start, end)
+            cursor = conn.execute('''
+                INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (instructor_id, reservation.lab_id, reservation.course_id, reservation.section, 
+                  format_timestamp(reservation.start_time), format_timestamp(reservation.end_time),
+                  reservation.duration, reservation.notes))
+        reservation_index.add(cursor.lastrowid, reservation.lab_id, start, end)
+        return cursor.lastrowid
+
+@app.post("/api/v1/reservations/import")
+async def import_reservations(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|json)$"),
+    status: str = Query("pending", pattern="^(pending|approved)$")
+):
+    """Bulk-create reservations from a CSV or JSON timetable in the request body.
+
+    The body is parsed as it arrives and written in batches; the response
+    reports the outcome of every row. Input that cannot be parsed ends the
+    import with an error row after the rows already written.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "json" if "json" in content_type else "csv"
+    # For demo, timetable rows without an instructor_id go to instructor1
+    importer = BatchImporter(default_instructor_id=2, default_status=status)
+    parser = RecordParser(format)
+    
+    batch = []
+    error = None
+    try:
+        async for chunk in request.stream():
+            batch.extend(parser.feed(chunk))
+            while len(batch) >= IMPORT_BATCH_SIZE:
+                await db.run(importer.import_batch, batch[:IMPORT_BATCH_SIZE])
+                batch = batch[IMPORT_BATCH_SIZE:]
+        batch.extend(parser.close())
+    except ValueError as e:
+        error = str(e)
+    if batch:
+        await db.run(importer.import_batch, batch)
+    if error is not None:
+        importer.reject(error)
+    
+    return importer.report.as_dict()
+
+@app.get("/api/v1/availability")
+async def get_availability(
+    start_date: date,
+    start: str,
+    end: str,
+    end_date: Optional[date] = None,
+    min_capacity: int = 0
+):
+    try:
+        start_minute, end_minute = parse_clock(start), parse_clock(end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if end_minute <= start_minute:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    
+    days = date_range(start_date, end_date or start_date)
+    if not days or len(days) > MAX_QUERY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must cover 1 to {MAX_QUERY_DAYS} days")
+    
+    labs = await db.run(_free_labs, days, start_minute, end_minute, min_capacity)
+    return {
+        "start_date": days[0].isoformat(),
+        "end_date": days[-1].isoformat(),
+        "start": start,
+        "end": end,
+        "labs": labs
+    }
+
+def _free_labs(conn, days, start_minute, end_minute, min_capacity):
+    reservation_index.ensure_loaded(conn)
+    labs = [
+        {"id": lab[0], "name": lab[1], "capacity": lab[2]}
+        for lab in conn.execute(
+            "SELECT id, name, capacity FROM labs WHERE is_active = 1 AND capacity >= ? ORDER BY capacity, name",
+            (min_capacity,)
+        )
+    ]
+    free = availability_map.free_labs(labs, days, start_minute, end_minute)
+    for lab in free:
+        lab["free_slots"] = availability_map.free_slots(lab["id"], days[0]) if len(days) == 1 else None
+    return free
+
 @app.get("/api/v1/dashboard/stats")
 async def get_dashboard_stats():
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
+    return await db.run(counters.read)
+
+@app.put("/api/v1/reservations/{reservation_id}")
+async def update_reservation_status(reservation_id: int, status: str, background_tasks: BackgroundTasks):
+    try:
+        new_status = parse_status(status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        instructor_id = await db.run(_update_reservation_status, reservation_id, new_status)
+    except (ReservationConflict, InvalidTransition) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if instructor_id is None:
+        raise HTTPException(status_code=404, detail="Reservation not found")
     
-    cursor.execute("SELECT COUNT(*) FROM labs WHERE is_active = 1")
-    total_labs = cursor.fetchone()[0]
+    background_tasks.add_task(notify, [(instructor_id, reservation_status_notification(reservation_id, new_status.value))])
     
-    cursor.execute("SELECT COUNT(*) FROM reservations")
-    total_sessions = cursor.fetchone()[0]
+    return {"message": f"Reservation {reservation_id} status updated to {new_status.value}"}
+
+def _update_reservation_status(conn, reservation_id, status):
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            row = conn.execute(
+                "SELECT lab_id, start_time, end_time, instructor_id, status FROM reservations WHERE id = ?",
+                (reservation_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            check_transition(row[4], status)
+            lab_id, start, end = row[0], to_timestamp(row[1]), to_timestamp(row[2])
+            if status.value in ACTIVE_STATUSES:
+                reservation_index.check(lab_id, start, end, ignore_id=reservation_id)
+            conn.execute('''
+                UPDATE reservations SET status = ? WHERE id = ?
+            ''', (status.value, reservation_id))
+        reservation_index.apply_status(reservation_id, lab_id, start, end, status.value)
+        return row[3]
+
+BATCH_STATUS_MAX = 2000
+
+@app.post("/api/v1/reservations/status")
+async def update_reservation_statuses(request: BatchStatusRequest, background_tasks: BackgroundTasks):
+    """Approve or decline many reservations at once.
+
+    Reservations are selected by ``ids`` and/or the lab, date and current
+    status filters. Rows whose transition is not allowed, or that would
+    conflict once approved, are skipped and reported; the rest are updated
+    in a single transaction.
+    """
+    try:
+        new_status = parse_status(request.status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not request.ids and request.lab_id is None and request.start_date is None and request.end_date is None:
+        raise HTTPException(status_code=400, detail="Select reservations by ids or by lab and date filters")
+    if request.ids and len(request.ids) > BATCH_STATUS_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_STATUS_MAX} reservations per batch")
     
-    cursor.execute("SELECT COUNT(*) FROM reservations WHERE status = 'pending'")
-    pending_requests = cursor.fetchone()[0]
+    clauses, params = _reservation_filters(request.lab_id, None, None, request.current_status,
+                                           request.start_date, request.end_date)
+    if request.ids:
+        clauses.append(f"r.id IN ({', '.join('?' for _ in request.ids)})")
+        params.extend(request.ids)
     
-    cursor.execute("SELECT COUNT(*) FROM users WHERE is_active = 1")
-    total_users = cursor.fetchone()[0]
+    try:
+        result, changed = await db.run(_update_reservation_statuses, clauses, params, request.ids, new_status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    conn.close()
+    # Notifications go out after the response has been sent
+    background_tasks.add_task(_publish_status_notifications, changed, new_status.value)
+    return result
+
+def _update_reservation_statuses(conn, clauses, params, ids, status):
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            rows = conn.execute(f'''
+                SELECT r.id, r.lab_id, r.start_time, r.end_time, r.status, r.instructor_id
+                FROM reservations r
+                WHERE {' AND '.join(clauses)}
+                ORDER BY r.start_time, r.id
+                LIMIT ?
+            ''', params + [BATCH_STATUS_MAX + 1]).fetchall()
+            if len(rows) > BATCH_STATUS_MAX:
+                raise ValueError(f"More than {BATCH_STATUS_MAX} reservations match; narrow the filters")
+            
+            # One pass over the selection: transition rules, then conflicts for rows being activated
+            changes, skipped = [], []
+            for reservation_id, lab_id, start_time, end_time, current, instructor_id in rows:
+                try:
+                    check_transition(current, status)
+                    start, end = to_timestamp(start_time), to_timestamp(end_time)
+                    if status.value in ACTIVE_STATUSES:
+                        reservation_index.check(lab_id, start, end, ignore_id=reservation_id)
+                except (InvalidTransition, ReservationConflict, ValueError) as e:
+                    skipped.append({"id": reservation_id, "reason": str(e)})
+                    continue
+                changes.append((reservation_id, lab_id, start, end, instructor_id))
+            
+            conn.executemany(
+                "UPDATE reservations SET status = ? WHERE id = ?",
+                [(status.value, change[0]) for change in changes]
+            )
+        for reservation_id, lab_id, start, end, _ in changes:
+            reservation_index.apply_status(reservation_id, lab_id, start, end, status.value)
     
-    return {
-        "total_labs": total_labs,
-        "total_sessions": total_sessions,
-        "pending_requests": pending_requests,
-        "total_users": total_users
+    found = {row[0] for row in rows}
+    skipped.extend({"id": i, "reason": "Reservation not found or excluded by the filters"} for i in ids or () if i not in found)
+    result = {
+        "status": status.value,
+        "updated": [change[0] for change in changes],
+        "skipped": skipped,
     }
+    return result, [(change[4], change[0]) for change in changes]
 
-@app.put("/api/v1/reservations/{reservation_id}")
-async def update_reservation_status(reservation_id: int, status: str):
-    conn = sqlite3.connect('lab_scheduler.db')
-    cursor = conn.cursor()
+def _publish_status_notifications(changed, status):
+    notify((instructor_id, reservation_status_notification(reservation_id, status))
+           for instructor_id, reservation_id in changed)
+
+@app.post("/api/v1/reservation-series")
+async def create_reservation_series(request: ReservationSeriesRequest):
+    # For demo, use instructor1 as the instructor
+    instructor_id = 2
     
-    cursor.execute('''
-        UPDATE reservations SET status = ? WHERE id = ?
-    ''', (status, reservation_id))
+    try:
+        start, end = validate_time_range(request.start_time, request.end_time)
+        rule = parse_rrule(request.rrule, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    conn.commit()
-    conn.close()
+    try:
+        series_id = await db.run(_insert_reservation_series, instructor_id, request, rule)
+    except ReservationConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
-    return {"message": f"Reservation {reservation_id} status updated to {status}"}
+    return {"message": "Reservation series created successfully", "series_id": series_id}
 
-# Web Interface with Full Features
-@app.get("/app")
-async def web_interface():
-    html_content = """
+def _insert_reservation_series(conn, instructor_id, request, rule):
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            reservation_index.check_series(request.lab_id, rule)
+            series_id = series.create_series(
+                conn, instructor_id, request.lab_id, request.course_id, request.section,
+                request.start_time, request.end_time, request.rrule, rule,
+                request.duration, request.notes
+            )
+        reservation_index.add_series(series_id, request.lab_id, rule)
+        return series_id
+
+@app.get("/api/v1/reservation-series/{series_id}/occurrences")
+async def get_series_occurrences(series_id: int, start_date: Optional[date] = None,
+                                 end_date: Optional[date] = None):
+    row = await db.run(series.get_series, series_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Reservation series not found")
+    
+    window_start = day_number(start_date) * DAY_SECONDS if start_date else row.rule.start
+    window_end = (day_number(end_date) + 1) * DAY_SECONDS if end_date else row.rule.until
+    return [
+        {
+            "start_time": format_timestamp(from_timestamp(start)),
+            "end_time": format_timestamp(from_timestamp(end)),
+        }
+        for _, start, end in series.expand([row], window_start, window_end)
+    ]
+
+@app.post("/api/v1/reservation-series/{series_id}/exceptions")
+async def skip_series_occurrence(series_id: int, occurrence_date: date):
+    found = await db.run(_skip_series_occurrence, series_id, occurrence_date)
+    if not found:
+        raise HTTPException(status_code=404, detail="No occurrence of this series on that date")
+    return {"message": f"Occurrence on {occurrence_date.isoformat()} removed from series {series_id}"}
+
+def _skip_series_occurrence(conn, series_id, occurrence_date):
+    with reservation_index.lock:
+        reservation_index.ensure_loaded(conn)
+        row = series.get_series(conn, series_id)
+        day_start = day_number(occurrence_date) * DAY_SECONDS
+        occurrences = series.expand([row], day_start, day_start + DAY_SECONDS) if row else []
+        if not occurrences:
+            return False
+        with transaction(conn):
+            series.add_exception(conn, series_id, occurrence_date)
+        _, start, end = occurrences[0]
+        reservation_index.skip_occurrence(series_id, start, end)
+        return True
+
+@app.put("/api/v1/reservation-series/{series_id}")
+async def update_series_status(series_id: int, status: str, background_tasks: BackgroundTasks):
+    try:
+        new_status = parse_status(status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        instructor_id = await db.run(_update_series_status, series_id, new_status)
+    except (ReservationConflict, InvalidTransition) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if instructor_id is None:
+        raise HTTPException(status_code=404, detail="Reservation series not found")
+    
+    background_tasks.add_task(notify, [(instructor_id, {
+        "title": f"Recurring reservation {new_status.value}",
+        "message": f"Your recurring reservation series #{series_id} has been {new_status.value}.",
+        "notification_type": f"reservation_{new_status.value}",
+    })])
+    return {"message": f"Reservation series {series_id} status updated to {new_status.value}"}
+
+def _update_series_status(conn, series_id, status):
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            row = series.get_series(conn, series_id)
+            if row is None:
+                return None
+            check_transition(row.status, status)
+            if status.value in ACTIVE_STATUSES:
+                reservation_index.check_series(row.lab_id, row.rule, ignore_series_id=series_id)
+            conn.execute("UPDATE reservation_series SET status = ? WHERE id = ?", (status.value, series_id))
+        if status.value in ACTIVE_STATUSES:
+            reservation_index.add_series(series_id, row.lab_id, row.rule)
+        else:
+            reservation_index.discard_series(series_id)
+        return row.instructor_id
+
+NOTIFICATION_KEEPALIVE_SECONDS = 15
+
+@app.get("/api/v1/notifications/stream")
+async def notification_stream(request: Request, token: str):
+    # EventSource cannot send headers, so the bearer token comes as a query parameter
+    payload = verify_token(token)
+    if not payload or payload.get("user_id") is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    user_id = payload["user_id"]
+    
+    async def events():
+        queue = broker.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=NOTIFICATION_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Web Interface with Full Features, served from the startup-built asset cache
+WEB_INTERFACE_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -760,6 +1234,7 @@ async def web_interface():
             </div>
         </div>
 
+        <script src="/static/js/notifications.js"></script>
         <script>
             // Tab management
             function showTab(tabName) {
@@ -991,6 +1466,7 @@ async def web_interface():
                     showNotification(`Login successful! Welcome ${result.user.full_name} (${result.user.role})`, 'success');
                     localStorage.setItem('auth_token', result.access_token);
                     localStorage.setItem('user_data', JSON.stringify(result.user));
+                    startNotifications(result.user);
                     
                 } catch (error) {
                     showNotification('Login failed: ' + (error.detail || error.message), 'error');
@@ -1024,6 +1500,22 @@ async def web_interface():
                 document.getElementById('reservation-date').valueAsDate = tomorrow;
             }
 
+            // Live notifications for the signed-in user (static/js/notifications.js)
+            function startNotifications(user) {
+                const token = localStorage.getItem('auth_token');
+                if (!token || !user) return;
+                if (window.notificationsManager) window.notificationsManager.disconnect();
+                window.notificationsManager = new NotificationsManager({
+                    apiBaseUrl: '/api/v1',
+                    token: token,
+                    currentUser: user,
+                    apiCall: (endpoint, options = {}) => apiCall('/api/v1' + endpoint, {
+                        ...options,
+                        headers: {'Content-Type': 'application/json', 'Authorization': `Bearer ${token}`}
+                    })
+                });
+            }
+
             // Initialize the application
             async function initApp() {
                 await loadDashboard();
@@ -1031,6 +1523,7 @@ async def web_interface():
                 await loadCourses();
                 await loadReservations();
                 setDefaultDate();
+                startNotifications(JSON.parse(localStorage.getItem('user_data') || 'null'));
             }
 
             // Start the application
@@ -1039,7 +1532,17 @@ async def web_interface():
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+
+@app.get("/app")
+async def web_interface(request: Request):
+    return asset_cache.response(request, "/app")
+
+@app.get("/static/{path:path}")
+async def static_asset(path: str, request: Request):
+    response = asset_cache.response(request, f"/static/{path}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return response
 
 if __name__ == "__main__":
     import uvicorn
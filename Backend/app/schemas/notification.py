@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class Notification(BaseModel):
+    id: int
+    title: str
+    message: str
+    notification_type: str
+    is_read: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class UnreadCount(BaseModel):
+    unread: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 class ReportBase(BaseModel):
@@ -31,4 +31,12 @@ class InstructorUsage(BaseModel):
 
 class InstructorReport(BaseModel):
     period: str
-    data: List[InstructorUsage]
\ No newline at end of file
+    data: List[InstructorUsage]
+
+class ExportJob(BaseModel):
+    job_id: str
+    status: str
+    format: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,72 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+from ..database.models import ReservationStatus
+from .lab import Lab
+
+class CourseBase(BaseModel):
+    code: str
+    name: str
+    description: Optional[str] = None
+    credits: int = 3
+
+class CourseCreate(CourseBase):
+    pass
+
+class Course(CourseBase):
+    id: int
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+class ReservationListItem(BaseModel):
+    id: int
+    lab_id: int
+    course_id: int
+    instructor_id: int
+    section: str
+    start_time: str
+    end_time: str
+    duration: int
+    notes: Optional[str] = None
+    status: Optional[str] = None
+    instructor_name: str
+    lab_name: str
+    course_name: str
+
+    class Config:
+        from_attributes = True
+
+class ReservationInstructor(BaseModel):
+    id: int
+    full_name: str
+    email: str
+
+    class Config:
+        from_attributes = True
+
+class ReservationCourse(BaseModel):
+    id: int
+    code: str
+    name: str
+
+    class Config:
+        from_attributes = True
+
+class ReservationDetail(BaseModel):
+    id: int
+    section: str
+    start_time: datetime
+    end_time: datetime
+    duration: int
+    notes: Optional[str] = None
+    status: Optional[ReservationStatus] = None
+    created_at: Optional[datetime] = None
+    instructor: ReservationInstructor
+    lab: Lab
+    course: ReservationCourse
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,114 @@
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .conflicts import ReservationIndex, reservation_index
+from .validators import to_timestamp
+
+SLOT_MINUTES = 15
+SLOT_SECONDS = SLOT_MINUTES * 60
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_SECONDS = 24 * 60 * 60
+MAX_QUERY_DAYS = 92
+
+
+def parse_clock(value: str) -> int:
+    """Minutes after midnight for an 'HH:MM' string; '24:00' is accepted as end of day."""
+    if value.strip() == "24:00":
+        return 24 * 60
+    try:
+        parsed = time.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"Invalid time of day: {value!r}")
+    return parsed.hour * 60 + parsed.minute
+
+
+def window_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmap with every slot touched by [start_minute, end_minute) set."""
+    first = start_minute // SLOT_MINUTES
+    last = -(-end_minute // SLOT_MINUTES)
+    return ((1 << (last - first)) - 1) << first
+
+
+class AvailabilityMap:
+    """Per-lab, per-day occupancy bitmaps with one bit per 15-minute slot.
+
+    Day bitmaps are Python ints built on demand from the reservation index
+    and dropped whenever the index reports a change touching that day, so a
+    free-slot query is an OR over day bitmaps and one AND with the window.
+    """
+
+    def __init__(self, index: ReservationIndex):
+        self._index = index
+        self._lock = threading.Lock()
+        self._days: Dict[Tuple[int, int], int] = {}
+        index.subscribe(self.invalidate)
+
+    def invalidate(self, lab_id: Optional[int], start: int, end: int):
+        with self._lock:
+            if lab_id is None:
+                self._days.clear()
+                return
+            first_day = start // DAY_SECONDS
+            last_day = (end - 1) // DAY_SECONDS
+            for day in range(first_day, last_day + 1):
+                self._days.pop((lab_id, day), None)
+
+    def day_mask(self, lab_id: int, day: date) -> int:
+        day_start = to_timestamp(datetime.combine(day, time()))
+        key = (lab_id, day_start // DAY_SECONDS)
+        mask = self._days.get(key)
+        if mask is not None:
+            return mask
+
+        # Holding the index lock keeps a concurrent invalidation from being lost
+        with self._index.lock:
+            mask = 0
+            for _, start, end in self._index.intervals(lab_id, day_start, day_start + DAY_SECONDS):
+                first = max(start - day_start, 0) // SLOT_SECONDS
+                last = -(-min(end - day_start, DAY_SECONDS) // SLOT_SECONDS)
+                mask |= ((1 << (last - first)) - 1) << first
+            with self._lock:
+                self._days[key] = mask
+        return mask
+
+    def busy_mask(self, lab_id: int, days: Iterable[date]) -> int:
+        mask = 0
+        for day in days:
+            mask |= self.day_mask(lab_id, day)
+        return mask
+
+    def free_labs(self, labs: List[dict], days: List[date],
+                  start_minute: int, end_minute: int) -> List[dict]:
+        """The subset of ``labs`` with no booking inside the window on any of ``days``."""
+        window = window_mask(start_minute, end_minute)
+        return [
+            lab for lab in labs
+            if not self.busy_mask(lab["id"], days) & window
+        ]
+
+    def free_slots(self, lab_id: int, day: date) -> List[Tuple[str, str]]:
+        """Contiguous free periods of a lab on one day as ('HH:MM', 'HH:MM') pairs."""
+        mask = self.day_mask(lab_id, day)
+        periods = []
+        slot = 0
+        while slot < SLOTS_PER_DAY:
+            if mask >> slot & 1:
+                slot += 1
+                continue
+            begin = slot
+            while slot < SLOTS_PER_DAY and not mask >> slot & 1:
+                slot += 1
+            periods.append((_clock(begin * SLOT_MINUTES), _clock(slot * SLOT_MINUTES)))
+        return periods
+
+
+def date_range(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+availability_map = AvailabilityMap(reservation_index)
@@ -0,0 +1,291 @@
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..database.changes import change_feed
+from ..database.series import get_series, load_series
+from .recurrence import DAY_SECONDS, WeeklyRule
+from .validators import to_timestamp
+
+# Bookings in these states hold their time slot
+ACTIVE_STATUSES = ("pending", "approved")
+REFRESH_BATCH_SIZE = 500
+
+
+class ReservationConflict(Exception):
+    def __init__(self, lab_id: int, conflicting_ids: List[int], series_ids: List[int] = ()):
+        self.lab_id = lab_id
+        self.conflicting_ids = conflicting_ids
+        self.series_ids = list(series_ids)
+        booked_by = []
+        if conflicting_ids:
+            booked_by.append("reservation(s) " + ", ".join(str(i) for i in conflicting_ids))
+        if self.series_ids:
+            booked_by.append("recurring series " + ", ".join(str(i) for i in self.series_ids))
+        super().__init__(f"Lab {lab_id} is already booked by {' and '.join(booked_by)}")
+
+
+class LabIntervals:
+    """Active bookings of one lab as parallel arrays sorted by (start, id).
+
+    ``max_span`` bounds how far back an overlapping booking can start, so an
+    overlap query is two bisections plus a scan of the few candidates in
+    ``(start - max_span, end)``. Removing the longest booking leaves the bound
+    unknown until the next query recomputes it.
+    """
+
+    __slots__ = ("keys", "ends", "_max_span")
+
+    def __init__(self):
+        self.keys: List[Tuple[int, int]] = []
+        self.ends: List[int] = []
+        self._max_span: Optional[int] = 0
+
+    @property
+    def max_span(self) -> int:
+        if self._max_span is None:
+            self._max_span = max(
+                (end - start for (start, _), end in zip(self.keys, self.ends)), default=0
+            )
+        return self._max_span
+
+    def add(self, reservation_id: int, start: int, end: int):
+        key = (start, reservation_id)
+        pos = bisect_left(self.keys, key)
+        self.keys.insert(pos, key)
+        self.ends.insert(pos, end)
+        if self._max_span is not None:
+            self._max_span = max(self._max_span, end - start)
+
+    def remove(self, reservation_id: int, start: int):
+        key = (start, reservation_id)
+        pos = bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            if self.ends[pos] - start == self._max_span:
+                self._max_span = None
+            del self.keys[pos]
+            del self.ends[pos]
+
+    def overlapping(self, start: int, end: int) -> List[int]:
+        lo = bisect_right(self.keys, (start - self.max_span, float("inf")))
+        hi = bisect_left(self.keys, (end, -1))
+        return [
+            self.keys[i][1]
+            for i in range(lo, hi)
+            if self.ends[i] > start
+        ]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class ReservationIndex:
+    """In-memory per-lab interval index over active rows of `reservations`.
+
+    Active recurring series are held as rules and expanded only over the
+    window being checked. The index is loaded once from the database and
+    then kept current by the write paths, which must hold ``lock`` across
+    their check-and-write, and by the change log for writes made by other
+    processes.
+    """
+
+    def __init__(self, lock: Optional[threading.RLock] = None):
+        self.lock = lock or threading.RLock()
+        self.loaded = False
+        self._labs: Dict[int, LabIntervals] = {}
+        self._by_id: Dict[int, Tuple[int, int, int]] = {}
+        self._series: Dict[int, Dict[int, WeeklyRule]] = {}
+        self._series_labs: Dict[int, int] = {}
+        self._listeners: List[Callable[[Optional[int], int, int], None]] = []
+
+    def subscribe(self, listener: Callable[[Optional[int], int, int], None]):
+        """Call ``listener(lab_id, start, end)`` whenever a booking enters or leaves the index.
+
+        A ``lab_id`` of None means the whole index was reloaded or reset.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, lab_id: Optional[int], start: int = 0, end: int = 0):
+        for listener in self._listeners:
+            listener(lab_id, start, end)
+
+    def load(self, conn):
+        with self.lock:
+            self._labs = {}
+            self._by_id = {}
+            self._series = {}
+            self._series_labs = {}
+            placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+            rows = conn.execute(
+                f"SELECT id, lab_id, start_time, end_time FROM reservations "
+                f"WHERE status IN ({placeholders})",
+                ACTIVE_STATUSES,
+            )
+            for reservation_id, lab_id, start_time, end_time in rows:
+                try:
+                    start, end = to_timestamp(start_time), to_timestamp(end_time)
+                except ValueError:
+                    continue
+                self._add(reservation_id, lab_id, start, end)
+            for row in load_series(conn, ACTIVE_STATUSES):
+                self._series.setdefault(row.lab_id, {})[row.id] = row.rule
+                self._series_labs[row.id] = row.lab_id
+            self.loaded = True
+            self._notify(None)
+
+    def ensure_loaded(self, conn):
+        """Load the index on first use and catch up with the change log.
+
+        Called inside a write transaction, the checks that follow see every
+        booking committed by any process.
+        """
+        with self.lock:
+            change_feed.poll(conn)
+            if not self.loaded:
+                self.load(conn)
+
+    def refresh_reservations(self, conn, ids: Optional[Set[int]]):
+        """Re-read the given reservations; None drops the index for a full reload."""
+        with self.lock:
+            if ids is None:
+                self.reset()
+                return
+            if not self.loaded:
+                return
+            ids = list(ids)
+            for offset in range(0, len(ids), REFRESH_BATCH_SIZE):
+                batch = ids[offset:offset + REFRESH_BATCH_SIZE]
+                rows = conn.execute(
+                    f"SELECT id, lab_id, start_time, end_time, status FROM reservations "
+                    f"WHERE id IN ({', '.join('?' for _ in batch)})",
+                    batch,
+                ).fetchall()
+                for reservation_id in set(batch) - {row[0] for row in rows}:
+                    self.discard(reservation_id)
+                for reservation_id, lab_id, start_time, end_time, status in rows:
+                    try:
+                        start, end = to_timestamp(start_time), to_timestamp(end_time)
+                    except ValueError:
+                        self.discard(reservation_id)
+                        continue
+                    self.apply_status(reservation_id, lab_id, start, end, status)
+
+    def refresh_series(self, conn, ids: Optional[Set[int]]):
+        with self.lock:
+            if ids is None:
+                self.reset()
+                return
+            if not self.loaded:
+                return
+            for series_id in ids:
+                row = get_series(conn, series_id)
+                if row is not None and row.status in ACTIVE_STATUSES:
+                    self.add_series(series_id, row.lab_id, row.rule)
+                else:
+                    self.discard_series(series_id)
+
+    def reset(self):
+        with self.lock:
+            self.loaded = False
+            self._labs = {}
+            self._by_id = {}
+            self._series = {}
+            self._series_labs = {}
+            self._notify(None)
+
+    def add(self, reservation_id: int, lab_id: int, start: int, end: int):
+        with self.lock:
+            self.discard(reservation_id)
+            self._add(reservation_id, lab_id, start, end)
+            self._notify(lab_id, start, end)
+
+    def _add(self, reservation_id: int, lab_id: int, start: int, end: int):
+        self._labs.setdefault(lab_id, LabIntervals()).add(reservation_id, start, end)
+        self._by_id[reservation_id] = (lab_id, start, end)
+
+    def discard(self, reservation_id: int):
+        with self.lock:
+            entry = self._by_id.pop(reservation_id, None)
+            if entry is not None:
+                lab_id, start, end = entry
+                self._labs[lab_id].remove(reservation_id, start)
+                self._notify(lab_id, start, end)
+
+    def apply_status(self, reservation_id: int, lab_id: int, start: int, end: int, status: str):
+        if status in ACTIVE_STATUSES:
+            self.add(reservation_id, lab_id, start, end)
+        else:
+            self.discard(reservation_id)
+
+    def add_series(self, series_id: int, lab_id: int, rule: WeeklyRule):
+        with self.lock:
+            self.discard_series(series_id)
+            self._series.setdefault(lab_id, {})[series_id] = rule
+            self._series_labs[series_id] = lab_id
+            self._notify(lab_id, rule.start, rule.until + rule.duration)
+
+    def discard_series(self, series_id: int):
+        with self.lock:
+            lab_id = self._series_labs.pop(series_id, None)
+            if lab_id is not None:
+                rule = self._series[lab_id].pop(series_id)
+                self._notify(lab_id, rule.start, rule.until + rule.duration)
+
+    def skip_occurrence(self, series_id: int, start: int, end: int):
+        """Record an exception of an indexed series, freeing one occurrence."""
+        with self.lock:
+            lab_id = self._series_labs.get(series_id)
+            if lab_id is not None:
+                self._series[lab_id][series_id].exceptions.add(start // DAY_SECONDS)
+                self._notify(lab_id, start, end)
+
+    def find_conflicts(self, lab_id: int, start: int, end: int,
+                       ignore_id: Optional[int] = None) -> List[int]:
+        with self.lock:
+            intervals = self._labs.get(lab_id)
+            if intervals is None:
+                return []
+            return [i for i in intervals.overlapping(start, end) if i != ignore_id]
+
+    def find_series_conflicts(self, lab_id: int, start: int, end: int,
+                              ignore_series_id: Optional[int] = None) -> List[int]:
+        with self.lock:
+            return [
+                series_id for series_id, rule in self._series.get(lab_id, {}).items()
+                if series_id != ignore_series_id and rule.overlaps(start, end)
+            ]
+
+    def check(self, lab_id: int, start: int, end: int, ignore_id: Optional[int] = None,
+              ignore_series_id: Optional[int] = None):
+        with self.lock:
+            conflicts = self.find_conflicts(lab_id, start, end, ignore_id)
+            series = self.find_series_conflicts(lab_id, start, end, ignore_series_id)
+        if conflicts or series:
+            raise ReservationConflict(lab_id, conflicts, series)
+
+    def check_series(self, lab_id: int, rule: WeeklyRule, ignore_series_id: Optional[int] = None):
+        """Check every occurrence of ``rule`` against the bookings of ``lab_id``."""
+        conflicts, series = set(), set()
+        with self.lock:
+            for start, end in rule.occurrences(rule.start, rule.until):
+                conflicts.update(self.find_conflicts(lab_id, start, end))
+                series.update(self.find_series_conflicts(lab_id, start, end, ignore_series_id))
+        if conflicts or series:
+            raise ReservationConflict(lab_id, sorted(conflicts), sorted(series))
+
+    def intervals(self, lab_id: int, start: int, end: int) -> List[Tuple[int, int, int]]:
+        """(id, start, end) of active bookings in ``lab_id`` overlapping [start, end).
+
+        Occurrences of recurring series are included with the negated series id.
+        """
+        with self.lock:
+            found = [(i,) + self._by_id[i][1:] for i in self.find_conflicts(lab_id, start, end)]
+            for series_id, rule in self._series.get(lab_id, {}).items():
+                found.extend((-series_id,) + occurrence for occurrence in rule.occurrences(start, end))
+            return found
+
+
+# Sharing the change feed's lock makes catching up and checking one critical section
+reservation_index = ReservationIndex(change_feed.lock)
+change_feed.subscribe("reservation", reservation_index.refresh_reservations)
+change_feed.subscribe("series", reservation_index.refresh_series)
@@ -0,0 +1,223 @@
+"""Reservation exports in CSV and Parquet, however many rows match.
+
+Streamed CSV is built one keyset page at a time. Background jobs read a
+single snapshot with fetchmany and write the file to EXPORT_DIR, one CSV
+chunk or Parquet row group per batch. Either way, memory use is one batch
+of rows.
+
+A job's state lives only in its files, so any worker process can answer
+for it: ``<id>.<ext>.part`` while running, ``<id>.<ext>`` when done, and
+``<id>.error`` if it failed. Files are removed after EXPORT_RETENTION_SECONDS.
+"""
+import csv
+import io
+import os
+import re
+import secrets
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Sequence
+
+from ..config import settings
+from .validators import parse_datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; CSV is always available
+    pa = pq = None
+
+CHUNK_SIZE = 5000
+JOB_WORKERS = 2
+BUSY_TIMEOUT_MS = 5000
+
+COLUMNS = (
+    "id", "lab_id", "lab_name", "course_id", "course_code", "course_name",
+    "instructor_id", "instructor_name", "section", "start_time", "end_time",
+    "duration", "status", "notes", "created_at",
+)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_SELECT = '''
+    SELECT r.id, r.lab_id, l.name, r.course_id, c.code, c.name,
+           r.instructor_id, u.full_name, r.section, r.start_time, r.end_time,
+           r.duration, r.status, r.notes, r.created_at
+    FROM reservations r
+    JOIN labs l ON r.lab_id = l.id
+    JOIN courses c ON r.course_id = c.id
+    JOIN users u ON r.instructor_id = u.id
+'''
+_JOB_ID = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+class ExportUnavailable(Exception):
+    """The requested format needs an optional dependency that is not installed."""
+
+
+def check_format(fmt: str):
+    if fmt == "parquet" and pq is None:
+        raise ExportUnavailable("Parquet export needs pyarrow installed")
+
+
+def export_page(conn, filters, after: Optional[Sequence], limit: int) -> list:
+    """Up to ``limit`` rows after the (start_time, id) key ``after``, oldest first."""
+    clauses, params = list(filters[0]), list(filters[1])
+    if after is not None:
+        clauses.append("(r.start_time, r.id) > (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"{_SELECT} {where} ORDER BY r.start_time, r.id LIMIT ?", params + [limit]).fetchall()
+
+
+def page_key(row) -> tuple:
+    return row[9], row[0]
+
+
+def csv_chunk(rows: Iterable[Sequence], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _arrow_schema():
+    text, integer, stamp = pa.string(), pa.int64(), pa.timestamp("s")
+    types = {"start_time": stamp, "end_time": stamp, "created_at": stamp,
+             "section": text, "status": text, "notes": text,
+             "lab_name": text, "course_code": text, "course_name": text, "instructor_name": text}
+    return pa.schema([(name, types.get(name, integer)) for name in COLUMNS])
+
+
+def _timestamp(value):
+    try:
+        return parse_datetime(value) if value else None
+    except ValueError:
+        return None
+
+
+def _record_batch(rows: list, schema):
+    columns = list(zip(*rows))
+    for name in ("start_time", "end_time", "created_at"):
+        index = COLUMNS.index(name)
+        columns[index] = [_timestamp(value) for value in columns[index]]
+    return pa.record_batch([pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                           schema=schema)
+
+
+def write_export(path: str, fmt: str, filters, size: int = CHUNK_SIZE) -> int:
+    """Write every matching reservation to ``path``; returns the row count.
+
+    Reads through one transaction, so the file is a consistent snapshot
+    even while reservations keep changing.
+    """
+    from ..database.pool import DATABASE_PATH, TimedConnection
+
+    clauses, params = filters
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = sqlite3.connect(DATABASE_PATH, isolation_level=None, factory=TimedConnection)
+    try:
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("BEGIN")
+        cursor = conn.execute(f"{_SELECT} {where} ORDER BY r.start_time, r.id", params)
+        count = 0
+        if fmt == "csv":
+            with open(path, "wb") as handle:
+                handle.write(csv_chunk((), header=True))
+                while rows := cursor.fetchmany(size):
+                    handle.write(csv_chunk(rows))
+                    count += len(rows)
+        else:
+            schema = _arrow_schema()
+            with pq.ParquetWriter(path, schema) as writer:
+                while rows := cursor.fetchmany(size):
+                    writer.write_batch(_record_batch(rows, schema))
+                    count += len(rows)
+        return count
+    finally:
+        conn.close()
+
+
+class ExportJobs:
+    """Background exports written to ``directory``, addressed by an
+    unguessable id that serves as the download handle."""
+
+    def __init__(self, directory: str, retention_seconds: int, workers: int = JOB_WORKERS):
+        self.directory = directory
+        self.retention_seconds = retention_seconds
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.{suffix}")
+
+    def submit(self, fmt: str, filters) -> str:
+        check_format(fmt)
+        os.makedirs(self.directory, exist_ok=True)
+        self.expire()
+        job_id = secrets.token_urlsafe(18)
+        extension = FORMATS[fmt][1]
+        # Created here so the job shows as running before a thread picks it up
+        open(self._path(job_id, f"{extension}.part"), "wb").close()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export")
+        self._executor.submit(self._run, job_id, fmt, filters)
+        return job_id
+
+    def _run(self, job_id: str, fmt: str, filters):
+        extension = FORMATS[fmt][1]
+        partial = self._path(job_id, f"{extension}.part")
+        try:
+            write_export(partial, fmt, filters)
+            os.replace(partial, self._path(job_id, extension))
+        except Exception as e:
+            with open(self._path(job_id, "error"), "w") as handle:
+                handle.write(str(e) or type(e).__name__)
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """The job's state, or None if the id is unknown or expired."""
+        if not _JOB_ID.match(job_id):
+            return None
+        for fmt, (media_type, extension) in FORMATS.items():
+            done = self._path(job_id, extension)
+            if os.path.exists(done):
+                return {"job_id": job_id, "format": fmt, "status": "done",
+                        "size": os.path.getsize(done), "path": done, "media_type": media_type,
+                        "filename": f"reservations-{job_id[:8]}.{extension}"}
+            if os.path.exists(self._path(job_id, f"{extension}.part")):
+                return {"job_id": job_id, "format": fmt, "status": "running"}
+        error = self._path(job_id, "error")
+        if os.path.exists(error):
+            with open(error) as handle:
+                return {"job_id": job_id, "status": "failed", "error": handle.read()}
+        return None
+
+    def expire(self):
+        cutoff = time.time() - self.retention_seconds
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+export_jobs = ExportJobs(settings.EXPORT_DIR, settings.EXPORT_RETENTION_SECONDS)
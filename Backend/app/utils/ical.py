@@ -0,0 +1,228 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import AsyncIterator, Callable, Hashable, List, Optional, Tuple
+
+from .recurrence import WEEKDAY_CODES, day_number, parse_rrule
+from .validators import from_timestamp, parse_datetime, to_timestamp
+
+PRODID = "-//IT Lab Scheduler//Calendar Feed//EN"
+MEDIA_TYPE = "text/calendar"
+FEED_PAGE_SIZE = 500
+CACHE_SIZE = 256
+# Larger feeds are streamed every time rather than held in memory
+MAX_CACHED_BYTES = 4 * 1024 * 1024
+FEED_STATUSES = {"approved": "CONFIRMED", "pending": "TENTATIVE"}
+LINE_OCTETS = 75
+
+# scope -> (table holding the owner, its display column, reservations column)
+SCOPES = {
+    "lab": ("labs", "name", "lab_id"),
+    "instructor": ("users", "full_name", "instructor_id"),
+}
+
+_EVENT_COLUMNS = '''
+    r.id, r.start_time, r.end_time, r.status, r.section, r.notes, r.created_at,
+    l.name, c.code, c.name, u.full_name
+'''
+_JOINS = '''
+    JOIN labs l ON r.lab_id = l.id
+    JOIN courses c ON r.course_id = c.id
+    JOIN users u ON r.instructor_id = u.id
+'''
+
+
+def escape_text(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line: str) -> bytes:
+    """One content line, folded at 75 octets without splitting a UTF-8 character."""
+    data = line.encode()
+    if len(data) <= LINE_OCTETS:
+        return data + b"\r\n"
+    parts, start, limit = [], 0, LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Back off continuation bytes (0b10xxxxxx) so the cut lands between characters
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start, limit = end, LINE_OCTETS - 1
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _local(value) -> str:
+    # Floating time: the timestamps are stored as the lab's local wall clock
+    return parse_datetime(value).strftime("%Y%m%dT%H%M%S")
+
+
+def _utc(value) -> str:
+    # created_at comes from CURRENT_TIMESTAMP, which is UTC
+    try:
+        return parse_datetime(value).strftime("%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return "19700101T000000Z"
+
+
+def calendar_header(name: str) -> bytes:
+    return b"".join(fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ))
+
+
+CALENDAR_FOOTER = fold("END:VCALENDAR")
+
+
+def _event(uid: str, row, extra: List[str]) -> bytes:
+    _, start_time, end_time, status, section, notes, created_at, lab, course_code, course_name, instructor = row[:11]
+    description = f"Instructor: {instructor}"
+    if notes:
+        description += f"\n{notes}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_utc(created_at)}",
+        f"DTSTART:{_local(start_time)}",
+        f"DTEND:{_local(end_time)}",
+        *extra,
+        f"SUMMARY:{escape_text(f'{course_code} {course_name} ({section})')}",
+        f"LOCATION:{escape_text(lab)}",
+        f"DESCRIPTION:{escape_text(description)}",
+        f"STATUS:{FEED_STATUSES.get(status, 'TENTATIVE')}",
+        "END:VEVENT",
+    ]
+    return b"".join(fold(line) for line in lines)
+
+
+def reservation_event(row) -> bytes:
+    return _event(f"reservation-{row[0]}@it-lab-scheduler", row, [])
+
+
+def series_event(row) -> bytes:
+    """One VEVENT for a whole series, recurring through RRULE and EXDATE."""
+    series_id, start_time, end_time = row[:3]
+    rrule, exdates = row[11], row[12]
+    exceptions = [day_number(date.fromisoformat(day)) for day in exdates.split(",")] if exdates else ()
+    rule = parse_rrule(rrule, to_timestamp(start_time), to_timestamp(end_time), exceptions)
+    parts = ["FREQ=WEEKLY", f"INTERVAL={rule.interval}",
+             "BYDAY=" + ",".join(WEEKDAY_CODES[day] for day in rule.weekdays),
+             # rule.until is exclusive; UNTIL is the last moment an occurrence may start
+             f"UNTIL={from_timestamp(rule.until - 1).strftime('%Y%m%dT%H%M%S')}"]
+    extra = [f"RRULE:{';'.join(parts)}"]
+    time_of_day = parse_datetime(start_time).time()
+    for day in sorted(exdates.split(",")) if exdates else ():
+        extra.append(f"EXDATE:{datetime.combine(date.fromisoformat(day), time_of_day).strftime('%Y%m%dT%H%M%S')}")
+    return _event(f"series-{series_id}@it-lab-scheduler", row, extra)
+
+
+def load_owner(conn, scope: str, owner_id: int) -> Optional[Tuple[str, int, int]]:
+    """(display name, feed version, modified_at) of a lab or instructor, None if unknown."""
+    table, name_column, _ = SCOPES[scope]
+    return conn.execute(f'''
+        SELECT o.{name_column}, COALESCE(v.version, 0), COALESCE(v.modified_at, 0)
+        FROM {table} o
+        LEFT JOIN calendar_versions v ON v.scope = ? AND v.owner_id = o.id
+        WHERE o.id = ?
+    ''', (scope, owner_id)).fetchone()
+
+
+def reservation_page(conn, scope: str, owner_id: int, since: str,
+                     after: Optional[Tuple[str, int]], limit: int) -> list:
+    column = SCOPES[scope][2]
+    clauses = [f"r.{column} = ?", "r.start_time >= ?", "r.status IN ('approved', 'pending')"]
+    params: list = [owner_id, since]
+    if after is not None:
+        clauses.append("(r.start_time, r.id) > (?, ?)")
+        params.extend(after)
+    return conn.execute(f'''
+        SELECT {_EVENT_COLUMNS}
+        FROM reservations r {_JOINS}
+        WHERE {' AND '.join(clauses)}
+        ORDER BY r.start_time, r.id
+        LIMIT ?
+    ''', params + [limit]).fetchall()
+
+
+def series_rows(conn, scope: str, owner_id: int, since: str) -> list:
+    column = SCOPES[scope][2]
+    return conn.execute(f'''
+        SELECT {_EVENT_COLUMNS}, r.rrule,
+               (SELECT group_concat(e.occurrence_date) FROM reservation_series_exceptions e
+                WHERE e.series_id = r.id)
+        FROM reservation_series r {_JOINS}
+        WHERE r.{column} = ? AND r.until_time > ? AND r.status IN ('approved', 'pending')
+        ORDER BY r.start_time, r.id
+    ''', (owner_id, since)).fetchall()
+
+
+async def generate_feed(run: Callable, scope: str, owner_id: int, name: str, since: str) -> AsyncIterator[bytes]:
+    """The feed of ``owner_id`` from ``since`` on, one page of events at a time.
+
+    ``run`` is ConnectionPool.run; each page is a separate keyset query, so
+    only FEED_PAGE_SIZE reservations are in memory at once.
+    """
+    yield calendar_header(name)
+    series = await run(series_rows, scope, owner_id, since)
+    if series:
+        yield b"".join(series_event(row) for row in series)
+    after = None
+    while True:
+        rows = await run(reservation_page, scope, owner_id, since, after, FEED_PAGE_SIZE)
+        if rows:
+            yield b"".join(reservation_event(row) for row in rows)
+        if len(rows) < FEED_PAGE_SIZE:
+            break
+        after = (rows[-1][1], rows[-1][0])
+    yield CALENDAR_FOOTER
+
+
+class FeedCache:
+    """LRU of generated feeds keyed by owner, each valid for one stamp
+    (feed version and window start). A newer stamp is a miss."""
+
+    def __init__(self, size: int = CACHE_SIZE, max_bytes: int = MAX_CACHED_BYTES):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, bytes]]" = OrderedDict()
+
+    def get(self, key: Hashable, stamp: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, stamp: Hashable, body: bytes):
+        with self._lock:
+            self._entries[key] = (stamp, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    async def tee(self, key: Hashable, stamp: Hashable, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Pass ``chunks`` through, storing the whole body once it completes
+        unless it grew past ``max_bytes``."""
+        kept, size = [], 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if size <= self.max_bytes:
+                kept.append(chunk)
+            yield chunk
+        if size <= self.max_bytes:
+            self.put(key, stamp, b"".join(kept))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+feed_cache = FeedCache()
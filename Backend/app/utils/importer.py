@@ -0,0 +1,339 @@
+"""Bulk import of reservation timetables from CSV or JSON.
+
+Usage: python -m app.utils.importer timetable.csv [--status approved] [--db lab_scheduler.db]
+"""
+import argparse
+import codecs
+import csv
+import json
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from ..database.pool import DATABASE_PATH, ConnectionPool, transaction
+from .conflicts import ACTIVE_STATUSES, LabIntervals, ReservationConflict, reservation_index
+from .validators import format_timestamp, validate_time_range
+
+BATCH_SIZE = 500
+READ_CHUNK_SIZE = 64 * 1024
+# Longest single record the parser will hold while waiting for its end
+MAX_RECORD_SIZE = 64 * 1024
+IMPORT_STATUSES = ("pending", "approved")
+REQUIRED_FIELDS = ("lab_id", "course_id", "section", "start_time", "end_time")
+
+
+class MalformedRecord:
+    """Stands in for a complete record that could not be decoded, keeping its row number."""
+
+    __slots__ = ("detail",)
+
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+class RecordParser:
+    """Push parser turning text chunks into records as soon as each is complete.
+
+    CSV needs a header row; a record ends at a newline outside quotes. JSON
+    accepts a top-level array or one object per line, decoded object by
+    object, so neither format is ever held in memory as a whole. A complete
+    JSON value that does not decode is returned as a MalformedRecord; an
+    unfinished one longer than MAX_RECORD_SIZE is an error.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in ("csv", "json"):
+            raise ValueError(f"Unsupported import format: {fmt!r}")
+        self.fmt = fmt
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._header: Optional[List[str]] = None
+        self._json = json.JSONDecoder()
+
+    def feed(self, data: bytes) -> List[dict]:
+        self._buffer += self._decoder.decode(data)
+        records = self._drain_csv(final=False) if self.fmt == "csv" else self._drain_json(final=False)
+        if len(self._buffer) > MAX_RECORD_SIZE:
+            raise ValueError(f"Record longer than {MAX_RECORD_SIZE} characters near: {self._buffer[:40]!r}")
+        return records
+
+    def close(self) -> List[dict]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        return self._drain_csv(final=True) if self.fmt == "csv" else self._drain_json(final=True)
+
+    def _drain_csv(self, final: bool) -> List[dict]:
+        records = []
+        start = 0
+        in_quotes = False
+        for i, char in enumerate(self._buffer):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == "\n" and not in_quotes:
+                self._csv_record(self._buffer[start:i], records)
+                start = i + 1
+        self._buffer = self._buffer[start:]
+        if final and self._buffer.strip():
+            self._csv_record(self._buffer, records)
+            self._buffer = ""
+        return records
+
+    def _csv_record(self, text: str, records: List[dict]):
+        if not text.strip():
+            return
+        values = next(csv.reader([text]))
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return
+        records.append(dict(zip(self._header, (value.strip() for value in values))))
+
+    def _drain_json(self, final: bool) -> List[dict]:
+        records = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            # Skip array brackets, separators and whitespace between objects
+            while pos < len(buffer) and buffer[pos] in "[],\r\n\t ":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            try:
+                record, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                end = _value_end(buffer, pos)
+                if end is None:
+                    # Truncated: the rest of the value has not arrived yet
+                    if final:
+                        raise ValueError(f"Malformed JSON near: {buffer[pos:pos + 40]!r}")
+                    break
+                records.append(MalformedRecord(f"Malformed JSON: {e.msg}"))
+                pos = end
+                continue
+            records.append(record)
+        self._buffer = buffer[pos:]
+        return records
+
+
+def _value_end(buffer: str, pos: int) -> Optional[int]:
+    """End of the JSON value starting at ``pos``, or None if it is not complete yet.
+
+    Objects and arrays end at their matching bracket outside strings; any
+    other value ends at the next separator.
+    """
+    if buffer[pos] not in "{[":
+        ends = [i for i in (buffer.find(c, pos) for c in ",]\n") if i != -1]
+        return min(ends) if ends else None
+    depth = 0
+    in_string = escaped = False
+    for i in range(pos, len(buffer)):
+        char = buffer[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def parse_record(record: dict, default_instructor_id: int, default_status: str) -> tuple:
+    """Validate one timetable record into the column values of `reservations`."""
+    if isinstance(record, MalformedRecord):
+        raise ValueError(record.detail)
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+    missing = [name for name in REQUIRED_FIELDS if record.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing field(s): {', '.join(missing)}")
+
+    start, end = validate_time_range(record["start_time"], record["end_time"])
+    status = record.get("status") or default_status
+    if status not in IMPORT_STATUSES:
+        raise ValueError(f"Invalid status: {status!r}")
+    try:
+        lab_id = int(record["lab_id"])
+        course_id = int(record["course_id"])
+        instructor_id = int(record.get("instructor_id") or default_instructor_id)
+        duration = int(record.get("duration") or round((end - start) / 3600))
+    except (TypeError, ValueError):
+        raise ValueError("lab_id, course_id, instructor_id and duration must be integers")
+
+    return (
+        instructor_id, lab_id, course_id, str(record["section"]),
+        format_timestamp(record["start_time"]), format_timestamp(record["end_time"]),
+        duration, record.get("notes") or None, status,
+        start, end,
+    )
+
+
+class ImportReport:
+    def __init__(self):
+        self.results: List[dict] = []
+        self.created = 0
+        self.failed = 0
+
+    def add(self, row: int, reservation_id: Optional[int] = None, error: Optional[str] = None,
+            conflict: bool = False):
+        if error is None:
+            self.created += 1
+            self.results.append({"row": row, "status": "created", "reservation_id": reservation_id})
+        else:
+            self.failed += 1
+            self.results.append({"row": row, "status": "conflict" if conflict else "error", "detail": error})
+
+    def as_dict(self) -> dict:
+        self.results.sort(key=lambda result: result["row"])
+        return {"created": self.created, "failed": self.failed, "results": self.results}
+
+
+class BatchImporter:
+    """Validates and inserts records in chunks of ``BATCH_SIZE``.
+
+    Each chunk is checked against the reservation index and against earlier
+    rows of the same chunk, then written with one executemany in one
+    transaction; the index is updated only after that transaction commits.
+    """
+
+    def __init__(self, default_instructor_id: int, default_status: str = "pending"):
+        self.default_instructor_id = default_instructor_id
+        self.default_status = default_status
+        self.report = ImportReport()
+        self._row = 0
+        self._known: Optional[Dict[str, set]] = None
+
+    def reject(self, error: str):
+        """Report input that could not be parsed as the next row, ending the import."""
+        self._row += 1
+        self.report.add(self._row, error=error)
+
+    def _load_reference_ids(self, conn):
+        self._known = {
+            table: {row[0] for row in conn.execute(f"SELECT id FROM {table}")}
+            for table in ("labs", "courses", "users")
+        }
+
+    def import_batch(self, conn, records: List[dict]):
+        if self._known is None:
+            self._load_reference_ids(conn)
+
+        rows = []
+        for record in records:
+            self._row += 1
+            try:
+                values = parse_record(record, self.default_instructor_id, self.default_status)
+            except ValueError as e:
+                self.report.add(self._row, error=str(e))
+                continue
+            for table, value in (("users", values[0]), ("labs", values[1]), ("courses", values[2])):
+                if value not in self._known[table]:
+                    self.report.add(self._row, error=f"Unknown {table[:-1]} id {value}")
+                    break
+            else:
+                rows.append((self._row, values))
+
+        with reservation_index.lock:
+            with transaction(conn):
+                reservation_index.ensure_loaded(conn)
+                accepted = []
+                batch_intervals: Dict[int, LabIntervals] = defaultdict(LabIntervals)
+                for row, values in rows:
+                    lab_id, start, end = values[1], values[9], values[10]
+                    if values[8] in ACTIVE_STATUSES:
+                        try:
+                            reservation_index.check(lab_id, start, end)
+                        except ReservationConflict as e:
+                            self.report.add(row, conflict=True, error=str(e))
+                            continue
+                        # Earlier rows of this batch are indexed by row number
+                        overlaps = batch_intervals[lab_id].overlapping(start, end)
+                        if overlaps:
+                            self.report.add(row, conflict=True, error=(
+                                f"Overlaps row(s) {', '.join(map(str, overlaps))} of this import"))
+                            continue
+                        batch_intervals[lab_id].add(row, start, end)
+                    accepted.append((row, values))
+
+                if not accepted:
+                    return
+                conn.executemany('''
+                    INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [values[:9] for _, values in accepted])
+                # Rowids are consecutive: the write lock is held for the whole batch
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(accepted) + 1
+            for offset, (row, values) in enumerate(accepted):
+                reservation_id = first_id + offset
+                if values[8] in ACTIVE_STATUSES:
+                    reservation_index.add(reservation_id, values[1], values[9], values[10])
+                self.report.add(row, reservation_id=reservation_id)
+
+
+def import_records(conn, records: Iterable[dict], importer: BatchImporter) -> dict:
+    batch = []
+    error = None
+    try:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                importer.import_batch(conn, batch)
+                batch = []
+    except ValueError as e:
+        error = str(e)
+    if batch:
+        importer.import_batch(conn, batch)
+    if error is not None:
+        importer.reject(error)
+    return importer.report.as_dict()
+
+
+def read_records(stream, fmt: str) -> Iterable[dict]:
+    parser = RecordParser(fmt)
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a reservation timetable (CSV or JSON).")
+    parser.add_argument("path", help="timetable file, or - for stdin")
+    parser.add_argument("--format", choices=("csv", "json"), help="defaults to the file extension")
+    parser.add_argument("--status", choices=IMPORT_STATUSES, default="pending")
+    parser.add_argument("--instructor-id", type=int, default=2,
+                        help="instructor for rows without an instructor_id column")
+    parser.add_argument("--db", default=DATABASE_PATH)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("json" if args.path.endswith((".json", ".jsonl", ".ndjson")) else "csv")
+    pool = ConnectionPool(args.db, size=1)
+    conn = pool.connection()
+    importer = BatchImporter(args.instructor_id, args.status)
+    try:
+        if args.path == "-":
+            report = import_records(conn, read_records(sys.stdin.buffer, fmt), importer)
+        else:
+            with open(args.path, "rb") as stream:
+                report = import_records(conn, read_records(stream, fmt), importer)
+    finally:
+        pool.close()
+
+    for result in report["results"]:
+        if result["status"] != "created":
+            print(f"row {result['row']}: {result['status']}: {result['detail']}", file=sys.stderr)
+    print(f"Imported {report['created']} reservation(s), {report['failed']} row(s) rejected")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
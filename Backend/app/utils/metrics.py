@@ -0,0 +1,303 @@
+import logging
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (128, 1024, 8192, 65536, 524288, 4194304, 33554432)
+HASH_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+slow_query_log = logging.getLogger("app.slow_queries")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = []
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value read from ``collect`` at scrape time: a number, or (labels, value) pairs."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Callable, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        value = self.collect()
+        samples: Iterable[Tuple[tuple, float]] = value if self.labelnames else [((), value)]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(sample)}"
+            for labels, sample in samples
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering a name (e.g. a reloaded module) replaces the old metric
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, collect: Callable, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, collect, labelnames))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.",
+    ("method", "route"))
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "Response body size.", ("method", "route"), SIZE_BUCKETS)
+HTTP_DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "Database statements executed per request.",
+    ("method", "route"), QUERY_COUNT_BUCKETS)
+HTTP_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds", "Time spent executing database statements per request.",
+    ("method", "route"), QUERY_BUCKETS)
+DB_QUERIES = registry.counter(
+    "db_queries_total", "Database statements executed, by driver.", ("driver",))
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "Execution time of single database statements.",
+    ("driver",), QUERY_BUCKETS)
+DB_SLOW_QUERIES = registry.counter(
+    "db_slow_queries_total", "Statements slower than the slow query threshold.", ("driver",))
+PASSWORD_HASH_SECONDS = registry.histogram(
+    "password_hash_duration_seconds", "bcrypt hash or verify time in the worker process.",
+    buckets=HASH_BUCKETS)
+PASSWORD_HASH_WAIT_SECONDS = registry.histogram(
+    "password_hash_wait_seconds", "Time bcrypt work waited for a free worker process.",
+    buckets=LATENCY_BUCKETS)
+PASSWORD_HASH_REJECTED = registry.counter(
+    "password_hash_rejected_total", "bcrypt operations refused because the queue was full.")
+
+
+class RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_query(driver: str, statement: str, seconds: float,
+                 explain: Optional[Callable[[], list]] = None):
+    """Account one executed statement to the driver totals and the current request.
+
+    With SLOW_QUERY_THRESHOLD_MS set, statements at or over the threshold
+    are logged together with the plan returned by ``explain``.
+    """
+    DB_QUERIES.inc(driver)
+    DB_QUERY_SECONDS.observe(seconds, driver)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += seconds
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and seconds * 1000 >= threshold:
+        DB_SLOW_QUERIES.inc(driver)
+        plan = None
+        if explain is not None:
+            try:
+                plan = explain()
+            except Exception as e:
+                plan = f"unavailable: {e}"
+        slow_query_log.warning(
+            "Slow query (%s, %.1f ms): %s\nPlan: %s", driver, seconds * 1000, " ".join(statement.split()), plan
+        )
+
+
+def instrument_engine(engine):
+    """Record every statement a SQLAlchemy engine executes."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        explain = None
+        if not executemany:
+            dbapi_connection = cursor.connection
+            explain = lambda: dbapi_connection.execute(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            ).fetchall()
+        record_query("sqlalchemy", statement, seconds, explain)
+
+
+def _route_of(scope) -> str:
+    # FastAPI stores the matched route in the scope; unmatched paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, response size and database work per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        state = {"status": 500, "size": 0, "done": False}
+
+        def finish():
+            if state["done"]:
+                return
+            state["done"] = True
+            method, route = scope["method"], _route_of(scope)
+            HTTP_REQUESTS.inc(method, route, str(state["status"]))
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, route)
+            HTTP_RESPONSE_SIZE.observe(state["size"], method, route)
+            HTTP_DB_QUERIES.observe(stats.queries, method, route)
+            HTTP_DB_SECONDS.observe(stats.query_seconds, method, route)
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["size"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    # Recorded at the last byte, before any background tasks run
+                    finish()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            finish()
+            _request_stats.reset(token)
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from ..database import models
+from ..database.session import SessionLocal
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class NotificationBroker:
+    """In-process pub/sub that fans notification events out to subscribed users.
+
+    Each subscriber (one per open event stream) owns a bounded asyncio queue
+    bound to its event loop. ``publish`` is safe to call from any thread,
+    including the database pool threads. When a slow consumer's queue is full
+    its oldest event is dropped.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, [])
+            self._subscribers[user_id] = [s for s in subscribers if s[1] is not queue]
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: int, notification: dict) -> dict:
+        """Deliver ``notification`` to every open stream of ``user_id``.
+
+        Events carry the id of their stored notification, so clients can
+        drop the ones they already fetched from the notifications endpoint.
+        Store them through ``create_notification`` or ``notify``.
+        """
+        event = dict(notification)
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down
+                self.unsubscribe(user_id, queue)
+        return event
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def _offer(queue: asyncio.Queue, event: dict):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+def reservation_status_notification(reservation_id: int, status: str) -> dict:
+    return {
+        "title": f"Reservation {status}",
+        "message": f"Your reservation #{reservation_id} has been {status}.",
+        "notification_type": f"reservation_{status}",
+        "reservation_id": reservation_id,
+    }
+
+
+broker = NotificationBroker()
+
+
+# Storage
+def notify(notifications: Iterable[Tuple[int, dict]]):
+    """Store each (user_id, notification) pair and push it to the user's open streams.
+
+    Blocking; handlers run it as a background task.
+    """
+    db = SessionLocal()
+    try:
+        for user_id, notification in notifications:
+            create_notification(db, user_id, notification["title"], notification["message"],
+                                notification["notification_type"])
+    finally:
+        db.close()
+
+
+def create_notification(db: Session, user_id: int, title: str, message: str,
+                        notification_type: str) -> models.Notification:
+    notification = models.Notification(
+        user_id=user_id,
+        title=title,
+        message=message,
+        notification_type=notification_type,
+    )
+    db.add(notification)
+    _adjust_unread(db, user_id, 1)
+    db.commit()
+    db.refresh(notification)
+    broker.publish(user_id, {
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "notification_type": notification.notification_type,
+        "created_at": notification.created_at.isoformat(),
+    })
+    return notification
+
+
+def get_user_notifications(db: Session, user_id: int, unread_only: bool = True,
+                           after: Optional[Tuple[datetime, int]] = None,
+                           limit: int = 50) -> List[models.Notification]:
+    """One page of a user's notifications, newest first.
+
+    ``after`` is the (created_at, id) of the last row of the previous page;
+    the page is read straight off the (user_id[, is_read], created_at) index.
+    """
+    query = db.query(models.Notification).filter(models.Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(models.Notification.is_read.is_(False))
+    if after is not None:
+        query = query.filter(
+            tuple_(models.Notification.created_at, models.Notification.id) < tuple_(*after)
+        )
+    return (
+        query.order_by(models.Notification.created_at.desc(), models.Notification.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    counter = db.get(models.NotificationCounter, user_id)
+    return counter.unread if counter else 0
+
+
+def mark_notification_as_read(db: Session, notification_id: int,
+                              user_id: int) -> Optional[models.Notification]:
+    notification = (
+        db.query(models.Notification)
+        .filter(models.Notification.id == notification_id, models.Notification.user_id == user_id)
+        .first()
+    )
+    if notification is None:
+        return None
+    if not notification.is_read:
+        notification.is_read = True
+        _adjust_unread(db, user_id, -1)
+        db.commit()
+    return notification
+
+
+def mark_all_as_read(db: Session, user_id: int) -> int:
+    """Mark every unread notification of a user as read in one UPDATE."""
+    updated = (
+        db.query(models.Notification)
+        .filter(models.Notification.user_id == user_id, models.Notification.is_read.is_(False))
+        .update({models.Notification.is_read: True}, synchronize_session=False)
+    )
+    db.query(models.NotificationCounter).filter(
+        models.NotificationCounter.user_id == user_id
+    ).update({models.NotificationCounter.unread: 0}, synchronize_session=False)
+    db.commit()
+    return updated
+
+
+def _adjust_unread(db: Session, user_id: int, delta: int):
+    updated = db.query(models.NotificationCounter).filter(
+        models.NotificationCounter.user_id == user_id
+    ).update(
+        {models.NotificationCounter.unread: models.NotificationCounter.unread + delta},
+        synchronize_session=False,
+    )
+    if not updated:
+        db.add(models.NotificationCounter(user_id=user_id, unread=max(delta, 0)))
@@ -0,0 +1,127 @@
+from datetime import date, datetime, time
+from typing import Iterable, Iterator, Optional, Tuple
+
+from .validators import to_timestamp
+
+DAY_SECONDS = 24 * 60 * 60
+WEEK_SECONDS = 7 * DAY_SECONDS
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# Upper bound on a series, so a typo in UNTIL cannot book a lab for decades
+MAX_SERIES_DAYS = 366
+
+
+def weekday_of(timestamp: int) -> int:
+    """Monday-based weekday of an epoch timestamp (1970-01-01 was a Thursday)."""
+    return (timestamp // DAY_SECONDS + 3) % 7
+
+
+def day_number(day: date) -> int:
+    return to_timestamp(datetime.combine(day, time())) // DAY_SECONDS
+
+
+class WeeklyRule:
+    """A weekly recurrence: the first occurrence repeated on ``weekdays``
+    every ``interval`` weeks, for occurrences starting before ``until``.
+
+    ``exceptions`` holds the day numbers (days since the epoch) of skipped
+    occurrences. Occurrences are never stored; ``occurrences`` computes the
+    ones overlapping a window, jumping straight to the first week involved.
+    """
+
+    __slots__ = ("start", "duration", "interval", "weekdays", "until", "exceptions")
+
+    def __init__(self, start: int, end: int, until: int, interval: int = 1,
+                 weekdays: Optional[Iterable[int]] = None, exceptions: Iterable[int] = ()):
+        if end <= start:
+            raise ValueError("end_time must be after start_time")
+        if interval < 1:
+            raise ValueError("INTERVAL must be a positive integer")
+        if end - start > DAY_SECONDS:
+            raise ValueError("A recurring occurrence cannot last more than a day")
+        if until <= start:
+            raise ValueError("UNTIL must not be before the first occurrence")
+        if until - start > MAX_SERIES_DAYS * DAY_SECONDS:
+            raise ValueError(f"A series cannot span more than {MAX_SERIES_DAYS} days")
+        self.start = start
+        self.duration = end - start
+        self.interval = interval
+        self.weekdays = tuple(sorted(set(weekdays))) if weekdays else (weekday_of(start),)
+        self.until = until
+        self.exceptions = set(exceptions)
+
+    def occurrences(self, window_start: int, window_end: int) -> Iterator[Tuple[int, int]]:
+        """(start, end) of every occurrence overlapping [window_start, window_end), in order."""
+        time_of_day = self.start % DAY_SECONDS
+        first_week = self.start - time_of_day - weekday_of(self.start) * DAY_SECONDS
+        period = self.interval * WEEK_SECONDS
+        week = max(0, (window_start - self.duration - WEEK_SECONDS - first_week) // period)
+        stop = min(window_end, self.until)
+        while True:
+            week_start = first_week + week * period
+            if week_start >= stop:
+                return
+            for weekday in self.weekdays:
+                start = week_start + weekday * DAY_SECONDS + time_of_day
+                if start >= stop:
+                    return
+                if (start < self.start or start + self.duration <= window_start
+                        or start // DAY_SECONDS in self.exceptions):
+                    continue
+                yield start, start + self.duration
+            week += 1
+
+    def overlaps(self, start: int, end: int) -> bool:
+        return next(self.occurrences(start, end), None) is not None
+
+    def first_after(self, timestamp: int) -> Optional[Tuple[int, int]]:
+        return next(self.occurrences(timestamp, self.until), None)
+
+
+def parse_rrule(rrule: str, start: int, end: int, exceptions: Iterable[int] = ()) -> WeeklyRule:
+    """Build a WeeklyRule from an iCalendar RRULE such as
+    'FREQ=WEEKLY;BYDAY=MO,WE;INTERVAL=1;UNTIL=20250516'.
+
+    Only weekly rules are supported, and they must be bounded by UNTIL
+    (a date, inclusive) or COUNT.
+    """
+    parts = {}
+    for part in rrule.strip().removeprefix("RRULE:").split(";"):
+        key, _, value = part.partition("=")
+        if part:
+            parts[key.strip().upper()] = value.strip().upper()
+
+    if parts.get("FREQ") != "WEEKLY":
+        raise ValueError("Only FREQ=WEEKLY recurrences are supported")
+    try:
+        interval = int(parts.get("INTERVAL", "1"))
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be integers")
+    try:
+        weekdays = [WEEKDAY_CODES.index(code) for code in parts["BYDAY"].split(",")] if "BYDAY" in parts else None
+    except ValueError:
+        raise ValueError(f"Invalid BYDAY: {parts['BYDAY']!r}")
+
+    if "UNTIL" in parts:
+        try:
+            last_day = datetime.strptime(parts["UNTIL"][:8], "%Y%m%d").date()
+        except ValueError:
+            raise ValueError(f"Invalid UNTIL: {parts['UNTIL']!r}")
+        until = (day_number(last_day) + 1) * DAY_SECONDS
+    elif count is not None:
+        if count < 1:
+            raise ValueError("COUNT must be positive")
+        until = start + MAX_SERIES_DAYS * DAY_SECONDS
+    else:
+        raise ValueError("A recurrence needs UNTIL or COUNT")
+
+    rule = WeeklyRule(start, end, until, interval, weekdays, exceptions)
+    if count is not None:
+        # Exceptions do not consume COUNT, as in RFC 5545 EXDATE
+        rule.exceptions = set()
+        for i, (occurrence, _) in enumerate(rule.occurrences(start, until)):
+            if i == count - 1:
+                rule.until = min(until, occurrence + 1)
+                break
+        rule.exceptions = set(exceptions)
+    return rule
@@ -0,0 +1,129 @@
+import hashlib
+import sqlite3
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import versions
+from ..database.pool import DATABASE_PATH
+from ..frontend import REVALIDATE_CACHE_CONTROL, etag_matches
+
+
+class CachedBody:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # Content hash, so every worker hands out the same ETag for the same data
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class ReferenceCache:
+    """Pre-serialized JSON responses built from rarely changing tables.
+
+    Entries are keyed by (table, variant) and dropped when their table is
+    written: through ``invalidate`` for writes made by this process and,
+    with ``check_versions``, whenever the trigger-maintained version of the
+    table moves (see database/versions.py). That check is one
+    ``PRAGMA data_version`` on a private, read-only connection per lookup,
+    run on a worker thread; the versions table is only read after some
+    connection has committed.
+    """
+
+    def __init__(self, path: str = DATABASE_PATH,
+                 check_versions: bool = settings.REFERENCE_CACHE_CHECK_VERSIONS):
+        self.path = path
+        self.check_versions = check_versions
+        self._lock = threading.Lock()
+        # Serializes the private connection, which is used from worker threads
+        self._conn_lock = threading.Lock()
+        self._entries: Dict[Tuple[str, Hashable], CachedBody] = {}
+        # Bumped on every invalidation, so a load that raced a write is not stored
+        self._generations: Dict[str, int] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._applied_data_version = -1
+        self._versions: Dict[str, int] = {}
+
+    def invalidate(self, *tables: str):
+        with self._lock:
+            self._invalidate(tables)
+
+    def _invalidate(self, tables):
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+        self._entries = {key: entry for key, entry in self._entries.items() if key[0] not in tables}
+
+    def _read_versions(self) -> Optional[Tuple[int, Dict[str, int]]]:
+        """(data_version, table versions) if any connection has committed
+        since the last read, else None. Blocking."""
+        with self._conn_lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            # Changes whenever another connection commits; our own never writes
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return None
+            self._data_version = data_version
+            return data_version, versions.read(self._conn)
+
+    def _apply_versions(self, data_version: int, current: Dict[str, int]):
+        with self._lock:
+            # Reads finish in any order; an older one must not undo a newer one
+            if data_version <= self._applied_data_version:
+                return
+            self._applied_data_version = data_version
+            changed = [table for table, version in current.items() if self._versions.get(table) != version]
+            self._versions = current
+            if changed:
+                self._invalidate(changed)
+
+    async def get(self, table: str, variant: Hashable = None) -> Optional[CachedBody]:
+        if self.check_versions:
+            read = await run_in_threadpool(self._read_versions)
+            if read is not None:
+                self._apply_versions(*read)
+        with self._lock:
+            return self._entries.get((table, variant))
+
+    def put(self, table: str, variant: Hashable, body: bytes, generation: int) -> CachedBody:
+        entry = CachedBody(body)
+        with self._lock:
+            if self._generations.get(table, 0) == generation:
+                self._entries[(table, variant)] = entry
+        return entry
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    async def response(self, request: Request, table: str, variant: Hashable,
+                       load: Callable[[], Awaitable[bytes]]) -> Response:
+        """The cached JSON for (table, variant), filled by ``load`` on a miss,
+        or 304 when the request's If-None-Match already names it."""
+        entry = await self.get(table, variant)
+        if entry is None:
+            generation = self.generation(table)
+            entry = self.put(table, variant, await load(), generation)
+
+        headers = {"ETag": entry.etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def close(self):
+        with self._conn_lock:
+            conn, self._conn = self._conn, None
+            self._data_version = None
+        with self._lock:
+            self._applied_data_version = -1
+            self._versions = {}
+            self._entries = {}
+        if conn is not None:
+            conn.close()
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,195 @@
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+from ..config import settings
+from ..database.series import expand, load_series
+from .validators import to_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # optional; the histograms fall back to a per-row loop
+    np = None
+
+DAY_SECONDS = 24 * 60 * 60
+HOUR_SECONDS = 60 * 60
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def month_bounds(month: str) -> Tuple[date, date]:
+    """First day of ``month`` ('YYYY-MM') and first day of the following month."""
+    try:
+        first = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Invalid month: {month!r}, expected YYYY-MM")
+    following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, following
+
+
+def open_days(start: date, end: date) -> int:
+    """Days in [start, end) on which the labs are open."""
+    return sum(
+        1 for offset in range((end - start).days)
+        if (start + timedelta(days=offset)).weekday() in settings.LAB_OPEN_WEEKDAYS
+    )
+
+
+def opening_hours_per_day() -> int:
+    return max(settings.LAB_CLOSING_HOUR - settings.LAB_OPENING_HOUR, 0)
+
+
+class ReservationColumns:
+    """Reservations overlapping a period, held as parallel typed arrays.
+
+    Timestamps are converted to epoch seconds by SQLite while loading, so
+    building the columns costs one index range scan and no Python parsing.
+    Bookings are kept whole; UsageHistograms clips them to the period.
+    """
+
+    __slots__ = ("lab_ids", "starts", "ends")
+
+    def __init__(self):
+        self.lab_ids = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+
+    @classmethod
+    def load(cls, conn, start: date, end: date,
+             statuses: Sequence[str] = ("approved",)) -> "ReservationColumns":
+        columns = cls()
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = conn.execute(f'''
+            SELECT lab_id,
+                   CAST(strftime('%s', start_time) AS INTEGER),
+                   CAST(strftime('%s', end_time) AS INTEGER)
+            FROM reservations
+            WHERE status IN ({placeholders}) AND end_time > ? AND start_time < ?
+        ''', (*statuses, start.isoformat(), end.isoformat()))
+        for lab_id, start_ts, end_ts in rows:
+            if start_ts is None or end_ts is None:
+                continue
+            columns.lab_ids.append(lab_id)
+            columns.starts.append(start_ts)
+            columns.ends.append(end_ts)
+        # Recurring series contribute their occurrences in the period, expanded here
+        period = (to_timestamp(datetime.combine(start, datetime.min.time())),
+                  to_timestamp(datetime.combine(end, datetime.min.time())))
+        for series, start_ts, end_ts in expand(load_series(conn, statuses, start, end), *period):
+            columns.lab_ids.append(series.lab_id)
+            columns.starts.append(start_ts)
+            columns.ends.append(end_ts)
+        return columns
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class UsageHistograms:
+    """Booked seconds per lab, in total, per weekday and per hour of day."""
+
+    def __init__(self, lab_ids: Sequence[int]):
+        self.lab_ids = list(lab_ids)
+        self.positions: Dict[int, int] = {lab_id: i for i, lab_id in enumerate(self.lab_ids)}
+        count = len(self.lab_ids)
+        self.booked = array("q", bytes(8 * count))
+        self.by_weekday = array("q", bytes(8 * count * 7))
+        self.by_hour = array("q", bytes(8 * count * 24))
+
+    def accumulate(self, columns: ReservationColumns, period_start: int, period_end: int):
+        """Add the part of each reservation that falls inside the period."""
+        if np is not None and len(columns):
+            self._accumulate_arrays(columns, period_start, period_end)
+            return
+        positions, booked = self.positions, self.booked
+        by_weekday, by_hour = self.by_weekday, self.by_hour
+        for lab_id, start, end in zip(columns.lab_ids, columns.starts, columns.ends):
+            lab = positions.get(lab_id)
+            if lab is None:
+                continue
+            start, end = max(start, period_start), min(end, period_end)
+            if end <= start:
+                continue
+            booked[lab] += end - start
+            # 1970-01-01 was a Thursday
+            by_weekday[lab * 7 + (start // DAY_SECONDS + 3) % 7] += end - start
+            t = start
+            while t < end:
+                chunk = min(t - t % HOUR_SECONDS + HOUR_SECONDS, end) - t
+                by_hour[lab * 24 + t // HOUR_SECONDS % 24] += chunk
+                t += chunk
+
+    def _accumulate_arrays(self, columns: ReservationColumns, period_start: int, period_end: int):
+        # Same sums as the loop in accumulate, as whole-column numpy operations
+        known = np.array(self.lab_ids, dtype=np.int64)
+        order = np.argsort(known)
+        lab_ids = np.frombuffer(columns.lab_ids, dtype=np.int64)
+        found = np.searchsorted(known[order], lab_ids).clip(max=max(len(known) - 1, 0))
+        keep = (known[order][found] == lab_ids) if len(known) else np.zeros(len(lab_ids), dtype=bool)
+        starts = np.maximum(np.frombuffer(columns.starts, dtype=np.int64), period_start)
+        ends = np.minimum(np.frombuffer(columns.ends, dtype=np.int64), period_end)
+        keep &= ends > starts
+        labs, starts, ends = order[found[keep]], starts[keep], ends[keep]
+        seconds = ends - starts
+
+        # Views onto the arrays themselves, so the sums land in place
+        np.add.at(np.frombuffer(self.booked, dtype=np.int64), labs, seconds)
+        np.add.at(np.frombuffer(self.by_weekday, dtype=np.int64),
+                  labs * 7 + (starts // DAY_SECONDS + 3) % 7, seconds)
+
+        # One entry per (reservation, hour it touches), clipped to that hour
+        first_hour = starts // HOUR_SECONDS
+        spans = (ends - 1) // HOUR_SECONDS - first_hour + 1
+        row = np.repeat(np.arange(len(spans)), spans)
+        hour = first_hour[row] + np.arange(len(row)) - np.repeat(np.cumsum(spans) - spans, spans)
+        chunk = np.minimum((hour + 1) * HOUR_SECONDS, ends[row]) - np.maximum(hour * HOUR_SECONDS, starts[row])
+        np.add.at(np.frombuffer(self.by_hour, dtype=np.int64), labs[row] * 24 + hour % 24, chunk)
+
+    def peak_day(self, lab: int) -> str:
+        return _peak_label(self.by_weekday[lab * 7:lab * 7 + 7], WEEKDAYS)
+
+    def peak_hour(self, lab: int) -> str:
+        labels = [f"{h:02d}:00-{(h + 1) % 24:02d}:00" for h in range(24)]
+        return _peak_label(self.by_hour[lab * 24:lab * 24 + 24], labels)
+
+
+def usage_report(conn, start: date, end: date) -> Tuple[List[dict], List[dict]]:
+    """UsageStats rows per active lab plus PeakHourData for the opening hours."""
+    labs = conn.execute("SELECT id, name FROM labs WHERE is_active = 1 ORDER BY name").fetchall()
+    period_start = to_timestamp(datetime.combine(start, datetime.min.time()))
+    period_end = to_timestamp(datetime.combine(end, datetime.min.time()))
+
+    histograms = UsageHistograms([lab_id for lab_id, _ in labs])
+    histograms.accumulate(ReservationColumns.load(conn, start, end), period_start, period_end)
+
+    days_open = open_days(start, end)
+    available = days_open * opening_hours_per_day() * HOUR_SECONDS
+    usage = [
+        {
+            "lab_name": name,
+            "total_hours": round(histograms.booked[i] / HOUR_SECONDS),
+            "utilization_rate": _percent(histograms.booked[i], available),
+            "peak_day": histograms.peak_day(i),
+            "peak_hours": histograms.peak_hour(i),
+        }
+        for i, (_, name) in enumerate(labs)
+    ]
+
+    hour_capacity = days_open * HOUR_SECONDS * len(labs)
+    peak_hours = [
+        {
+            "time_slot": f"{hour:02d}:00",
+            "utilization": _percent(sum(histograms.by_hour[lab * 24 + hour] for lab in range(len(labs))),
+                                    hour_capacity),
+        }
+        for hour in range(settings.LAB_OPENING_HOUR, settings.LAB_CLOSING_HOUR)
+    ]
+    return usage, peak_hours
+
+
+def _peak_label(values: Sequence[int], labels: Sequence[str]) -> str:
+    best = max(range(len(values)), key=values.__getitem__)
+    return labels[best] if values[best] else "-"
+
+
+def _percent(part: int, whole: int) -> float:
+    return round(min(part / whole * 100, 100.0), 1) if whole else 0.0
@@ -0,0 +1,360 @@
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..database.pool import transaction
+from .conflicts import LabIntervals, ReservationConflict, reservation_index
+from .validators import to_timestamp
+
+DEFAULT_TIME_BUDGET = 2.0
+MAX_WORKERS = 8
+SOLVER_PROCESSES = int(os.getenv("TIMETABLE_SOLVER_PROCESSES", str(min(os.cpu_count() or 1, MAX_WORKERS))))
+_BLOCKER = -1
+
+
+def equipment_features(equipment: Optional[str]) -> frozenset:
+    """Normalized items of a lab's equipment text: '30 PCs, Projector' -> {'pcs', 'projector'}."""
+    if not equipment:
+        return frozenset()
+    return frozenset(
+        re.sub(r"^\d+\s*", "", item.strip()).lower()
+        for item in equipment.split(",") if item.strip()
+    )
+
+
+class TimetableRequest:
+    """A pending reservation and the labs it may be placed in, preferred lab first."""
+
+    __slots__ = ("id", "start", "end", "requested_lab", "candidates")
+
+    def __init__(self, reservation_id: int, start: int, end: int, requested_lab: int,
+                 candidates: Sequence[int]):
+        self.id = reservation_id
+        self.start = start
+        self.end = end
+        self.requested_lab = requested_lab
+        self.candidates = tuple(candidates)
+
+
+def candidate_labs(requested_lab: int, labs: Dict[int, Tuple[int, frozenset]]) -> List[int]:
+    """Labs at least as large as ``requested_lab`` with all of its equipment.
+
+    The requested lab comes first, the rest smallest first so that large
+    labs stay free for the requests only they can hold.
+    """
+    if requested_lab not in labs:
+        return []
+    capacity, features = labs[requested_lab]
+    others = sorted(
+        (lab_capacity, lab_id) for lab_id, (lab_capacity, lab_features) in labs.items()
+        if lab_id != requested_lab and lab_capacity >= capacity and features <= lab_features
+    )
+    return [requested_lab] + [lab_id for _, lab_id in others]
+
+
+class Solution:
+    __slots__ = ("assignment", "unassigned", "moved", "restarts", "seconds")
+
+    def __init__(self, assignment: Dict[int, int], requests: Sequence[TimetableRequest]):
+        self.assignment = assignment
+        self.unassigned = [r.id for r in requests if r.id not in assignment]
+        self.moved = sum(1 for r in requests if assignment.get(r.id, r.requested_lab) != r.requested_lab)
+        self.restarts = 0
+        self.seconds = 0.0
+
+    @property
+    def score(self) -> Tuple[int, int]:
+        return len(self.assignment), -self.moved
+
+
+class TimetableProblem:
+    """Pending requests plus the time already taken in each lab.
+
+    ``blockers`` holds the (start, end) of approved bookings and other
+    fixed occupancy per lab; requests are placed around them.
+    """
+
+    def __init__(self, requests: Sequence[TimetableRequest], blockers: Dict[int, List[Tuple[int, int]]]):
+        self.requests = list(requests)
+        self.blockers = blockers
+        self._by_id = {r.id: r for r in self.requests}
+
+    def _occupancy(self) -> Dict[int, LabIntervals]:
+        labs: Dict[int, LabIntervals] = {}
+        for lab_id, intervals in self.blockers.items():
+            lab = labs[lab_id] = LabIntervals()
+            for start, end in intervals:
+                lab.add(_BLOCKER, start, end)
+        return labs
+
+    def greedy(self, order: Iterable[TimetableRequest], rng: Optional[random.Random] = None,
+               initial: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+        """One pass of first-fit interval coloring over ``order``.
+
+        Each request takes its preferred lab if free, else the first free
+        alternative. A request that fits nowhere may displace a single
+        overlapping request that can itself move to another free lab.
+        ``initial`` placements are kept where still valid (warm start).
+        """
+        occupancy = self._occupancy()
+        assignment: Dict[int, int] = {}
+
+        def free(lab_id: int, request: TimetableRequest) -> List[int]:
+            lab = occupancy.get(lab_id)
+            return lab.overlapping(request.start, request.end) if lab is not None else []
+
+        def place(lab_id: int, request: TimetableRequest):
+            occupancy.setdefault(lab_id, LabIntervals()).add(request.id, request.start, request.end)
+            assignment[request.id] = lab_id
+
+        def relocate(blocking: TimetableRequest, lab_id: int) -> bool:
+            for other in blocking.candidates:
+                if other != lab_id and not free(other, blocking):
+                    occupancy[lab_id].remove(blocking.id, blocking.start)
+                    place(other, blocking)
+                    return True
+            return False
+
+        if initial:
+            for request in self.requests:
+                lab_id = initial.get(request.id)
+                if lab_id in request.candidates and not free(lab_id, request):
+                    place(lab_id, request)
+
+        for request in order:
+            if request.id in assignment:
+                continue
+            candidates = request.candidates
+            if rng is not None and len(candidates) > 2:
+                alternatives = list(candidates[1:])
+                rng.shuffle(alternatives)
+                candidates = (candidates[0], *alternatives)
+            for lab_id in candidates:
+                if not free(lab_id, request):
+                    place(lab_id, request)
+                    break
+            else:
+                for lab_id in candidates:
+                    blocking = free(lab_id, request)
+                    if (len(blocking) == 1 and blocking[0] != _BLOCKER
+                            and relocate(self._by_id[blocking[0]], lab_id)):
+                        place(lab_id, request)
+                        break
+        return assignment
+
+    def solve(self, time_budget: float = DEFAULT_TIME_BUDGET, seed: int = 0,
+              initial: Optional[Dict[int, int]] = None) -> Solution:
+        """Best of repeated greedy passes until every request is placed in its
+        preferred lab or ``time_budget`` seconds have passed.
+
+        The first pass visits requests by end time, which places the most
+        requests when each can use a single lab (earliest-finish interval
+        scheduling); later passes jitter that order and the choice among
+        alternative labs.
+        """
+        started = time.perf_counter()
+        rng = random.Random(seed)
+        order = sorted(self.requests, key=lambda r: (r.end, r.start, r.id))
+        best = Solution(self.greedy(order), self.requests)
+        restarts = 1
+        if initial:
+            warm = Solution(self.greedy(order, initial=initial), self.requests)
+            restarts += 1
+            if warm.score > best.score:
+                best = warm
+        # Without alternatives the labs are independent and the first pass is optimal
+        exact = all(len(r.candidates) <= 1 for r in self.requests)
+        spread = max((r.end - r.start for r in self.requests), default=0)
+        while (not exact and (best.unassigned or best.moved)
+               and time.perf_counter() - started < time_budget):
+            jittered = sorted(order, key=lambda r: r.end + rng.random() * spread)
+            # Alternate warm and cold passes so a poor previous assignment can be escaped
+            warm_start = initial if restarts % 2 == 0 else None
+            candidate = Solution(self.greedy(jittered, rng, warm_start), self.requests)
+            restarts += 1
+            if candidate.score > best.score:
+                best = candidate
+        best.restarts = restarts
+        best.seconds = time.perf_counter() - started
+        return best
+
+
+def _solve_in_worker(problem: TimetableProblem, deadline: float, seed: int,
+                     initial: Optional[Dict[int, int]]) -> Solution:
+    # Process startup and time queued behind other solves count against the budget
+    return problem.solve(max(deadline - time.time(), 0.0), seed, initial)
+
+
+class SolverPool:
+    """Worker processes for parallel restarts, started on first use and kept
+    until ``close`` so that a solve does not pay for spawning them.
+
+    Restarts beyond ``processes`` queue for a free worker; whatever the
+    wait, every restart stops by the caller's deadline.
+    """
+
+    def __init__(self, processes: int = SOLVER_PROCESSES):
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def solve(self, problem: TimetableProblem, time_budget: float, workers: int,
+              initial: Optional[Dict[int, int]] = None) -> Solution:
+        """Best of ``workers`` restarts with different seeds, all within ``time_budget``."""
+        deadline = time.time() + time_budget
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_solve_in_worker, problem, deadline, seed, initial)
+            for seed in range(workers)
+        ]
+        solutions = [future.result() for future in futures]
+        best = max(solutions, key=lambda solution: solution.score)
+        best.restarts = sum(solution.restarts for solution in solutions)
+        return best
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+solver_pool = SolverPool()
+
+
+def solve_parallel(problem: TimetableProblem, time_budget: float, workers: int,
+                   initial: Optional[Dict[int, int]] = None) -> Solution:
+    """Independent restarts with different seeds across the solver pool."""
+    if workers <= 1:
+        return problem.solve(time_budget, 0, initial)
+    return solver_pool.solve(problem, time_budget, workers, initial)
+
+
+class TimetableSolver:
+    """Keeps the last assignment so a re-solve after new requests arrive
+    starts from it and only has to fit the new requests in."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_assignment: Dict[int, int] = {}
+
+    def solve(self, problem: TimetableProblem, time_budget: float = DEFAULT_TIME_BUDGET,
+              workers: int = 1, incremental: bool = True) -> Solution:
+        with self._lock:
+            initial = self.last_assignment if incremental else None
+        solution = solve_parallel(problem, time_budget, min(max(workers, 1), MAX_WORKERS), initial)
+        with self._lock:
+            self.last_assignment = dict(solution.assignment)
+        return solution
+
+
+def load_problem(conn, start_date: Optional[date] = None, end_date: Optional[date] = None) -> TimetableProblem:
+    """Pending reservations starting in [start_date, end_date] and the
+    occupancy around them: approved bookings, pending ones outside the
+    range and active recurring series."""
+    labs = {
+        lab_id: (capacity, equipment_features(equipment))
+        for lab_id, capacity, equipment in conn.execute(
+            "SELECT id, capacity, equipment FROM labs WHERE is_active = 1 ORDER BY id"
+        )
+    }
+    clauses, params = ["status = 'pending'"], []
+    if start_date is not None:
+        clauses.append("start_time >= ?")
+        params.append(start_date.isoformat())
+    if end_date is not None:
+        clauses.append("start_time < ?")
+        params.append((end_date + timedelta(days=1)).isoformat())
+
+    requests = []
+    for reservation_id, lab_id, start_time, end_time in conn.execute(
+        f"SELECT id, lab_id, start_time, end_time FROM reservations WHERE {' AND '.join(clauses)}",
+        params
+    ):
+        try:
+            start, end = to_timestamp(start_time), to_timestamp(end_time)
+        except ValueError:
+            continue
+        requests.append(TimetableRequest(reservation_id, start, end, lab_id, candidate_labs(lab_id, labs)))
+
+    blockers: Dict[int, List[Tuple[int, int]]] = {}
+    if requests:
+        pending = {r.id for r in requests}
+        first, last = min(r.start for r in requests), max(r.end for r in requests)
+        with reservation_index.lock:
+            reservation_index.ensure_loaded(conn)
+            for lab_id in labs:
+                blockers[lab_id] = [
+                    (start, end) for i, start, end in reservation_index.intervals(lab_id, first, last)
+                    if i not in pending
+                ]
+    return TimetableProblem(requests, blockers)
+
+
+def apply_solution(conn, problem: TimetableProblem, solution: Solution) -> List[Tuple[int, int, str]]:
+    """Approve the assigned requests in their assigned labs and decline the
+    rest, in one transaction. Returns (instructor_id, reservation_id, status)
+    of every row changed.
+
+    Requests that stopped being pending since the solve are left alone; an
+    assignment that now collides with another booking raises
+    ReservationConflict and nothing is written.
+    """
+    with reservation_index.lock:
+        with transaction(conn):
+            reservation_index.ensure_loaded(conn)
+            instructors = dict(conn.execute(
+                "SELECT id, instructor_id FROM reservations WHERE status = 'pending'"
+            ).fetchall())
+            requests = [r for r in problem.requests if r.id in instructors]
+            pending = {r.id for r in requests}
+            approved, declined = [], []
+            for request in requests:
+                lab_id = solution.assignment.get(request.id)
+                if lab_id is None:
+                    declined.append(request)
+                    continue
+                conflicts = [
+                    i for i in reservation_index.find_conflicts(lab_id, request.start, request.end)
+                    if i not in pending
+                ]
+                series = reservation_index.find_series_conflicts(lab_id, request.start, request.end)
+                if conflicts or series:
+                    raise ReservationConflict(lab_id, conflicts, series)
+                approved.append((request, lab_id))
+
+            conn.executemany(
+                "UPDATE reservations SET lab_id = ?, status = 'approved' WHERE id = ?",
+                [(lab_id, request.id) for request, lab_id in approved]
+            )
+            conn.executemany(
+                "UPDATE reservations SET status = 'declined' WHERE id = ?",
+                [(request.id,) for request in declined]
+            )
+        for request in declined:
+            reservation_index.discard(request.id)
+        for request, lab_id in approved:
+            reservation_index.add(request.id, lab_id, request.start, request.end)
+
+    return (
+        [(instructors[request.id], request.id, "approved") for request, _ in approved]
+        + [(instructors[request.id], request.id, "declined") for request in declined]
+    )
+
+
+timetable_solver = TimetableSolver()
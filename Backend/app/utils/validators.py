@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+from typing import Union
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def parse_datetime(value: Union[str, datetime]) -> datetime:
+    """Parse the timestamp formats stored in `reservations` (space or 'T' separated)."""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid timestamp: {value!r}")
+
+
+def format_timestamp(value: Union[str, datetime]) -> str:
+    """Canonical 'YYYY-MM-DD HH:MM:SS' form, so stored timestamps sort as text."""
+    return parse_datetime(value).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def to_timestamp(value: Union[str, datetime]) -> int:
+    """Seconds since the epoch for a naive local timestamp."""
+    return int((parse_datetime(value) - EPOCH).total_seconds())
+
+
+def from_timestamp(timestamp: int) -> datetime:
+    """Inverse of ``to_timestamp``."""
+    return EPOCH + timedelta(seconds=timestamp)
+
+
+def validate_time_range(start_time: Union[str, datetime], end_time: Union[str, datetime]):
+    start = to_timestamp(start_time)
+    end = to_timestamp(end_time)
+    if end <= start:
+        raise ValueError("end_time must be after start_time")
+    return start, end
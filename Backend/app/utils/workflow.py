@@ -0,0 +1,36 @@
+from typing import Dict, FrozenSet
+
+from ..database.models import ReservationStatus
+
+# Status changes an administrator may make; declined is final
+TRANSITIONS: Dict[ReservationStatus, FrozenSet[ReservationStatus]] = {
+    ReservationStatus.PENDING: frozenset({ReservationStatus.APPROVED, ReservationStatus.DECLINED}),
+    ReservationStatus.APPROVED: frozenset({ReservationStatus.DECLINED}),
+    ReservationStatus.DECLINED: frozenset(),
+}
+
+
+class InvalidTransition(Exception):
+    def __init__(self, current: str, new: str):
+        self.current = current
+        self.new = new
+        super().__init__(f"Cannot change reservation status from {current} to {new}")
+
+
+def parse_status(value: str) -> ReservationStatus:
+    try:
+        return ReservationStatus(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid status: {value!r}, expected one of "
+            + ", ".join(status.value for status in ReservationStatus)
+        )
+
+
+def check_transition(current: str, new: ReservationStatus):
+    try:
+        allowed = TRANSITIONS[ReservationStatus(current)]
+    except ValueError:
+        allowed = frozenset()
+    if new not in allowed:
+        raise InvalidTransition(current, new.value)
@@ -8,6 +8,10 @@ from datetime import datetime, timedelta
 import sqlite3
 import os
 
+from app.auth.utils import HashPoolSaturated, password_hasher
+from app.database.pool import DATABASE_PATH
+from app.database.schema import migrate
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -25,46 +29,11 @@ app.add_middleware(
 
 # Database setup
 def init_db():
-    conn = sqlite3.connect('it_lab_scheduler.db')
+    # Same migrated schema and database file as app.main
+    migrate(DATABASE_PATH)
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            hashed_password TEXT NOT NULL,
-            full_name TEXT NOT NULL,
-            role TEXT NOT NULL,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS labs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            description TEXT,
-            capacity INTEGER NOT NULL,
-            equipment TEXT,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            code TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            description TEXT,
-            credits INTEGER DEFAULT 3,
-            is_active BOOLEAN DEFAULT TRUE
-        )
-    ''')
-    
     # Create default data
     create_default_data(cursor)
     
@@ -133,6 +102,10 @@ class UserResponse(BaseModel):
     is_active: bool
 
 # Routes
+@app.on_event("shutdown")
+async def close_password_hasher():
+    password_hasher.close()
+
 @app.get("/")
 async def root():
     return {"message": "IT Lab Scheduler API", "status": "running"}
@@ -143,7 +116,7 @@ async def health_check():
 
 @app.post("/api/v1/login", response_model=Token)
 async def login(login_data: LoginRequest):
-    conn = sqlite3.connect('it_lab_scheduler.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM users WHERE username = ?', (login_data.username,))
@@ -163,7 +136,12 @@ async def login(login_data: LoginRequest):
         "is_active": user[6]
     }
     
-    if not pwd_context.verify(login_data.password, user_dict["hashed_password"]):
+    try:
+        password_ok = await password_hasher.verify(login_data.password, user_dict["hashed_password"])
+    except HashPoolSaturated:
+        raise HTTPException(status_code=429, detail="Too many login attempts, please retry", headers={"Retry-After": "1"})
+    
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Create token
@@ -185,7 +163,7 @@ async def login(login_data: LoginRequest):
 
 @app.get("/api/v1/labs")
 async def get_labs():
-    conn = sqlite3.connect('it_lab_scheduler.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM labs WHERE is_active = TRUE')
     labs = cursor.fetchall()
@@ -204,7 +182,7 @@ async def get_labs():
 
 @app.get("/api/v1/courses")
 async def get_courses():
-    conn = sqlite3.connect('it_lab_scheduler.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM courses WHERE is_active = TRUE')
     courses = cursor.fetchall()
@@ -223,7 +201,7 @@ async def get_courses():
 
 @app.get("/api/v1/dashboard/stats")
 async def get_dashboard_stats():
-    conn = sqlite3.connect('it_lab_scheduler.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
     cursor.execute('SELECT COUNT(*) FROM labs WHERE is_active = TRUE')
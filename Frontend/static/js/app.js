@@ -128,6 +128,11 @@ class LabScheduler {
         if (loginPage) loginPage.style.display = 'none';
         if (app) app.style.display = 'flex';
         
+        // Reopen the notification stream closed by logout()
+        if (this.notificationsManager) {
+            this.notificationsManager.connect();
+        }
+        
         this.updateUserInterface();
         this.loadDashboard();
     }
@@ -384,6 +389,9 @@ class LabScheduler {
         localStorage.removeItem('user_data');
         this.token = null;
         this.currentUser = null;
+        if (this.notificationsManager) {
+            this.notificationsManager.disconnect();
+        }
         this.showLogin();
         this.showNotification('You have been logged out', 'info');
     }
@@ -2,12 +2,48 @@ class NotificationsManager {
     constructor(app) {
         this.app = app;
         this.notifications = [];
+        this.eventSource = null;
         this.setupEventListeners();
     }
 
     setupEventListeners() {
-        // Check for new notifications periodically
-        setInterval(() => this.checkNotifications(), 30000); // Every 30 seconds
+        // Notifications are pushed by the server; catch up once, then listen
+        this.checkNotifications();
+        this.connect();
+    }
+
+    connect() {
+        if (!this.app.currentUser || !this.app.token || this.eventSource) return;
+        
+        // EventSource cannot send an Authorization header
+        const url = `${this.app.apiBaseUrl}/notifications/stream?token=${encodeURIComponent(this.app.token)}`;
+        this.eventSource = new EventSource(url);
+        
+        // Every (re)connect catches up on notifications stored while the stream was down;
+        // stream events carry the same ids, so nothing is shown twice
+        this.eventSource.onopen = () => this.checkNotifications();
+        
+        this.eventSource.addEventListener('notification', (event) => {
+            const notification = JSON.parse(event.data);
+            if (!this.notifications.find(n => n.id === notification.id)) {
+                this.showNotification(notification);
+                this.notifications.push(notification);
+            }
+        });
+        
+        // EventSource reconnects on its own; only give up once the server closed it for good
+        this.eventSource.onerror = () => {
+            if (this.eventSource.readyState === EventSource.CLOSED) {
+                this.disconnect();
+            }
+        };
+    }
+
+    disconnect() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
     }
 
     async checkNotifications() {
@@ -126,8 +162,8 @@ class NotificationsManager {
 
     async getUnreadCount() {
         try {
-            const notifications = await this.app.apiCall('/notifications/?unread_only=true');
-            return notifications.length;
+            const result = await this.app.apiCall('/notifications/unread-count');
+            return result.unread;
         } catch (error) {
             console.error('Failed to get unread count:', error);
             return 0;
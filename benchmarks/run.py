@@ -0,0 +1,223 @@
+"""Latency and throughput benchmarks for the API.
+
+Seeds a synthetic database, drives the app with concurrent clients either
+in-process (ASGI, no network) or through a uvicorn server, and writes
+p50/p95/p99 latency and throughput per endpoint as JSON:
+
+    python -m benchmarks.run --reservations 100000 --output results.json
+    python -m benchmarks.run --mode uvicorn --concurrency 32
+    python -m benchmarks.run --baseline benchmarks/baseline.json   # exit 1 on regression
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from .seed import BACKEND_DIR, BENCH_PASSWORD, seed
+
+# name -> (method, path, JSON body); {day} is a weekday inside the seeded range
+ENDPOINTS = {
+    "login": ("POST", "/api/v1/login", {"username": "user1", "password": BENCH_PASSWORD}),
+    "labs": ("GET", "/api/v1/labs", None),
+    "reservations": ("GET", "/api/v1/reservations?limit=50", None),
+    "reservations_by_lab": ("GET", "/api/v1/reservations?lab_id=3&limit=50", None),
+    "dashboard": ("GET", "/api/v1/dashboard/stats", None),
+    "availability": ("GET", "/api/v1/availability?start_date={day}&start=09:00&end=11:00", None),
+}
+DEFAULT_TOLERANCE = 0.25
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    # Rounded first so float error cannot push an exact rank up by one
+    rank = max(math.ceil(round(fraction * len(ordered), 9)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def measure(client: httpx.AsyncClient, method: str, path: str, body: Optional[dict],
+                  requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run_endpoints(client: httpx.AsyncClient, endpoints: List[str], requests: int,
+                        concurrency: int, day: str) -> Dict[str, dict]:
+    results = {}
+    for name in endpoints:
+        method, path, body = ENDPOINTS[name]
+        path = path.format(day=day)
+        # Warm caches, the conflict index and the hashing pool before timing
+        await measure(client, method, path, body, min(requests, concurrency * 2), concurrency)
+        results[name] = await measure(client, method, path, body, requests, concurrency)
+        print(f"{name:>20}: {results[name]}")
+    return results
+
+
+async def run_in_process(endpoints, requests, concurrency, day):
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_endpoints(client, endpoints, requests, concurrency, day)
+
+
+async def run_over_uvicorn(endpoints, requests, concurrency, day, db_path):
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LAB_SCHEDULER_DB": db_path},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            await _wait_until_healthy(client, server)
+            return await run_endpoints(client, endpoints, requests, concurrency, day)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def _wait_until_healthy(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited before becoming healthy")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not become healthy in time")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``: p95/p99 latency or throughput
+    worse than the baseline by more than ``tolerance``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput_rps {previous['throughput_rps']} -> {current['throughput_rps']}"
+            )
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: errors {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the IT Lab Scheduler API.")
+    parser.add_argument("--mode", choices=("in-process", "uvicorn"), default="in-process")
+    parser.add_argument("--db", help="benchmark database (default: a temporary file)")
+    parser.add_argument("--reuse-db", action="store_true", help="skip seeding and use --db as is")
+    parser.add_argument("--labs", type=int, default=20)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--reservations", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="lab-bench-"), "bench.db")
+    # app.database.pool reads LAB_SCHEDULER_DB when first imported, by seed() or app.main
+    os.environ["LAB_SCHEDULER_DB"] = db_path
+    if args.reuse_db:
+        dataset = {"path": db_path, "reused": True}
+    else:
+        dataset = seed(db_path, labs=args.labs, users=args.users, reservations=args.reservations)
+        print(f"Seeded {dataset}")
+    day = dataset.get("first_day", "2030-01-07")
+
+    if args.mode == "in-process":
+        results = asyncio.run(run_in_process(args.endpoints, args.requests, args.concurrency, day))
+    else:
+        results = asyncio.run(run_over_uvicorn(args.endpoints, args.requests, args.concurrency, day, db_path))
+
+    report = {
+        "meta": {
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "dataset": dataset,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "endpoints": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["endpoints"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressions against the baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Seed a benchmark database with a synthetic dataset.
+
+Usage: python -m benchmarks.seed /tmp/bench.db --reservations 200000 [--labs 40] [--users 500]
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "Backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Every seeded user shares this password, so login can be benchmarked
+BENCH_PASSWORD = "bench-password"
+SEED_START = datetime(2030, 1, 7, 8, 0)
+CLOSING_HOUR = 20
+SLOT_HOURS = (1, 2, 3)
+STATUS_WEIGHTS = (("approved", 70), ("pending", 20), ("declined", 10))
+INSERT_BATCH = 10000
+
+
+def seed(path: str, labs: int = 20, users: int = 200, courses: int = 50,
+         reservations: int = 50000, seed_value: int = 0) -> dict:
+    """Create a migrated database at ``path`` holding the requested dataset.
+
+    Reservations are laid out lab by lab as non-overlapping weekday slots
+    between 08:00 and 20:00, so the conflict index loads them all as it
+    would in production.
+    """
+    from app.auth.utils import password_hasher
+    from app.database.schema import migrate
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(path + suffix).unlink(missing_ok=True)
+    migrate(path)
+
+    rng = random.Random(seed_value)
+    started = time.perf_counter()
+    hashed = password_hasher.hash_sync(BENCH_PASSWORD)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    conn.executemany(
+        "INSERT INTO users (username, email, hashed_password, full_name, role) VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"user{i}", f"user{i}@bench.test", hashed, f"Bench User {i}",
+             "admin" if i == 0 else "instructor" if i % 5 else "student")
+            for i in range(users)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO labs (name, description, capacity, equipment) VALUES (?, ?, ?, ?)",
+        [
+            (f"Lab {i:03d}", "Benchmark lab", rng.choice((20, 25, 30, 40, 60)),
+             rng.choice(("PCs, Projector", "Macs, Projector", "PCs, Smart Board", "PCs, VR Equipment")))
+            for i in range(labs)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO courses (code, name, description, credits) VALUES (?, ?, ?, ?)",
+        [(f"BN{i:04d}", f"Benchmark Course {i}", None, rng.choice((3, 4))) for i in range(courses)]
+    )
+    conn.commit()
+
+    instructor_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'instructor'")]
+    lab_ids = [row[0] for row in conn.execute("SELECT id FROM labs")]
+    course_ids = [row[0] for row in conn.execute("SELECT id FROM courses")]
+    statuses = [status for status, weight in STATUS_WEIGHTS for _ in range(weight)]
+
+    # Each lab has its own clock that only moves forward
+    clocks = {lab_id: SEED_START for lab_id in lab_ids}
+    batch = []
+    for i in range(reservations):
+        lab_id = lab_ids[i % len(lab_ids)]
+        start = clocks[lab_id] + timedelta(minutes=rng.choice((0, 0, 30, 60)))
+        hours = rng.choice(SLOT_HOURS)
+        if start + timedelta(hours=hours) > start.replace(hour=CLOSING_HOUR, minute=0) or start.weekday() >= 5:
+            start = _next_open_day(start)
+        end = start + timedelta(hours=hours)
+        clocks[lab_id] = end
+        batch.append((
+            rng.choice(instructor_ids), lab_id, rng.choice(course_ids), f"S{i % 9 + 1}",
+            start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"),
+            hours, None, rng.choice(statuses),
+        ))
+        if len(batch) >= INSERT_BATCH:
+            _insert_reservations(conn, batch)
+            batch = []
+    if batch:
+        _insert_reservations(conn, batch)
+    conn.execute("ANALYZE")
+    conn.close()
+    password_hasher.close()
+
+    return {
+        "path": path,
+        "labs": labs,
+        "users": users,
+        "courses": courses,
+        "reservations": reservations,
+        "first_day": SEED_START.date().isoformat(),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def _next_open_day(moment: datetime) -> datetime:
+    day = moment.date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, SEED_START.time())
+
+
+def _insert_reservations(conn, rows):
+    conn.executemany('''
+        INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, notes, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a synthetic IT Lab Scheduler database.")
+    parser.add_argument("path")
+    parser.add_argument("--labs", type=int, default=20)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--reservations", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(seed(args.path, args.labs, args.users, args.courses, args.reservations, args.seed))
+
+
+if __name__ == "__main__":
+    main()
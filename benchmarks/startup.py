@@ -0,0 +1,97 @@
+"""Cold-start benchmark: how long a fresh worker process takes to import the
+app and finish its startup events, against an already migrated database.
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --baseline benchmarks/startup-baseline.json   # exit 1 on regression
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .seed import BACKEND_DIR
+
+DEFAULT_TOLERANCE = 0.25
+
+# Runs in the child: import, then the startup half of the lifespan
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(startup())
+print(json.dumps({
+    "import_s": imported - started,
+    "ready_s": ready - started,
+    "modules": sorted(name for name in ("alembic", "passlib") if name in sys.modules),
+}))
+"""
+
+
+def probe(db_path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LAB_SCHEDULER_DB": db_path},
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(runs: int, db_path: str) -> dict:
+    samples = [probe(db_path) for _ in range(runs)]
+    return {
+        "runs": runs,
+        "import_ms": round(statistics.median(s["import_s"] for s in samples) * 1000, 1),
+        "ready_ms": round(statistics.median(s["ready_s"] for s in samples) * 1000, 1),
+        "heavy_modules_loaded": samples[-1]["modules"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark IT Lab Scheduler worker start-up.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="lab-startup-"), "startup.db")
+    # The first start migrates; every later worker start should find the stamp current
+    first = probe(db_path)
+    results = measure(args.runs, db_path)
+    results["first_ready_ms"] = round(first["ready_s"] * 1000, 1)
+    print(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = [
+            f"{metric}: {baseline[metric]} -> {results[metric]}"
+            for metric in ("import_ms", "ready_ms")
+            if metric in baseline and results[metric] > baseline[metric] * (1 + args.tolerance)
+        ]
+        if results["heavy_modules_loaded"]:
+            regressions.append(f"warm start loaded {', '.join(results['heavy_modules_loaded'])}")
+        if regressions:
+            print("Start-up regressions against the baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
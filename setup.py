@@ -11,24 +11,21 @@ def setup_database():
     backend_dir = Path("backend")
     backend_dir.mkdir(exist_ok=True)
     
-    # Create database directory
-    db_path = backend_dir / "it_lab_scheduler.db"
-    
     print("Setting up IT Lab Scheduler Database...")
     
     # Import and create tables
     sys.path.insert(0, str(backend_dir))
     
     try:
-        from app.database.session import engine
         from app.database import models
+        from app.database.schema import migrate
         from app.database.crud import create_user, get_user_by_username
         from app.schemas.user import UserCreate
         from app.database.models import UserRole
         
-        # Create tables
-        models.Base.metadata.create_all(bind=engine)
-        print("✓ Database tables created")
+        # Create tables (the app's own migration chain, same database file as the API)
+        migrate()
+        print("✓ Database migrated")
         
         # Create default data
         from app.database.session import SessionLocal
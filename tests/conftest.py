@@ -0,0 +1,43 @@
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "Backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# The app opens LAB_SCHEDULER_DB when first imported; keep tests off the real database
+TEST_DIR = Path(tempfile.mkdtemp(prefix="lab-scheduler-tests-"))
+os.environ["LAB_SCHEDULER_DB"] = str(TEST_DIR / "lab_scheduler.db")
+os.environ["EXPORT_DIR"] = str(TEST_DIR / "exports")
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """A connection to a fresh database upgraded through the whole migration chain."""
+    from app.database.schema import migrate
+
+    path = tmp_path / "lab_scheduler.db"
+    migrate(str(path))
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient for the app on the seeded test database, with authentication bypassed."""
+    from fastapi.testclient import TestClient
+    from app.auth.security import get_current_active_user
+    from app.database import bootstrap
+    from app.main import app
+
+    bootstrap.ensure_schema()
+    bootstrap.seed_defaults()
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def authenticate(client):
+    """Resolve a bearer token through get_current_user on its own session, starting from an empty cache."""
+    from app.auth.cache import principal_cache
+    from app.auth.security import get_current_user
+    from app.database.session import SessionLocal
+
+    principal_cache.clear()
+
+    def run(token):
+        db = SessionLocal()
+        try:
+            return asyncio.run(get_current_user(token, db))
+        finally:
+            db.close()
+
+    yield run
+    principal_cache.clear()
+
+
+def _token(username="instructor1"):
+    from app.auth.security import create_access_token
+
+    return create_access_token({"sub": username})
+
+
+def test_miss_loads_the_user_off_the_event_loop_then_hits(authenticate, monkeypatch):
+    from app.auth.cache import principal_cache
+    from app.database import crud
+
+    threads = []
+    load = crud.get_user_by_username
+
+    def recording_load(db, username):
+        threads.append(threading.current_thread())
+        return load(db, username=username)
+
+    monkeypatch.setattr(crud, "get_user_by_username", recording_load)
+    token = _token()
+    hits, misses = principal_cache.hits, principal_cache.misses
+
+    first = authenticate(token)
+    second = authenticate(token)
+
+    assert first.username == second.username == "instructor1"
+    assert (principal_cache.hits - hits, principal_cache.misses - misses) == (1, 1)
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+
+def test_unknown_user_is_rejected_and_not_cached(authenticate):
+    from fastapi import HTTPException
+    from app.auth.cache import principal_cache
+
+    with pytest.raises(HTTPException) as error:
+        authenticate(_token("nobody"))
+    assert error.value.status_code == 401
+    assert len(principal_cache) == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    from app.auth import cache
+
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    principals = cache.PrincipalCache(ttl=30, max_size=8)
+
+    principals.put("instructor1", 5000, "principal")
+    now[0] += 29
+    assert principals.get("instructor1", 5000) == "principal"
+    now[0] += 1
+    assert principals.get("instructor1", 5000) is None
+    assert len(principals) == 0
+
+
+def test_entries_never_outlive_the_token(monkeypatch):
+    from app.auth import cache
+
+    monkeypatch.setattr(cache.time, "time", lambda: 1000.0)
+    principals = cache.PrincipalCache(ttl=300, max_size=8)
+
+    principals.put("instructor1", 1000, "principal")
+    assert principals.get("instructor1", 1000) is None
+
+
+def test_update_user_invalidates_cached_principals(authenticate):
+    from app.auth.cache import principal_cache
+    from app.database import crud
+    from app.database.session import SessionLocal
+    from app.schemas.user import UserUpdate
+
+    token = _token()
+    authenticate(token)
+    assert len(principal_cache) == 1
+
+    db = SessionLocal()
+    try:
+        crud.update_user(db, 2, UserUpdate(is_active=True))
+    finally:
+        db.close()
+    assert len(principal_cache) == 0
+
+    misses = principal_cache.misses
+    authenticate(token)
+    assert principal_cache.misses == misses + 1
+
+
+def test_hash_pool_hashes_and_verifies_in_worker_processes():
+    from app.auth.security import get_password_hash_async, verify_password_async
+    from app.auth.utils import password_hasher
+
+    async def roundtrip():
+        hashed = await get_password_hash_async("correct horse")
+        return hashed, await verify_password_async("correct horse", hashed), \
+            await verify_password_async("wrong horse", hashed)
+
+    completed = password_hasher.stats()["completed"]
+    hashed, right, wrong = asyncio.run(roundtrip())
+
+    assert hashed.startswith("$2") and right and not wrong
+    stats = password_hasher.stats()
+    assert stats["completed"] == completed + 3
+    assert stats["in_flight"] == stats["queue_depth"] == 0
+    assert stats["max_hash_ms"] > 0
+
+
+def test_a_full_hash_pool_rejects_immediately():
+    from app.auth.utils import HashPoolSaturated, PasswordHashPool, _timed_hash
+
+    pool = PasswordHashPool(workers=1, queue_size=0)
+    try:
+        running = pool._submit(_timed_hash, "secret")
+        with pytest.raises(HashPoolSaturated):
+            pool.hash_sync("another")
+        assert pool.stats()["rejected"] == 1
+        assert pool.stats()["in_flight"] == 1
+        running.result()
+    finally:
+        pool.close()
+    # Done callbacks have all run once the pool is shut down
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_login_answers_429_with_retry_after_when_hashing_is_saturated(client, monkeypatch):
+    from app.auth import security
+    from app.auth.utils import HashPoolSaturated
+
+    async def saturated(plain_password, hashed_password):
+        raise HashPoolSaturated("Password hashing queue is full")
+
+    monkeypatch.setattr(security.password_hasher, "verify", saturated)
+    response = client.post("/api/v1/login", json={"username": "instructor1", "password": "instructor123"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_verifies_through_the_hash_pool(client):
+    ok = client.post("/api/v1/login", json={"username": "instructor1", "password": "instructor123"})
+    wrong = client.post("/api/v1/login", json={"username": "instructor1", "password": "nope"})
+
+    assert ok.status_code == 200 and ok.json()["access_token"]
+    assert wrong.status_code == 401
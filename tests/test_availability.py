@@ -0,0 +1,104 @@
+from datetime import date, datetime
+
+import pytest
+
+DAY = date(2030, 6, 3)
+
+
+@pytest.fixture
+def availability():
+    from app.utils.availability import AvailabilityMap
+    from app.utils.conflicts import ReservationIndex
+
+    index = ReservationIndex()
+    index.loaded = True
+    return index, AvailabilityMap(index)
+
+
+def _book(index, reservation_id, lab_id, start, end):
+    from app.utils.validators import to_timestamp
+
+    index.add(reservation_id, lab_id, to_timestamp(start), to_timestamp(end))
+
+
+def test_bookings_at_midnight_fill_the_first_and_last_slots(availability):
+    from app.utils.availability import SLOTS_PER_DAY
+
+    index, slots = availability
+    _book(index, 1, 1, datetime(2030, 6, 3, 0, 0), datetime(2030, 6, 3, 0, 15))
+    _book(index, 2, 1, datetime(2030, 6, 3, 23, 45), datetime(2030, 6, 4, 0, 0))
+
+    mask = slots.day_mask(1, DAY)
+    assert mask == 1 | 1 << (SLOTS_PER_DAY - 1)
+    assert slots.free_slots(1, DAY) == [("00:15", "23:45")]
+    # Ending exactly at midnight leaves the next day untouched
+    assert slots.day_mask(1, date(2030, 6, 4)) == 0
+    assert slots.free_slots(1, date(2030, 6, 4)) == [("00:00", "24:00")]
+
+
+def test_overnight_booking_is_clipped_to_each_day(availability):
+    index, slots = availability
+    _book(index, 1, 1, datetime(2030, 6, 2, 22, 0), datetime(2030, 6, 3, 1, 0))
+
+    assert slots.free_slots(1, date(2030, 6, 2)) == [("00:00", "22:00")]
+    assert slots.free_slots(1, DAY) == [("01:00", "24:00")]
+
+
+def test_partial_slots_round_outwards(availability):
+    index, slots = availability
+    _book(index, 1, 1, datetime(2030, 6, 3, 9, 10), datetime(2030, 6, 3, 9, 50))
+
+    assert slots.free_slots(1, DAY) == [("00:00", "09:00"), ("10:00", "24:00")]
+
+
+def test_windows_touching_a_booking_edge_are_free(availability):
+    from app.utils.availability import parse_clock
+
+    index, slots = availability
+    labs = [{"id": 1}, {"id": 2}]
+    _book(index, 1, 1, datetime(2030, 6, 3, 9, 0), datetime(2030, 6, 3, 10, 0))
+
+    def free(start, end):
+        return [lab["id"] for lab in slots.free_labs(labs, [DAY], parse_clock(start), parse_clock(end))]
+
+    assert free("08:00", "09:00") == [1, 2]
+    assert free("10:00", "11:00") == [1, 2]
+    assert free("08:00", "09:15") == [2]
+    assert free("09:45", "10:30") == [2]
+    assert free("00:00", "24:00") == [2]
+
+
+def test_changes_invalidate_cached_days(availability):
+    index, slots = availability
+    _book(index, 1, 1, datetime(2030, 6, 3, 9, 0), datetime(2030, 6, 3, 10, 0))
+    assert slots.day_mask(1, DAY) != 0
+
+    index.discard(1)
+    assert slots.day_mask(1, DAY) == 0
+    _book(index, 2, 1, datetime(2030, 6, 2, 23, 0), datetime(2030, 6, 3, 0, 30))
+    assert slots.free_slots(1, DAY) == [("00:30", "24:00")]
+
+
+@pytest.mark.parametrize("value, minutes", [("00:00", 0), ("08:30", 510), ("24:00", 1440)])
+def test_parse_clock(value, minutes):
+    from app.utils.availability import parse_clock
+
+    assert parse_clock(value) == minutes
+
+
+@pytest.mark.parametrize("params", [
+    {"start_date": "2030-06-03", "start": "10:00", "end": "10:00"},
+    {"start_date": "2030-06-03", "start": "25:00", "end": "26:00"},
+    {"start_date": "2030-06-03", "end_date": "2030-06-02", "start": "09:00", "end": "10:00"},
+])
+def test_invalid_queries_are_rejected(client, params):
+    assert client.get("/api/v1/availability", params=params).status_code == 400
+
+
+def test_whole_day_query_lists_free_slots(client):
+    response = client.get("/api/v1/availability",
+                          params={"start_date": "2030-06-03", "start": "00:00", "end": "24:00"})
+
+    assert response.status_code == 200
+    for lab in response.json()["labs"]:
+        assert lab["free_slots"] == [["00:00", "24:00"]]
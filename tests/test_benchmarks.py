@@ -0,0 +1,76 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_seed_lays_out_non_overlapping_weekday_slots(tmp_path):
+    from benchmarks.seed import seed
+
+    path = str(tmp_path / "bench.db")
+    dataset = seed(path, labs=3, users=10, courses=5, reservations=400)
+
+    conn = sqlite3.connect(path)
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ("labs", "users", "courses", "reservations")]
+    overlaps = conn.execute('''
+        SELECT COUNT(*) FROM reservations a JOIN reservations b
+          ON a.lab_id = b.lab_id AND a.id < b.id AND a.start_time < b.end_time AND b.start_time < a.end_time
+    ''').fetchone()[0]
+    slots = conn.execute("SELECT start_time, end_time FROM reservations").fetchall()
+    conn.close()
+
+    assert counts == [3, 10, 5, 400]
+    assert dataset["reservations"] == 400 and dataset["first_day"] == "2030-01-07"
+    assert overlaps == 0
+    for start_time, end_time in slots:
+        start, end = datetime.fromisoformat(start_time), datetime.fromisoformat(end_time)
+        assert start.weekday() < 5 and start.date() == end.date()
+        assert 8 <= start.hour and (end.hour, end.minute) <= (20, 0)
+
+
+def test_benchmark_smoke_run(tmp_path):
+    output = tmp_path / "results.json"
+    env = {**os.environ, "LAB_SCHEDULER_DB": str(tmp_path / "unused.db")}
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--db", str(tmp_path / "bench.db"),
+         "--labs", "2", "--users", "10", "--reservations", "200", "--requests", "5", "--concurrency", "2",
+         "--endpoints", "labs", "reservations", "dashboard", "availability", "--output", str(output)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(output.read_text())
+    assert report["meta"]["dataset"]["reservations"] == 200
+    assert set(report["endpoints"]) == {"labs", "reservations", "dashboard", "availability"}
+    for result in report["endpoints"].values():
+        assert result["requests"] == 5 and result["errors"] == 0
+        assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_percentile_is_nearest_rank():
+    from benchmarks.run import percentile
+
+    ordered = [float(i) for i in range(1, 101)]
+    assert (percentile(ordered, 0.5), percentile(ordered, 0.95), percentile(ordered, 0.99)) == (50.0, 95.0, 99.0)
+    assert percentile([3.0], 0.99) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_compare_reports_regressions_beyond_the_tolerance():
+    from benchmarks.run import compare
+
+    baseline = {"labs": {"p95_ms": 10.0, "p99_ms": 20.0, "throughput_rps": 100.0, "errors": 0}}
+    within = {"labs": {"p95_ms": 12.0, "p99_ms": 24.0, "throughput_rps": 80.0, "errors": 0},
+              "new_endpoint": {"p95_ms": 1.0, "p99_ms": 1.0, "throughput_rps": 1.0, "errors": 0}}
+    worse = {"labs": {"p95_ms": 13.0, "p99_ms": 20.0, "throughput_rps": 70.0, "errors": 1}}
+
+    assert compare(within, baseline, 0.25) == []
+    assert compare(worse, baseline, 0.25) == [
+        "labs: p95_ms 10.0 -> 13.0", "labs: throughput_rps 100.0 -> 70.0", "labs: errors 0 -> 1",
+    ]
@@ -0,0 +1,78 @@
+import pytest
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@pytest.fixture
+def index():
+    from app.utils.conflicts import ReservationIndex
+
+    index = ReservationIndex()
+    index.loaded = True
+    return index
+
+
+def test_overlapping_bookings_conflict(index):
+    from app.utils.conflicts import ReservationConflict
+
+    index.add(1, 1, 9 * HOUR, 11 * HOUR)
+    index.add(2, 1, 13 * HOUR, 14 * HOUR)
+
+    assert index.find_conflicts(1, 10 * HOUR, 12 * HOUR) == [1]
+    assert index.find_conflicts(1, 8 * HOUR, 15 * HOUR) == [1, 2]
+    assert index.find_conflicts(1, 9 * HOUR + 1, 9 * HOUR + 2) == [1]
+    assert index.find_conflicts(1, 10 * HOUR, 12 * HOUR, ignore_id=1) == []
+    with pytest.raises(ReservationConflict) as error:
+        index.check(1, 10 * HOUR, 12 * HOUR)
+    assert error.value.conflicting_ids == [1]
+
+
+def test_adjacent_bookings_do_not_conflict(index):
+    index.add(1, 1, 9 * HOUR, 10 * HOUR)
+
+    assert index.find_conflicts(1, 10 * HOUR, 11 * HOUR) == []
+    assert index.find_conflicts(1, 8 * HOUR, 9 * HOUR) == []
+    index.check(1, 10 * HOUR, 11 * HOUR)
+
+
+def test_removed_bookings_free_their_slot(index):
+    index.add(1, 1, 9 * HOUR, 10 * HOUR)
+    index.add(2, 1, 9 * HOUR, 10 * HOUR)
+
+    index.discard(1)
+    assert index.find_conflicts(1, 9 * HOUR, 10 * HOUR) == [2]
+    index.apply_status(2, 1, 9 * HOUR, 10 * HOUR, "rejected")
+    assert index.find_conflicts(1, 9 * HOUR, 10 * HOUR) == []
+    # Discarding an unknown id is a no-op
+    index.discard(3)
+
+
+def test_labs_are_isolated(index):
+    index.add(1, 1, 9 * HOUR, 10 * HOUR)
+
+    assert index.find_conflicts(2, 9 * HOUR, 10 * HOUR) == []
+    index.add(2, 2, 9 * HOUR, 10 * HOUR)
+    assert index.find_conflicts(1, 9 * HOUR, 10 * HOUR) == [1]
+    assert index.find_conflicts(2, 9 * HOUR, 10 * HOUR) == [2]
+
+
+def test_max_span_shrinks_after_the_longest_booking_leaves():
+    from app.utils.conflicts import LabIntervals
+
+    intervals = LabIntervals()
+    intervals.add(1, 0, 30 * DAY)
+    intervals.add(2, 40 * DAY, 40 * DAY + HOUR)
+    intervals.add(3, 50 * DAY, 50 * DAY + 2 * HOUR)
+    assert intervals.max_span == 30 * DAY
+
+    intervals.remove(1, 0)
+    assert intervals.max_span == 2 * HOUR
+    intervals.add(4, 60 * DAY, 60 * DAY + 3 * HOUR)
+    assert intervals.max_span == 3 * HOUR
+    assert intervals.overlapping(50 * DAY + HOUR, 60 * DAY + HOUR) == [3, 4]
+
+    intervals.remove(3, 50 * DAY)
+    intervals.remove(4, 60 * DAY)
+    intervals.remove(2, 40 * DAY)
+    assert len(intervals) == 0 and intervals.max_span == 0
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def counter_db(migrated_db):
+    # Autocommit, as on the pool's connections; counters.reconcile opens its own transaction
+    migrated_db.isolation_level = None
+    migrated_db.execute("INSERT INTO users (id, username, email, hashed_password, full_name, role) "
+                        "VALUES (1, 'i', 'i@x', '-', 'Instructor', 'instructor')")
+    migrated_db.execute("INSERT INTO labs (id, name, capacity) VALUES (1, 'Lab A', 30)")
+    migrated_db.execute("INSERT INTO courses (id, code, name) VALUES (1, 'IT101', 'Intro')")
+    return migrated_db
+
+
+def _book(conn, status="pending"):
+    return conn.execute(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (1, 1, 1, 'A', '2030-01-07 09:00:00', '2030-01-07 10:00:00', 1, ?)", (status,)
+    ).lastrowid
+
+
+def _exact(conn):
+    from app.database import counters
+
+    return {name: conn.execute(query).fetchone()[0] for name, query in counters.COUNTERS.items()}
+
+
+def test_triggers_keep_counters_exact(counter_db):
+    from app.database import counters
+
+    assert counters.read(counter_db) == _exact(counter_db) == \
+        {"total_labs": 1, "total_sessions": 0, "pending_requests": 0, "total_users": 1}
+
+    first, second = _book(counter_db), _book(counter_db)
+    _book(counter_db, status="approved")
+    assert counters.read(counter_db) == _exact(counter_db)
+    assert counters.read(counter_db)["pending_requests"] == 2
+
+    counter_db.execute("UPDATE reservations SET status = 'approved' WHERE id = ?", (first,))
+    counter_db.execute("UPDATE reservations SET status = 'pending' WHERE id = ?", (first,))
+    counter_db.execute("UPDATE reservations SET status = 'rejected' WHERE id = ?", (second,))
+    assert counters.read(counter_db) == _exact(counter_db)
+    assert counters.read(counter_db)["pending_requests"] == 1
+
+    counter_db.execute("DELETE FROM reservations WHERE id = ?", (first,))
+    counter_db.execute("UPDATE labs SET is_active = 0 WHERE id = 1")
+    counter_db.execute("UPDATE users SET is_active = 0 WHERE id = 1")
+    assert counters.read(counter_db) == _exact(counter_db) == \
+        {"total_labs": 0, "total_sessions": 2, "pending_requests": 0, "total_users": 0}
+
+
+def test_reconcile_corrects_injected_drift(counter_db):
+    from app.database import counters
+
+    _book(counter_db)
+    counter_db.execute("UPDATE dashboard_counters SET value = value + 5 WHERE name = 'total_sessions'")
+    counter_db.execute("UPDATE dashboard_counters SET value = -1 WHERE name = 'pending_requests'")
+
+    assert counters.reconcile(counter_db) == {"total_sessions": -5, "pending_requests": 2}
+    assert counters.read(counter_db) == _exact(counter_db)
+    assert counters.reconcile(counter_db) == {}
+
+
+def test_reconcile_task_survives_failures(client, monkeypatch, caplog):
+    from app import main
+    from app.database import counters
+
+    outcomes = [sqlite3.OperationalError("database is locked"), {"total_sessions": 1}, {}]
+    calls = []
+
+    async def run(fn):
+        calls.append(fn)
+        outcome = outcomes[len(calls) - 1] if len(calls) <= len(outcomes) else {}
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(counters, "RECONCILE_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(main.db, "run", run)
+
+    async def drive():
+        task = asyncio.create_task(main._reconcile_counters_periodically())
+        while len(calls) < len(outcomes):
+            await asyncio.sleep(0)
+        assert not task.done()
+        task.cancel()
+
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        asyncio.run(drive())
+
+    assert calls == [counters.reconcile] * len(outcomes)
+    records = [record for record in caplog.records if record.name == "app.main"]
+    assert [record.getMessage() for record in records] == [
+        "Dashboard counter reconciliation failed", "Dashboard counters corrected: {'total_sessions': 1}",
+    ]
+    assert records[0].exc_info is not None
@@ -0,0 +1,75 @@
+import gzip
+import re
+
+import pytest
+
+NOTIFICATIONS_JS = "/static/js/notifications.js"
+
+
+def _shell_asset_url(client, path):
+    html = client.get("/app", headers={"Accept-Encoding": "identity"}).text
+    match = re.search(rf'src="({re.escape(path)}\?v=[0-9a-f]+)"', html)
+    assert match, f"{path} is not referenced with a version"
+    return match.group(1)
+
+
+def test_shell_links_static_files_by_version(client):
+    from app.frontend import asset_cache
+
+    assert _shell_asset_url(client, NOTIFICATIONS_JS) == asset_cache.url(NOTIFICATIONS_JS)
+    assert asset_cache.url("/static/missing.js") == "/static/missing.js"
+
+
+def test_versioned_url_is_immutable_and_bare_url_revalidates(client):
+    from app.frontend import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+    versioned = client.get(_shell_asset_url(client, NOTIFICATIONS_JS))
+    assert versioned.status_code == 200
+    assert versioned.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    bare = client.get(NOTIFICATIONS_JS)
+    assert bare.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert client.get(f"{NOTIFICATIONS_JS}?v=stale").headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert client.get("/app").headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+
+@pytest.mark.parametrize("path", ["/app", NOTIFICATIONS_JS])
+def test_matching_etag_is_not_modified(client, path):
+    etag = client.get(path).headers["etag"]
+
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_gzip_is_served_when_accepted(client):
+    plain = client.get(NOTIFICATIONS_JS, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    # Read the raw body so the client does not undo the encoding
+    with client.stream("GET", NOTIFICATIONS_JS, headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        body = b"".join(response.iter_raw())
+    assert gzip.decompress(body) == plain.content
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", "br"),
+    ("gzip, br;q=0", "gzip"),
+    ("gzip;q=0.5", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_encoding_negotiation(header, expected):
+    from app.frontend import _negotiate
+
+    assert _negotiate(header, {"br": b"", "gzip": b""}) == expected
+
+
+def test_small_assets_are_not_compressed():
+    from app.frontend import MIN_COMPRESS_SIZE, AssetCache
+
+    cache = AssetCache()
+    assert cache.add("/static/tiny.css", b"a" * (MIN_COMPRESS_SIZE - 1)).encodings == {}
+    assert "gzip" in cache.add("/static/big.css", b"a" * MIN_COMPRESS_SIZE).encodings
@@ -0,0 +1,158 @@
+import json
+import sqlite3
+
+import pytest
+
+IMPORT = "/api/v1/reservations/import"
+CSV_HEADER = "lab_id,course_id,section,start_time,end_time\n"
+
+
+def _csv(*rows):
+    return CSV_HEADER + "".join(",".join(map(str, row)) + "\n" for row in rows)
+
+
+def _import(client, body, **params):
+    response = client.post(IMPORT, params=params, content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _statuses(report):
+    return [result["status"] for result in report["results"]]
+
+
+def test_csv_records_split_across_chunks():
+    from app.utils.importer import RecordParser
+
+    parser = RecordParser("csv")
+    body = (CSV_HEADER + '1,1,"A, morning",2028-05-01 09:00,2028-05-01 10:00\n'
+            '2,1,"multi\nline",2028-05-01 09:00,2028-05-01 10:00').encode()
+    records = []
+    for i in range(0, len(body), 7):
+        records.extend(parser.feed(body[i:i + 7]))
+    records.extend(parser.close())
+
+    assert [record["section"] for record in records] == ["A, morning", "multi\nline"]
+    assert records[1]["lab_id"] == "2"
+
+
+def test_json_array_and_lines_split_across_chunks():
+    from app.utils.importer import RecordParser
+
+    record = {"lab_id": 1, "course_id": 1, "section": "A", "start_time": "2028-05-01 09:00",
+              "end_time": "2028-05-01 10:00"}
+    for body in (json.dumps([record, record]), json.dumps(record) + "\n" + json.dumps(record)):
+        parser = RecordParser("json")
+        records = parser.feed(body[:15].encode()) + parser.feed(body[15:].encode()) + parser.close()
+        assert records == [record, record]
+
+    parser = RecordParser("json")
+    parser.feed(b'[{"lab_id": 1')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_malformed_json_records_are_reported_in_place_without_buffering_the_rest():
+    from app.utils.importer import MalformedRecord, RecordParser
+
+    record = json.dumps({"lab_id": 1, "course_id": 1, "section": "A"})
+    parser = RecordParser("json")
+    # The first record is complete but invalid; its string holds a quoted bracket
+    records = parser.feed(('[{"notes": "\\"}", "lab_id": tru}, ' + record).encode())
+    for _ in range(50):
+        records += parser.feed((", " + record).encode())
+        assert len(parser._buffer) < 2 * len(record)
+    records += parser.feed(b', "not an object", {"section": "a \\"} b"}]') + parser.close()
+
+    assert isinstance(records[0], MalformedRecord) and records[0].detail.startswith("Malformed JSON")
+    assert records[1:52] == [json.loads(record)] * 51
+    assert records[52:] == ["not an object", {"section": 'a "} b'}]
+
+
+def test_an_unfinished_record_cannot_grow_past_the_limit():
+    from app.utils.importer import MAX_RECORD_SIZE, RecordParser
+
+    for fmt, start in (("json", b'{"notes": "'), ("csv", b'lab_id,notes\n1,"')):
+        parser = RecordParser(fmt)
+        parser.feed(start)
+        with pytest.raises(ValueError, match="Record longer than"):
+            parser.feed(b"x" * MAX_RECORD_SIZE)
+
+
+def test_bad_input_after_a_full_batch_reports_the_rows_already_written(client):
+    from app.utils.importer import BATCH_SIZE
+
+    rows = [json.dumps({"lab_id": 2, "course_id": 1, "section": "J",
+                        "start_time": f"2028-07-{i // 24 + 1:02d} {i % 24:02d}:00:00",
+                        "end_time": f"2028-07-{i // 24 + 1:02d} {i % 24:02d}:30:00"})
+            for i in range(BATCH_SIZE + 1)]
+    body = "\n".join(rows[:BATCH_SIZE] + ['{"lab_id": 2,, }', rows[BATCH_SIZE], '{"lab_id": 2, "section": "'])
+
+    response = client.post(IMPORT, content=body, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["failed"]) == (BATCH_SIZE + 1, 2)
+    assert _statuses(report) == ["created"] * BATCH_SIZE + ["error", "created", "error"]
+    assert report["results"][BATCH_SIZE]["detail"].startswith("Malformed JSON: ")
+    assert report["results"][-1]["detail"].startswith("Malformed JSON near: ")
+
+
+def test_each_row_reports_its_own_outcome(client):
+    booked = client.post("/api/v1/reservations", json={
+        "lab_id": 3, "course_id": 1, "section": "X", "duration": 1,
+        "start_time": "2028-05-02 09:00:00", "end_time": "2028-05-02 10:00:00",
+    })
+    assert booked.status_code == 200
+
+    report = _import(client, _csv(
+        (3, 1, "A", "2028-05-02 10:00:00", "2028-05-02 11:00:00"),
+        (3, 1, "B", "2028-05-02 10:30:00", "2028-05-02 11:30:00"),
+        (3, 1, "C", "2028-05-02 08:00:00", "2028-05-02 09:30:00"),
+        (3, 1, "", "2028-05-02 12:00:00", "2028-05-02 13:00:00"),
+        (999, 1, "E", "2028-05-02 12:00:00", "2028-05-02 13:00:00"),
+        (3, 1, "F", "2028-05-02 14:00:00", "2028-05-02 13:00:00"),
+    ))
+
+    assert (report["created"], report["failed"]) == (1, 5)
+    assert _statuses(report) == ["created", "conflict", "conflict", "error", "error", "error"]
+    results = report["results"]
+    assert results[1]["detail"] == "Overlaps row(s) 1 of this import"
+    assert str(booked.json()["reservation_id"]) in results[2]["detail"]
+    assert results[3]["detail"] == "Missing field(s): section"
+    assert results[4]["detail"] == "Unknown lab id 999"
+
+    # The created row is now indexed: importing it again conflicts
+    again = _import(client, _csv((3, 1, "A", "2028-05-02 10:00:00", "2028-05-02 11:00:00")))
+    assert _statuses(again) == ["conflict"]
+
+
+def test_a_failed_batch_is_rolled_back_and_leaves_the_index_untouched(client):
+    from app.database.pool import DATABASE_PATH
+
+    rows = _csv(
+        (4, 1, "ok", "2028-05-03 09:00:00", "2028-05-03 10:00:00"),
+        (4, 1, "BOOM", "2028-05-03 11:00:00", "2028-05-03 12:00:00"),
+    )
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute("CREATE TRIGGER test_import_failure BEFORE INSERT ON reservations "
+                 "WHEN NEW.section = 'BOOM' BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    conn.commit()
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            client.post(IMPORT, content=rows, headers={"Content-Type": "text/csv"})
+        assert conn.execute("SELECT COUNT(*) FROM reservations WHERE start_time LIKE '2028-05-03%'").fetchone()[0] == 0
+    finally:
+        conn.execute("DROP TRIGGER test_import_failure")
+        conn.commit()
+        conn.close()
+
+    report = _import(client, rows)
+    assert _statuses(report) == ["created", "created"]
+
+
+def test_rejected_status_values(client):
+    body = "lab_id,course_id,section,start_time,end_time,status\n4,1,A,2028-05-04 09:00,2028-05-04 10:00,declined\n"
+    report = _import(client, body)
+    assert report["results"][0]["detail"] == "Invalid status: 'declined'"
+    assert client.post(IMPORT, params={"status": "declined"}, content=body).status_code == 422
@@ -0,0 +1,118 @@
+import sqlite3
+
+
+def test_labs_are_served_from_cache_with_etag(client):
+    first = client.get("/api/v1/labs")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    revalidated = client.get("/api/v1/labs", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_lab_write_by_another_connection_invalidates_the_cache(client):
+    from app.database.pool import DATABASE_PATH
+
+    etag = client.get("/api/v1/labs").headers["ETag"]
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute("UPDATE labs SET capacity = capacity + 1 WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    response = client.get("/api/v1/labs", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_unrelated_writes_keep_the_cache(client):
+    from app.database.pool import DATABASE_PATH
+
+    etag = client.get("/api/v1/courses").headers["ETag"]
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute("UPDATE reservations SET notes = 'changed' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    assert client.get("/api/v1/courses", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_labs_and_courses_are_listed_by_id(client):
+    from app.database.pool import DATABASE_PATH
+
+    # Seeded names are already in id order; an out-of-order name would follow the name index
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute("INSERT INTO labs (name, capacity) VALUES ('AAA Annex', 10)")
+    conn.execute("INSERT INTO courses (code, name) VALUES ('AAA100', 'Orientation')")
+    conn.commit()
+    conn.close()
+
+    for path in ("/api/v1/labs", "/api/v1/courses"):
+        ids = [row["id"] for row in client.get(path).json()]
+        assert ids == sorted(ids)
+
+
+def test_version_check_runs_off_the_event_loop_outside_the_cache_lock(client, monkeypatch):
+    import threading
+    from app.utils.reference_cache import reference_cache
+
+    calls = []
+    read = reference_cache._read_versions
+
+    def recording_read():
+        calls.append((threading.current_thread(), reference_cache._lock.locked()))
+        return read()
+
+    monkeypatch.setattr(reference_cache, "_read_versions", recording_read)
+    assert client.get("/api/v1/labs").status_code == 200
+
+    assert calls and all(thread is not threading.main_thread() and not locked for thread, locked in calls)
+
+
+def test_an_older_version_read_does_not_undo_a_newer_one():
+    from app.utils.reference_cache import ReferenceCache
+
+    cache = ReferenceCache(path=":memory:", check_versions=False)
+    cache.put("labs", None, b"[]", cache.generation("labs"))
+    cache._apply_versions(7, {"labs": 2, "courses": 1})
+    assert cache._versions == {"labs": 2, "courses": 1}
+
+    cache._apply_versions(6, {"labs": 1, "courses": 1})
+    assert cache._versions == {"labs": 2, "courses": 1}
+
+
+def test_courses_have_a_single_listing_route(client):
+    listed = client.get("/api/v1/courses")
+    assert listed.status_code == 200
+    assert set(listed.json()[0]) == {"id", "code", "name", "description", "credits"}
+
+    paths = [(route.path, method) for route in client.app.routes for method in getattr(route, "methods", ())]
+    assert [path for path, method in paths if method == "GET" and path.rstrip("/") == "/api/v1/courses"] == \
+        ["/api/v1/courses"]
+
+
+def test_course_creation_runs_off_the_event_loop_and_is_listed(client, monkeypatch):
+    import asyncio
+    from app.auth.security import get_current_admin_user
+    from app.database import crud
+
+    loops = []
+    create = crud.create_course
+
+    def recording_create(db, course):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return create(db, course=course)
+
+    monkeypatch.setattr(crud, "create_course", recording_create)
+    client.app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        response = client.post("/api/v1/courses/", json={"code": "IT499", "name": "Capstone", "credits": 3})
+    finally:
+        del client.app.dependency_overrides[get_current_admin_user]
+
+    assert response.status_code == 200
+    assert loops == [None]
+    assert "IT499" in [course["code"] for course in client.get("/api/v1/courses").json()]
@@ -0,0 +1,126 @@
+import logging
+import re
+
+import pytest
+
+# One sample line of the text exposition format: name, optional labels, value
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? '
+                    r'(-?[0-9.e+-]+|\+Inf|-Inf|NaN)$')
+
+
+def _sample(text, name, **labels):
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{label_text}}} " if labels else f"{name} "
+    values = [line[len(prefix):] for line in text.splitlines() if line.startswith(prefix)]
+    return float(values[0]) if values else 0.0
+
+
+def test_registry_renders_the_text_exposition_format():
+    from app.utils.metrics import Registry
+
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    registry.gauge("depth", "Depth.", lambda: 3)
+    requests.inc('/a"b\\')
+    requests.inc("/x", amount=2)
+    latency.observe(0.05, "/x")
+    latency.observe(0.5, "/x")
+    latency.observe(7, "/x")
+
+    assert registry.render() == "\n".join([
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b\\\\"} 1',
+        'requests_total{route="/x"} 2',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/x",le="0.1"} 1',
+        'latency_seconds_bucket{route="/x",le="1"} 2',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 3',
+        'latency_seconds_sum{route="/x"} 7.55',
+        'latency_seconds_count{route="/x"} 3',
+        "# HELP depth Depth.",
+        "# TYPE depth gauge",
+        "depth 3",
+    ]) + "\n"
+
+
+def test_metrics_endpoint_counts_requests_by_route(client):
+    before = client.get("/metrics").text
+    assert client.get("/api/v1/labs").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for line in response.text.splitlines():
+        assert line.startswith(("# HELP ", "# TYPE ")) or SAMPLE.match(line), line
+
+    labels = {"method": "GET", "route": "/api/v1/labs", "status": "200"}
+    assert _sample(response.text, "http_requests_total", **labels) == \
+        _sample(before, "http_requests_total", **labels) + 1
+    route = {"method": "GET", "route": "/api/v1/labs"}
+    assert _sample(response.text, "http_request_duration_seconds_count", **route) == \
+        _sample(before, "http_request_duration_seconds_count", **route) + 1
+    assert "password_hash_in_flight " in response.text
+
+    client.get("/no/such/path")
+    assert _sample(client.get("/metrics").text, "http_requests_total",
+                   method="GET", route="unmatched", status="404") >= 1
+
+
+@pytest.mark.parametrize("driver", ["sqlite3", "sqlalchemy"])
+def test_statements_are_timed_and_counted_per_request(migrated_db, tmp_path, driver):
+    from sqlalchemy import create_engine, text
+    from app.database.pool import ConnectionPool
+    from app.utils import metrics
+
+    stats = metrics.RequestStats()
+    token = metrics._request_stats.set(stats)
+    queries, timed = metrics.DB_QUERIES.value(driver), metrics.DB_QUERY_SECONDS.count(driver)
+    path = str(tmp_path / "lab_scheduler.db")
+    try:
+        if driver == "sqlite3":
+            pool = ConnectionPool(path, size=1)
+            conn = pool._connect()
+            conn.execute("SELECT COUNT(*) FROM labs").fetchone()
+            conn.executemany("INSERT INTO labs (name, capacity) VALUES (?, 10)", [("A",), ("B",)])
+            conn.close()
+        else:
+            engine = create_engine(f"sqlite:///{path}")
+            metrics.instrument_engine(engine)
+            with engine.connect() as conn:
+                conn.execute(text("SELECT COUNT(*) FROM labs")).fetchone()
+                conn.execute(text("SELECT COUNT(*) FROM courses")).fetchone()
+            engine.dispose()
+    finally:
+        metrics._request_stats.reset(token)
+
+    # The sqlite3 connection also runs its PRAGMAs through execute
+    assert stats.queries >= 2 and stats.query_seconds > 0
+    assert metrics.DB_QUERIES.value(driver) - queries == stats.queries
+    assert metrics.DB_QUERY_SECONDS.count(driver) - timed == stats.queries
+
+
+def test_slow_statements_are_logged_with_their_plan(migrated_db, tmp_path, monkeypatch, caplog):
+    from app.config import settings
+    from app.database.pool import ConnectionPool
+    from app.utils import metrics
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-9)
+    slow = metrics.DB_SLOW_QUERIES.value("sqlite3")
+    conn = ConnectionPool(str(tmp_path / "lab_scheduler.db"), size=1)._connect()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.slow_queries"):
+            conn.execute("SELECT id FROM reservations WHERE lab_id = ?", (1,)).fetchall()
+    finally:
+        conn.close()
+
+    record = next(r for r in caplog.records if "FROM reservations" in r.getMessage())
+    assert record.getMessage().startswith("Slow query (sqlite3, ")
+    assert "SEARCH reservations USING" in record.getMessage()
+    assert metrics.DB_SLOW_QUERIES.value("sqlite3") > slow
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    caplog.clear()
+    metrics.record_query("sqlite3", "SELECT 1", 10.0)
+    assert caplog.records == []
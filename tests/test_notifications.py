@@ -0,0 +1,140 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def as_instructor(client):
+    """Requests made through ``client`` authenticate as instructor1 (user 2)."""
+    from app.auth.security import get_current_active_user
+    from app.database.models import UserRole
+    from app.main import app
+    from app.schemas.user import User
+
+    user = User(id=2, username="instructor1", email="instructor1@university.edu",
+                full_name="Dr. John Smith", role=UserRole.INSTRUCTOR, is_active=True)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    yield user
+    app.dependency_overrides[get_current_active_user] = lambda: None
+
+
+def _pending_reservation(client, day):
+    response = client.post("/api/v1/reservations", json={
+        "lab_id": 4, "course_id": 2, "section": "N1", "duration": 1,
+        "start_time": f"{day} 13:00:00", "end_time": f"{day} 14:00:00",
+    })
+    assert response.status_code == 200
+    return response.json()["reservation_id"]
+
+
+def test_status_change_is_stored_and_listed(client, as_instructor):
+    client.post("/api/v1/notifications/read-all")
+    reservation_id = _pending_reservation(client, "2029-02-06")
+
+    assert client.put(f"/api/v1/reservations/{reservation_id}?status=approved").status_code == 200
+
+    listed = client.get("/api/v1/notifications/").json()
+    assert [n["message"] for n in listed] == [f"Your reservation #{reservation_id} has been approved."]
+    assert listed[0]["notification_type"] == "reservation_approved"
+    assert client.get("/api/v1/notifications/unread-count").json() == {"unread": 1}
+
+
+def test_mark_read_and_read_all_update_the_unread_count(client, as_instructor):
+    client.post("/api/v1/notifications/read-all")
+    first, second = _pending_reservation(client, "2029-02-07"), _pending_reservation(client, "2029-02-08")
+    client.post("/api/v1/reservations/status", json={"status": "approved", "ids": [first, second]})
+    notifications = client.get("/api/v1/notifications/").json()
+    assert len(notifications) == 2
+
+    assert client.post(f"/api/v1/notifications/{notifications[0]['id']}/read").status_code == 200
+    assert client.get("/api/v1/notifications/unread-count").json() == {"unread": 1}
+    assert [n["id"] for n in client.get("/api/v1/notifications/").json()] == [notifications[1]["id"]]
+
+    client.post("/api/v1/notifications/read-all")
+    assert client.get("/api/v1/notifications/unread-count").json() == {"unread": 0}
+    assert len(client.get("/api/v1/notifications/?unread_only=false").json()) >= 2
+    assert client.post("/api/v1/notifications/999999/read").status_code == 404
+
+
+@pytest.mark.parametrize("method, path, helper", [
+    ("GET", "/api/v1/notifications/", "get_user_notifications"),
+    ("GET", "/api/v1/notifications/unread-count", "get_unread_count"),
+    ("POST", "/api/v1/notifications/read-all", "mark_all_as_read"),
+    ("POST", "/api/v1/notifications/1/read", "mark_notification_as_read"),
+])
+def test_notification_queries_run_off_the_event_loop(client, as_instructor, monkeypatch, method, path, helper):
+    from app.utils import notifications
+
+    loops = []
+    query = getattr(notifications, helper)
+
+    def recording_query(*args, **kwargs):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return query(*args, **kwargs)
+
+    monkeypatch.setattr(notifications, helper, recording_query)
+    client.request(method, path)
+
+    assert loops == [None]
+
+
+def test_notification_stream_rejects_a_bad_token(client):
+    assert client.get("/api/v1/notifications/stream?token=not-a-jwt").status_code == 401
+
+
+def _stream_scope(token):
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v1/notifications/stream", "raw_path": b"/api/v1/notifications/stream",
+        "query_string": f"token={token}".encode(), "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+
+
+def test_notification_stream_delivers_stored_events_and_cleans_up(client):
+    # TestClient buffers whole responses, so the endless stream is driven over ASGI directly
+    from app.main import app, create_access_token
+    from app.utils.notifications import broker, notify
+
+    token = create_access_token({"sub": "instructor1", "user_id": 2})
+
+    async def drive():
+        body, disconnected = [], asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if b"event: notification" in message.get("body", b""):
+                    disconnected.set()
+
+        stream = asyncio.create_task(app(_stream_scope(token), receive, send))
+        while broker.subscriber_count() == 0:
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(notify, [(2, {
+            "title": "Schedule update", "message": "Lab D moved", "notification_type": "schedule_update",
+        })])
+        await asyncio.wait_for(stream, timeout=5)
+        return b"".join(body).decode()
+
+    text = asyncio.run(drive())
+    assert broker.subscriber_count() == 0
+
+    event = next(block for block in text.split("\n\n") if "event: notification" in block)
+    data = json.loads(event.split("data: ", 1)[1])
+    assert event.startswith(f"id: {data['id']}\n")
+    assert data["message"] == "Lab D moved"
+
+    from app.database.pool import DATABASE_PATH
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    stored = conn.execute("SELECT message FROM notifications WHERE id = ?", (data["id"],)).fetchone()
+    conn.close()
+    assert stored == ("Lab D moved",)
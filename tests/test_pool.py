@@ -0,0 +1,87 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def pool(migrated_db, tmp_path):
+    from app.database.pool import ConnectionPool
+
+    pool = ConnectionPool(str(tmp_path / "lab_scheduler.db"), size=2)
+    yield pool
+    pool.close()
+
+
+def _pragmas(conn):
+    return tuple(conn.execute(f"PRAGMA {name}").fetchone()[0]
+                 for name in ("journal_mode", "synchronous", "busy_timeout"))
+
+
+def test_connections_use_wal_and_wait_for_the_write_lock(pool):
+    from app.database.pool import BUSY_TIMEOUT_MS
+
+    # synchronous=NORMAL is 1
+    assert asyncio.run(pool.run(_pragmas)) == ("wal", 1, BUSY_TIMEOUT_MS)
+    assert pool.connection().isolation_level is None
+
+
+def test_each_worker_thread_keeps_one_connection(pool):
+    async def connections():
+        return await asyncio.gather(*(pool.run(lambda conn: (threading.get_ident(), conn)) for _ in range(20)))
+
+    seen = {}
+    for thread_id, conn in asyncio.run(connections()):
+        assert seen.setdefault(thread_id, conn) is conn
+    assert 1 <= len(seen) <= pool.size
+    assert len(pool._connections) == len(seen)
+
+    pool.close()
+    assert pool._connections == []
+    with pytest.raises(sqlite3.ProgrammingError):
+        next(iter(seen.values())).execute("SELECT 1")
+
+
+def test_begin_immediate_holds_the_write_lock_but_not_readers(pool):
+    from app.database.pool import transaction
+
+    writer = pool.connection()
+    other = pool._connect()
+    other.execute("PRAGMA busy_timeout=0")
+    try:
+        with transaction(writer):
+            writer.execute("INSERT INTO labs (name, capacity) VALUES ('Lab W', 10)")
+            # WAL readers see the last commit while the write is in progress
+            assert other.execute("SELECT COUNT(*) FROM labs").fetchone()[0] == 0
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+        assert other.execute("SELECT COUNT(*) FROM labs").fetchone()[0] == 1
+
+        # A deferred transaction only asks for the write lock at its first write
+        with transaction(writer, immediate=False):
+            writer.execute("SELECT COUNT(*) FROM labs").fetchone()
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+    finally:
+        other.close()
+
+
+def test_transaction_rolls_back_on_error(pool):
+    from app.database.pool import transaction
+
+    conn = pool.connection()
+    with pytest.raises(RuntimeError):
+        with transaction(conn):
+            conn.execute("INSERT INTO labs (name, capacity) VALUES ('Lab R', 10)")
+            raise RuntimeError("abort")
+
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM labs").fetchone()[0] == 0
+
+
+def test_execute_commits_a_single_statement(pool):
+    asyncio.run(pool.execute("INSERT INTO labs (name, capacity) VALUES (?, ?)", ("Lab E", 12)))
+
+    assert asyncio.run(pool.fetchone("SELECT capacity FROM labs WHERE name = ?", ("Lab E",))) == (12,)
+    assert not pool.connection().in_transaction
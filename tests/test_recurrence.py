@@ -0,0 +1,102 @@
+from datetime import date
+
+import pytest
+
+SERIES = "/api/v1/reservation-series"
+
+
+def _ts(value):
+    from app.utils.validators import to_timestamp
+
+    return to_timestamp(value)
+
+
+def _days(rule, start="2027-03-01 00:00:00", end="2028-03-01 00:00:00"):
+    from app.utils.validators import from_timestamp
+
+    return [from_timestamp(start).date().isoformat() for start, _ in rule.occurrences(_ts(start), _ts(end))]
+
+
+def _rule(rrule, exdates=()):
+    from app.utils.recurrence import day_number, parse_rrule
+
+    # 2027-03-01 is a Monday
+    return parse_rrule(rrule, _ts("2027-03-01 09:00:00"), _ts("2027-03-01 10:00:00"),
+                       [day_number(date.fromisoformat(day)) for day in exdates])
+
+
+def test_count_stops_after_that_many_occurrences():
+    rule = _rule("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=5")
+
+    assert _days(rule) == ["2027-03-01", "2027-03-03", "2027-03-08", "2027-03-10", "2027-03-15"]
+    assert not rule.overlaps(_ts("2027-03-17 00:00:00"), _ts("2028-03-01 00:00:00"))
+
+
+def test_until_is_an_inclusive_date():
+    rule = _rule("FREQ=WEEKLY;BYDAY=MO,FR;UNTIL=20270315")
+
+    assert _days(rule) == ["2027-03-01", "2027-03-05", "2027-03-08", "2027-03-12", "2027-03-15"]
+    # A full UNTIL date-time is read as its date
+    assert _days(_rule("FREQ=WEEKLY;UNTIL=20270315T000000Z")) == ["2027-03-01", "2027-03-08", "2027-03-15"]
+
+
+def test_interval_skips_weeks():
+    assert _days(_rule("RRULE:FREQ=WEEKLY;INTERVAL=2;COUNT=3")) == ["2027-03-01", "2027-03-15", "2027-03-29"]
+
+
+def test_exdates_remove_occurrences_without_extending_count():
+    rule = _rule("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=5", exdates=["2027-03-03", "2027-03-15"])
+
+    assert _days(rule) == ["2027-03-01", "2027-03-08", "2027-03-10"]
+    assert not rule.overlaps(_ts("2027-03-03 09:00:00"), _ts("2027-03-03 10:00:00"))
+
+
+def test_a_window_mid_series_starts_at_the_first_overlapping_occurrence():
+    rule = _rule("FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20271231")
+
+    # The Monday occurrence 09:00-10:00 overlaps a window opening at 09:30
+    assert _days(rule, "2027-06-07 09:30:00", "2027-06-10 00:00:00") == ["2027-06-07", "2027-06-09"]
+    assert _days(rule, "2027-06-07 10:00:00", "2027-06-09 09:00:00") == []
+    assert rule.first_after(_ts("2027-06-08 00:00:00")) == (_ts("2027-06-09 09:00:00"), _ts("2027-06-09 10:00:00"))
+
+
+@pytest.mark.parametrize("rrule, message", [
+    ("FREQ=DAILY;COUNT=3", "Only FREQ=WEEKLY"),
+    ("FREQ=WEEKLY", "UNTIL or COUNT"),
+    ("FREQ=WEEKLY;COUNT=0", "COUNT must be positive"),
+    ("FREQ=WEEKLY;BYDAY=XX;COUNT=2", "Invalid BYDAY"),
+    ("FREQ=WEEKLY;UNTIL=20260101", "UNTIL must not be before"),
+    ("FREQ=WEEKLY;UNTIL=20290101", "cannot span more than"),
+])
+def test_invalid_rules_are_rejected(rrule, message):
+    with pytest.raises(ValueError, match=message):
+        _rule(rrule)
+
+
+def test_series_occurrences_and_exceptions_through_the_api(client):
+    created = client.post(SERIES, json={
+        "lab_id": 4, "course_id": 1, "section": "R", "duration": 1,
+        "start_time": "2027-03-01 13:00:00", "end_time": "2027-03-01 14:00:00",
+        "rrule": "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=4",
+    })
+    assert created.status_code == 200, created.text
+    series_id = created.json()["series_id"]
+
+    def occurrences():
+        response = client.get(f"{SERIES}/{series_id}/occurrences")
+        assert response.status_code == 200
+        return [occurrence["start_time"] for occurrence in response.json()]
+
+    assert occurrences() == ["2027-03-01 13:00:00", "2027-03-04 13:00:00",
+                             "2027-03-08 13:00:00", "2027-03-11 13:00:00"]
+
+    booking = {"lab_id": 4, "course_id": 1, "section": "S", "duration": 1,
+               "start_time": "2027-03-08 13:30:00", "end_time": "2027-03-08 14:30:00"}
+    assert client.post("/api/v1/reservations", json=booking).status_code == 409
+
+    skipped = client.post(f"{SERIES}/{series_id}/exceptions", params={"occurrence_date": "2027-03-08"})
+    assert skipped.status_code == 200
+    assert client.post(f"{SERIES}/{series_id}/exceptions",
+                       params={"occurrence_date": "2027-03-09"}).status_code == 404
+    assert occurrences() == ["2027-03-01 13:00:00", "2027-03-04 13:00:00", "2027-03-11 13:00:00"]
+    assert client.post("/api/v1/reservations", json=booking).status_code == 200
@@ -0,0 +1,102 @@
+import random
+from datetime import date
+
+import pytest
+
+HOUR = 3600
+
+
+@pytest.fixture
+def report_db(migrated_db):
+    migrated_db.execute("INSERT INTO users (id, username, email, hashed_password, full_name, role) "
+                        "VALUES (1, 'i', 'i@x', '-', 'Instructor', 'instructor')")
+    migrated_db.executemany("INSERT INTO labs (id, name, capacity) VALUES (?, ?, 30)", [(1, "Lab A"), (2, "Lab B")])
+    migrated_db.execute("INSERT INTO courses (id, code, name) VALUES (1, 'IT101', 'Intro')")
+    migrated_db.commit()
+    return migrated_db
+
+
+def _book(conn, lab_id, start, end, status="approved"):
+    conn.execute(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (1, ?, 1, 'A', ?, ?, 1, ?)", (lab_id, start, end, status)
+    )
+    conn.commit()
+
+
+def test_bookings_overlapping_the_period_start_are_clipped_to_it(report_db):
+    from app.utils.reports import usage_report
+
+    _book(report_db, 1, "2030-03-31 22:00:00", "2030-04-01 02:00:00")
+    _book(report_db, 1, "2030-04-30 23:00:00", "2030-05-01 01:00:00")
+    _book(report_db, 2, "2030-03-30 09:00:00", "2030-03-30 11:00:00")
+
+    usage, _ = usage_report(report_db, date(2030, 4, 1), date(2030, 5, 1))
+
+    by_lab = {row["lab_name"]: row for row in usage}
+    # 2 hours after midnight on the 1st plus 1 hour before midnight on the 30th
+    assert by_lab["Lab A"]["total_hours"] == 3
+    # One hour each at 00, 01 and 23; the earliest wins the tie
+    assert by_lab["Lab A"]["peak_hours"] == "00:00-01:00"
+    assert by_lab["Lab B"]["total_hours"] == 0
+    assert by_lab["Lab B"]["peak_day"] == "-"
+
+
+def test_only_requested_statuses_are_counted(report_db):
+    from app.utils.reports import ReservationColumns
+
+    _book(report_db, 1, "2030-04-02 09:00:00", "2030-04-02 10:00:00")
+    _book(report_db, 1, "2030-04-03 09:00:00", "2030-04-03 10:00:00", status="pending")
+
+    assert len(ReservationColumns.load(report_db, date(2030, 4, 1), date(2030, 5, 1))) == 1
+    assert len(ReservationColumns.load(report_db, date(2030, 4, 1), date(2030, 5, 1), ("approved", "pending"))) == 2
+
+
+def test_peak_day_hour_and_utilization(report_db, monkeypatch):
+    from app.config import settings
+    from app.utils.reports import usage_report
+
+    monkeypatch.setattr(settings, "LAB_OPENING_HOUR", 8)
+    monkeypatch.setattr(settings, "LAB_CLOSING_HOUR", 18)
+    monkeypatch.setattr(settings, "LAB_OPEN_WEEKDAYS", {0, 1, 2, 3, 4})
+    # 2030-04-01 is a Monday: one open week of 5 days x 10 hours
+    _book(report_db, 1, "2030-04-03 09:30:00", "2030-04-03 11:00:00")
+    _book(report_db, 1, "2030-04-03 10:00:00", "2030-04-03 11:00:00")
+    _book(report_db, 1, "2030-04-05 14:00:00", "2030-04-05 14:30:00")
+
+    usage, peak_hours = usage_report(report_db, date(2030, 4, 1), date(2030, 4, 8))
+
+    lab_a = next(row for row in usage if row["lab_name"] == "Lab A")
+    assert lab_a["total_hours"] == 3
+    assert lab_a["utilization_rate"] == 6.0
+    assert lab_a["peak_day"] == "Wednesday"
+    assert lab_a["peak_hours"] == "10:00-11:00"
+    slots = {row["time_slot"]: row["utilization"] for row in peak_hours}
+    assert list(slots) == [f"{hour:02d}:00" for hour in range(8, 18)]
+    # 2 booked hours at 10:00 out of 5 open days x 2 labs
+    assert slots["10:00"] == 20.0
+
+
+def test_array_and_loop_histograms_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    from app.utils import reports
+
+    rng = random.Random(7)
+    columns = reports.ReservationColumns()
+    period_start, period_end = 1_900_000_000, 1_900_000_000 + 30 * 24 * HOUR
+    for _ in range(500):
+        start = rng.randrange(period_start - 2 * 24 * HOUR, period_end + 24 * HOUR)
+        columns.lab_ids.append(rng.choice([3, 5, 8, 99]))
+        columns.starts.append(start)
+        columns.ends.append(start + rng.randrange(1, 30 * HOUR))
+
+    vectorized = reports.UsageHistograms([8, 3, 5])
+    vectorized.accumulate(columns, period_start, period_end)
+    monkeypatch.setattr(reports, "np", None)
+    looped = reports.UsageHistograms([8, 3, 5])
+    looped.accumulate(columns, period_start, period_end)
+
+    assert vectorized.booked == looped.booked
+    assert vectorized.by_weekday == looped.by_weekday
+    assert vectorized.by_hour == looped.by_hour
+    assert sum(looped.booked) > 0
@@ -0,0 +1,388 @@
+import io
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+
+
+def query_plan(conn, sql, params=()):
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+@pytest.mark.parametrize("sql, params, index", [
+    (
+        "SELECT r.id FROM reservations r ORDER BY r.start_time DESC, r.id DESC LIMIT 10",
+        (),
+        "ix_reservations_start_time",
+    ),
+    (
+        "SELECT r.id FROM reservations r WHERE r.lab_id = ? AND (r.start_time, r.id) < (?, ?) "
+        "ORDER BY r.start_time DESC, r.id DESC LIMIT 10",
+        (1, "2030-01-01 00:00:00", 10),
+        "ix_reservations_lab_start",
+    ),
+    (
+        "SELECT r.id FROM reservations r WHERE r.instructor_id = ? "
+        "ORDER BY r.start_time DESC, r.id DESC LIMIT 10",
+        (2,),
+        "ix_reservations_instructor_start",
+    ),
+    (
+        "SELECT r.id FROM reservations r WHERE r.course_id = ? "
+        "ORDER BY r.start_time DESC, r.id DESC LIMIT 10",
+        (1,),
+        "ix_reservations_course_start",
+    ),
+    (
+        "SELECT r.id FROM reservations r WHERE r.status = ? "
+        "ORDER BY r.start_time DESC, r.id DESC LIMIT 10",
+        ("pending",),
+        "ix_reservations_status_start_covering",
+    ),
+    (
+        "SELECT id, name, capacity FROM labs WHERE is_active = 1 AND capacity >= ? ORDER BY capacity, name",
+        (0,),
+        "ix_labs_active_capacity",
+    ),
+    (
+        "SELECT id, name FROM labs WHERE is_active = 1 ORDER BY name",
+        (),
+        "ix_labs_active_name",
+    ),
+    (
+        "SELECT id FROM notifications WHERE user_id = ? AND is_read = 0 "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+        (1,),
+        "ix_notifications_user_read_created",
+    ),
+])
+def test_listings_are_read_in_index_order(migrated_db, sql, params, index):
+    plan = query_plan(migrated_db, sql, params)
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("sql, params, index", [
+    (
+        # Conflict index load
+        "SELECT id, lab_id, start_time, end_time FROM reservations WHERE status IN (?, ?)",
+        ("pending", "approved"),
+        "ix_reservations_status_start_covering",
+    ),
+    (
+        # Report columns
+        "SELECT lab_id, CAST(strftime('%s', start_time) AS INTEGER), CAST(strftime('%s', end_time) AS INTEGER) "
+        "FROM reservations WHERE status IN (?) AND end_time > ? AND start_time < ?",
+        ("approved", "2030-01-01", "2030-02-01"),
+        "ix_reservations_status_start_covering",
+    ),
+    (
+        # Instructor usage edge months
+        "SELECT r.instructor_id, r.lab_id, COUNT(*) FROM reservations r "
+        "WHERE r.status = 'approved' AND r.start_time >= ? AND r.start_time < ? "
+        "GROUP BY r.instructor_id, r.lab_id",
+        ("2030-01-01", "2030-01-15"),
+        "ix_reservations_status_start_covering",
+    ),
+    (
+        "SELECT COUNT(*) FROM users WHERE is_active = 1",
+        (),
+        "ix_users_is_active",
+    ),
+    (
+        "SELECT id, code, name FROM courses WHERE is_active = 1",
+        (),
+        "ix_courses_active_code",
+    ),
+])
+def test_hot_queries_use_their_indexes(migrated_db, sql, params, index):
+    plan = query_plan(migrated_db, sql, params)
+    assert index in plan
+    assert "SCAN reservations" not in plan and "SCAN r " not in plan
+
+
+def test_scans_never_touch_the_reservations_table(migrated_db):
+    plan = query_plan(
+        migrated_db,
+        "SELECT id, lab_id, start_time, end_time FROM reservations WHERE status IN (?, ?)",
+        ("pending", "approved"),
+    )
+    assert "COVERING INDEX" in plan
+
+
+def test_migrations_downgrade_to_base(migrated_db, tmp_path):
+    from alembic import command
+    from app.database.schema import alembic_config
+
+    command.downgrade(alembic_config(str(tmp_path / "lab_scheduler.db")), "base")
+    tables = {row[0] for row in migrated_db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "reservations" not in tables and "users" not in tables
+
+
+@contextmanager
+def count_queries():
+    """Counts the statements the SQLAlchemy engine executes inside the block."""
+    from sqlalchemy import event
+    from app.database.session import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="module")
+def reservations_for_instructor(client):
+    from app.database.pool import DATABASE_PATH
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.executemany(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (2, ?, ?, 'S1', ?, ?, 1, 'approved')",
+        [(i % 4 + 1, i % 4 + 1, f"2031-01-{i + 1:02d} 09:00:00", f"2031-01-{i + 1:02d} 10:00:00") for i in range(30)]
+    )
+    conn.commit()
+    conn.close()
+    return 2
+
+
+@pytest.mark.parametrize("limit", [1, 10, 30])
+def test_reservation_listing_is_one_query_whatever_the_page_size(client, reservations_for_instructor, limit):
+    with count_queries() as statements:
+        response = client.get(f"/api/v1/instructors/{reservations_for_instructor}/reservations?limit={limit}")
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    assert len(statements) == 1
+
+
+def test_reservation_listing_pages_do_not_overlap(client, reservations_for_instructor):
+    path = f"/api/v1/instructors/{reservations_for_instructor}/reservations"
+    first = client.get(f"{path}?limit=5")
+    second = client.get(f"{path}?limit=5&cursor={first.headers['X-Next-Cursor']}")
+    ids = [row["id"] for row in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 10
+
+
+def test_keyset_pages_stay_stable_under_inserts(client):
+    from app.database.pool import DATABASE_PATH
+
+    def insert(*times):
+        conn = sqlite3.connect(DATABASE_PATH)
+        ids = [conn.execute(
+            "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+            "VALUES (2, 1, 1, 'K', ?, ?, 1, 'approved')", (start, start.replace(" 09:", " 10:"))
+        ).lastrowid for start in times]
+        conn.commit()
+        conn.close()
+        return ids
+
+    def page(cursor=None):
+        params = {"lab_id": 1, "start_date": "2027-02-01", "end_date": "2027-02-28", "limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/reservations", params=params)
+        assert response.status_code == 200
+        return [row["id"] for row in response.json()], response.headers.get("X-Next-Cursor")
+
+    # Two bookings per day, so the id breaks ties within a start time
+    days = [f"2027-02-{day:02d} 09:00:00" for day in range(10, 15) for _ in range(2)]
+    existing = insert(*days)
+    newest_first = sorted(existing, key=lambda i: (days[existing.index(i)], i), reverse=True)
+
+    seen, cursor = page()
+    assert seen == newest_first[:4]
+    # Sorting ahead of the cursor: a later day, and the cursor's own start time with a higher id
+    ahead = insert("2027-02-20 09:00:00", "2027-02-13 09:00:00")
+    behind, = insert("2027-02-11 09:00:00")
+    while cursor:
+        ids, cursor = page(cursor)
+        seen += ids
+
+    assert not set(ahead) & set(seen)
+    assert len(seen) == len(set(seen)) == len(existing) + 1
+    assert [i for i in seen if i != behind] == newest_first
+    # The newest id leads the bookings of its day
+    assert seen.index(behind) == newest_first.index(existing[3])
+
+
+def test_reservation_detail_is_one_query(client, reservations_for_instructor):
+    with count_queries() as statements:
+        response = client.get("/api/v1/reservations/1")
+    assert response.status_code == 200
+    assert {"instructor", "lab", "course"} <= response.json().keys()
+    assert len(statements) == 1
+
+
+def test_report_profile_loads_relationships_in_constant_queries(client, reservations_for_instructor):
+    from app.database import crud
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with count_queries() as statements:
+            reservations = crud.get_reservations_for_report(db)
+            names = {(r.instructor.full_name, r.lab.name, r.course.code) for r in reservations}
+    finally:
+        db.close()
+    assert len(reservations) > 30 and names
+    # The reservations, then one query per related table
+    assert len(statements) == 4
+
+
+def _reserve(lab_id, section, day):
+    from app.database.pool import DATABASE_PATH
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (2, ?, 1, ?, ?, ?, 1, 'approved')",
+        (lab_id, section, f"{day} 09:00:00", f"{day} 10:00:00")
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_lab_calendar_feed_answers_conditional_requests(client):
+    day = date.today() + timedelta(days=3)
+    _reserve(4, "Feed; A", day)
+
+    response = client.get("/api/v1/labs/4/calendar.ics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    body = response.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert f"DTSTART:{day:%Y%m%d}T090000\r\n" in body
+    assert r"(Feed\; A)" in body
+
+    since = client.get("/api/v1/labs/4/calendar.ics", headers={"If-Modified-Since": response.headers["Last-Modified"]})
+    assert since.status_code == 304
+    matched = client.get("/api/v1/labs/4/calendar.ics", headers={"If-None-Match": response.headers["ETag"]})
+    assert matched.status_code == 304
+
+
+def test_new_reservation_refreshes_the_cached_feed(client):
+    etag = client.get("/api/v1/instructors/2/calendar.ics").headers["ETag"]
+    _reserve(3, "Feed B", date.today() + timedelta(days=4))
+
+    response = client.get("/api/v1/instructors/2/calendar.ics", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "(Feed B)" in response.text
+
+
+def test_calendar_feed_of_unknown_lab_is_404(client):
+    assert client.get("/api/v1/labs/999/calendar.ics").status_code == 404
+
+
+def test_csv_export_streams_every_matching_row(client, reservations_for_instructor, monkeypatch):
+    import csv
+    from app.utils import exports
+
+    # Several keyset pages for a handful of rows
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 4)
+    response = client.get("/api/v1/reservations/export?format=csv&start_date=2031-01-01&end_date=2031-01-31")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 30
+    assert [row["start_time"] for row in rows] == sorted(row["start_time"] for row in rows)
+
+
+def _finished_export_job(client, path):
+    job = client.post(path).json()
+    for _ in range(100):
+        if job["status"] != "running":
+            return job
+        time.sleep(0.05)
+        job = client.get(f"/api/v1/reservations/export/jobs/{job['job_id']}").json()
+    raise AssertionError("export job did not finish")
+
+
+def test_export_job_writes_a_downloadable_file(client, reservations_for_instructor):
+    job = _finished_export_job(client, "/api/v1/reservations/export/jobs?format=csv&start_date=2031-01-01")
+    assert job["status"] == "done"
+
+    download = client.get(job["download_url"])
+    assert download.status_code == 200
+    assert len(download.text.splitlines()) == 31
+    assert client.get("/api/v1/reservations/export/jobs/unknown-job-id-0000/download").status_code == 404
+
+
+def test_parquet_export_job(client, reservations_for_instructor):
+    pq = pytest.importorskip("pyarrow.parquet")
+    job = _finished_export_job(client, "/api/v1/reservations/export/jobs?format=parquet&start_date=2031-01-01")
+    assert job["status"] == "done"
+
+    table = pq.read_table(io.BytesIO(client.get(job["download_url"]).content))
+    assert table.num_rows == 30
+
+
+def _book(client, lab_id, day, hour):
+    return client.post("/api/v1/reservations", json={
+        "lab_id": lab_id, "course_id": 1, "section": "W", "duration": 1,
+        "start_time": f"{day} {hour:02d}:00:00", "end_time": f"{day} {hour + 1:02d}:00:00",
+    })
+
+
+def test_conflict_check_sees_writes_from_other_processes(client):
+    from app.database.pool import DATABASE_PATH
+
+    first = _book(client, 2, "2032-03-01", 9)
+    assert first.status_code == 200
+
+    # Another worker process books 11:00 and declines the 09:00 booking
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (2, 2, 1, 'W', '2032-03-01 11:00:00', '2032-03-01 12:00:00', 1, 'approved')"
+    )
+    conn.execute("UPDATE reservations SET status = 'declined' WHERE id = ?", (first.json()["reservation_id"],))
+    conn.commit()
+    conn.close()
+
+    assert _book(client, 2, "2032-03-01", 11).status_code == 409
+    assert _book(client, 2, "2032-03-01", 9).status_code == 200
+
+
+def test_change_feed_reports_pruned_entries_as_lost(migrated_db):
+    from app.database.changes import ChangeFeed
+
+    seen = []
+    feed = ChangeFeed()
+    feed.subscribe("reservation", lambda conn, ids: seen.append(ids))
+    feed.poll(migrated_db)
+
+    migrated_db.executemany("INSERT INTO change_log (topic, key) VALUES ('reservation', ?)", [(1,), (2,)])
+    assert feed.poll(migrated_db) == 2
+    migrated_db.executemany("INSERT INTO change_log (topic, key) VALUES ('reservation', ?)", [(3,), (4,)])
+    migrated_db.execute("DELETE FROM change_log WHERE key = 3")
+    feed.poll(migrated_db)
+    assert seen == [{1, 2}, None]
+
+
+def test_health_reports_a_failing_change_log(client, monkeypatch, caplog):
+    from app.database.changes import POLL_INTERVAL_SECONDS, change_feed
+
+    def broken(conn):
+        raise sqlite3.OperationalError("no such table: change_log")
+
+    assert client.get("/health").status_code == 200
+    monkeypatch.setattr(change_feed, "poll", broken)
+    with caplog.at_level("ERROR", logger="app.main"):
+        time.sleep(POLL_INTERVAL_SECONDS * 3)
+        response = client.get("/health")
+    assert response.status_code == 503
+    assert "no such table" in response.json()["change_log"]["error"]
+    assert any(record.exc_info for record in caplog.records)
+
+    monkeypatch.undo()
+    time.sleep(POLL_INTERVAL_SECONDS * 3)
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "Backend"
+
+
+def run_in_fresh_interpreter(code, db_path):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LAB_SCHEDULER_DB": str(db_path)},
+        check=True, capture_output=True, text=True,
+    ).stdout.strip().splitlines()[-1]
+
+
+def test_importing_the_app_touches_no_database(tmp_path):
+    db_path = tmp_path / "untouched.db"
+    loaded = run_in_fresh_interpreter(
+        "import sys; import app.main; print(sorted(m for m in ('alembic', 'passlib') if m in sys.modules))",
+        db_path,
+    )
+    assert not db_path.exists()
+    # Migrations and password hashing stay out of the import path
+    assert loaded == "[]"
+
+
+def test_schema_is_migrated_once(tmp_path):
+    from app.database import bootstrap, schema
+
+    db_path = str(tmp_path / "lab_scheduler.db")
+    assert bootstrap.ensure_schema(db_path)
+    assert schema.current_revision(db_path) == schema.HEAD_REVISION
+    assert not bootstrap.ensure_schema(db_path)
+
+
+def test_warm_startup_skips_alembic(tmp_path):
+    from app.database import bootstrap
+
+    db_path = tmp_path / "lab_scheduler.db"
+    bootstrap.ensure_schema(str(db_path))
+    loaded = run_in_fresh_interpreter(
+        "import asyncio, sys\n"
+        "from app.main import app\n"
+        "async def start():\n"
+        "    async with app.router.lifespan_context(app):\n"
+        "        pass\n"
+        "asyncio.run(start())\n"
+        "print('alembic' in sys.modules)",
+        db_path,
+    )
+    assert loaded == "False"
+
+
+def test_head_revision_matches_the_migration_chain():
+    from alembic.script import ScriptDirectory
+    from app.database.schema import HEAD_REVISION, alembic_config
+
+    assert ScriptDirectory.from_config(alembic_config()).get_current_head() == HEAD_REVISION
+
+
+def test_seeding_is_idempotent(tmp_path):
+    from app.database import bootstrap
+
+    db_path = str(tmp_path / "lab_scheduler.db")
+    bootstrap.ensure_schema(db_path)
+    assert bootstrap.seed_defaults(db_path)
+    assert not bootstrap.seed_defaults(db_path)
@@ -0,0 +1,110 @@
+import random
+import time
+
+import pytest
+
+HOUR = 3600
+
+
+def _request(reservation_id, start_hour, end_hour, lab, candidates=None):
+    from app.utils.timetable import TimetableRequest
+
+    return TimetableRequest(reservation_id, start_hour * HOUR, end_hour * HOUR, lab, candidates or (lab,))
+
+
+def _assert_feasible(problem, solution):
+    by_id = {request.id: request for request in problem.requests}
+    booked = {lab_id: list(intervals) for lab_id, intervals in problem.blockers.items()}
+    for reservation_id, lab_id in solution.assignment.items():
+        request = by_id[reservation_id]
+        assert lab_id in request.candidates
+        booked.setdefault(lab_id, []).append((request.start, request.end))
+    for intervals in booked.values():
+        intervals.sort()
+        assert all(end <= start for (_, end), (start, _) in zip(intervals, intervals[1:])), intervals
+
+
+def _random_problem(seed, requests=60, labs=4):
+    from app.utils.timetable import TimetableProblem
+
+    rng = random.Random(seed)
+    problem_requests = []
+    for i in range(requests):
+        start = rng.randrange(8, 18)
+        lab = rng.randrange(1, labs + 1)
+        others = [other for other in range(1, labs + 1) if other != lab and rng.random() < 0.5]
+        problem_requests.append(_request(i + 1, start, start + rng.randrange(1, 4), lab, (lab, *others)))
+    blockers = {lab: [(12 * HOUR, 13 * HOUR)] for lab in range(1, labs + 1)}
+    return TimetableProblem(problem_requests, blockers)
+
+
+def test_every_request_is_placed_when_the_labs_allow_it():
+    from app.utils.timetable import TimetableProblem
+
+    problem = TimetableProblem([
+        _request(1, 9, 11, 1, (1, 2)),
+        _request(2, 10, 12, 1, (1, 2)),
+        _request(3, 11, 12, 1, (1, 2)),
+        _request(4, 9, 10, 2),
+    ], {1: [(12 * HOUR, 14 * HOUR)], 2: []})
+
+    solution = problem.solve(time_budget=0.5)
+
+    assert solution.unassigned == []
+    _assert_feasible(problem, solution)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solutions_never_double_book_a_lab(seed):
+    problem = _random_problem(seed)
+    solution = problem.solve(time_budget=0.2, seed=seed)
+
+    _assert_feasible(problem, solution)
+    assert len(solution.assignment) + len(solution.unassigned) == len(problem.requests)
+
+
+def test_a_blocked_request_is_repaired_by_moving_the_one_in_its_way():
+    from app.utils.timetable import TimetableProblem
+
+    # 1 takes lab 1 first; 2 can only use lab 1, so 1 is relocated to lab 2
+    flexible, fixed = _request(1, 9, 10, 1, (1, 2)), _request(2, 9, 10, 1)
+    problem = TimetableProblem([flexible, fixed], {})
+
+    assignment = problem.greedy([flexible, fixed])
+
+    assert assignment == {1: 2, 2: 1}
+
+
+def test_requests_that_fit_nowhere_stay_unassigned():
+    from app.utils.timetable import TimetableProblem
+
+    problem = TimetableProblem([_request(1, 9, 10, 1), _request(2, 9, 10, 1)], {1: []})
+    solution = problem.solve(time_budget=0.1)
+
+    assert len(solution.assignment) == 1 and len(solution.unassigned) == 1
+
+
+def test_solver_pool_is_reused_and_keeps_to_the_budget():
+    from app.utils.timetable import SolverPool, TimetableProblem
+
+    # Request 3 never fits, so every restart runs until the deadline
+    problem = TimetableProblem([
+        _request(1, 9, 10, 1, (1, 2)), _request(2, 9, 10, 2, (2, 1)), _request(3, 9, 10, 1, (1, 2)),
+    ], {})
+    pool = SolverPool(processes=2)
+    try:
+        first = pool.solve(problem, 0.2, workers=2)
+        executor = pool._executor
+
+        started = time.perf_counter()
+        second = pool.solve(problem, 0.3, workers=2)
+        elapsed = time.perf_counter() - started
+
+        assert pool._executor is executor
+        assert 0.25 < elapsed < 1.5
+        for solution in (first, second):
+            assert len(solution.assignment) == 2
+            _assert_feasible(problem, solution)
+    finally:
+        pool.close()
+    assert pool._executor is None
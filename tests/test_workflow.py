@@ -0,0 +1,117 @@
+import sqlite3
+
+import pytest
+
+BATCH = "/api/v1/reservations/status"
+
+
+def _insert(*rows):
+    """Insert (lab_id, day, start hour, status) rows directly, as another worker would."""
+    from app.database.pool import DATABASE_PATH
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    ids = [conn.execute(
+        "INSERT INTO reservations (instructor_id, lab_id, course_id, section, start_time, end_time, duration, status) "
+        "VALUES (2, ?, 1, 'T', ?, ?, 1, ?)",
+        (lab_id, f"{day} {hour:02d}:00:00", f"{day} {hour + 1:02d}:00:00", status)
+    ).lastrowid for lab_id, day, hour, status in rows]
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def _statuses(ids):
+    from app.database.pool import DATABASE_PATH
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    placeholders = ", ".join("?" for _ in ids)
+    rows = dict(conn.execute(f"SELECT id, status FROM reservations WHERE id IN ({placeholders})", ids))
+    conn.close()
+    return [rows[i] for i in ids]
+
+
+@pytest.mark.parametrize("current, new, allowed", [
+    ("pending", "approved", True),
+    ("pending", "declined", True),
+    ("approved", "declined", True),
+    ("approved", "pending", False),
+    ("declined", "approved", False),
+    ("declined", "pending", False),
+    ("pending", "pending", False),
+    ("unknown", "approved", False),
+])
+def test_transition_table(current, new, allowed):
+    from app.utils.workflow import InvalidTransition, check_transition, parse_status
+
+    if allowed:
+        check_transition(current, parse_status(new))
+    else:
+        with pytest.raises(InvalidTransition):
+            check_transition(current, parse_status(new))
+
+
+def test_illegal_single_transition_is_409(client):
+    declined, = _insert((3, "2030-09-02", 9, "declined"))
+
+    response = client.put(f"/api/v1/reservations/{declined}", params={"status": "approved"})
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Cannot change reservation status from declined to approved"
+    assert _statuses([declined]) == ["declined"]
+    assert client.put(f"/api/v1/reservations/{declined}", params={"status": "archived"}).status_code == 400
+    assert client.put("/api/v1/reservations/999999", params={"status": "approved"}).status_code == 404
+
+
+def test_batch_updates_what_it_can_and_reports_the_rest(client):
+    ok, declined, clashing, _ = _insert(
+        (3, "2030-09-03", 9, "pending"),
+        (3, "2030-09-03", 11, "declined"),
+        (3, "2030-09-03", 13, "pending"),
+        (3, "2030-09-03", 13, "approved"),
+    )
+
+    response = client.post(BATCH, json={"status": "approved", "ids": [ok, declined, clashing, 999999]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == [ok]
+    reasons = {skip["id"]: skip["reason"] for skip in body["skipped"]}
+    assert set(reasons) == {declined, clashing, 999999}
+    assert reasons[declined] == "Cannot change reservation status from declined to approved"
+    assert reasons[clashing].startswith("Lab 3 is already booked")
+    assert _statuses([ok, declined, clashing]) == ["approved", "declined", "pending"]
+
+
+def test_batch_selects_by_filters(client):
+    first, second, other = _insert(
+        (3, "2030-09-04", 9, "pending"), (3, "2030-09-04", 11, "pending"), (4, "2030-09-04", 9, "pending"),
+    )
+
+    response = client.post(BATCH, json={"status": "declined", "lab_id": 3, "current_status": "pending",
+                                         "start_date": "2030-09-04", "end_date": "2030-09-04"})
+
+    assert response.json()["updated"] == [first, second]
+    assert _statuses([first, second, other]) == ["declined", "declined", "pending"]
+    assert client.post(BATCH, json={"status": "declined"}).status_code == 400
+
+
+def test_a_failing_batch_changes_nothing(client):
+    from app.database.pool import DATABASE_PATH
+
+    first, failing = _insert((3, "2030-09-05", 9, "pending"), (3, "2030-09-05", 11, "pending"))
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute("CREATE TRIGGER test_batch_failure BEFORE UPDATE OF status ON reservations "
+                 f"WHEN NEW.id = {failing} BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    conn.commit()
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            client.post(BATCH, json={"status": "approved", "ids": [first, failing]})
+    finally:
+        conn.execute("DROP TRIGGER test_batch_failure")
+        conn.commit()
+        conn.close()
+
+    assert _statuses([first, failing]) == ["pending", "pending"]
+    # The index was left as it was, so the retry sees no stale state
+    response = client.post(BATCH, json={"status": "approved", "ids": [first, failing]})
+    assert response.json()["updated"] == [first, failing]